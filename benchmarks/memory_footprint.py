@@ -0,0 +1,57 @@
+"""Per-object memory of GameObject vs. array-backed entities.
+
+Usage: python benchmarks/memory_footprint.py [count]
+
+No window or GL context is needed: only CPU-side state is measured.
+"""
+
+import os
+import sys
+import tracemalloc
+
+# run from a checkout: the script's directory, not the repo root, is on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edelweiss.entities import EntityStore
+from edelweiss.figure import Square
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+
+def game_objects(count):
+    return [Square(position=(0.1, 0.2, 0.0)) for _ in range(count)]
+
+
+def entity_ids(count):
+    store = EntityStore(count)
+    return store, [store.create(position=(0.1, 0.2, 0.0)) for _ in range(count)]
+
+
+def entity_handles(count):
+    store, ids = entity_ids(count)
+    return store, [store.entity(entity) for entity in ids]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} objects")
+    for label, build in (
+        ("GameObject (Square)", game_objects),
+        ("EntityStore + ids", entity_ids),
+        ("EntityStore + Entity handles", entity_handles),
+    ):
+        total, _ = measure(lambda: build(count))
+        print(
+            f"  {label:<30} {total / 2**20:8.1f} MB  {total / count:7.0f} B/object"
+        )
+
+
+if __name__ == "__main__":
+    main()
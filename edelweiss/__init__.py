@@ -1,3 +1,53 @@
-from .window import *
-from .figure import *
-from . import shaders
\ No newline at end of file
+import importlib
+import time
+
+from . import startup
+
+# Public names and the submodule that defines them. Submodules pull in glfw,
+# PyOpenGL, NumPy and Pillow, so they are only imported on first access.
+_LAZY = {
+    "GameEngine": "window",
+    "Scene": "window",
+    "GameObject": "figure",
+    "Square": "figure",
+    "Circle": "figure",
+    "Button": "widgets.button",
+    "TileMap": "tilemap",
+    "ObjectPool": "pool",
+    "EntityStore": "entities",
+    "EntityLayer": "entities",
+    "SpriteSheet": "sprites",
+    "SpriteLayer": "sprites",
+    "save_scene": "scenefile",
+    "load_scene": "scenefile",
+    "Camera2D": "camera",
+    "get_camera": "camera",
+    "set_camera": "camera",
+}
+
+__all__ = list(_LAZY)
+
+
+def _import(module):
+    start = time.perf_counter()
+    loaded = importlib.import_module(f".{module}", __name__)
+    startup.record_import(f"edelweiss.{module}", time.perf_counter() - start)
+    return loaded
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(_import(_LAZY[name]), name)
+    else:
+        try:
+            value = _import(name)  # submodules, e.g. edelweiss.shaders
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise  # a dependency is missing, not the submodule
+            raise AttributeError(f"module 'edelweiss' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,10 +1,322 @@
 import threading
-import pyaudio
+import time
 import wave
 
+import numpy as np
 import pyaudio
-import wave
-import threading
+
+from edelweiss.dsp import db_to_gain
+
+MIX_RATE = 44100
+BLOCK_FRAMES = 1024  # frames mixed per audio callback (~23 ms)
+MAX_REAL_VOICES = 32  # loudest voices actually mixed; the rest are virtual
+AUDIBLE_GAIN = 1e-3  # below this (-60 dB) a voice is virtualized
+
+_SAMPLE_TYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+BUSES = ("music", "sfx", "ui")  # all of them feed the master bus
+
+
+class Sound:
+    """Decoded mono float32 samples at MIX_RATE, ready for the mixer."""
+
+    def __init__(self, samples, name=""):
+        self.samples = samples
+        self.name = name
+
+    @classmethod
+    def from_wave(cls, wf, name=""):
+        width = wf.getsampwidth()
+        if width not in _SAMPLE_TYPES:
+            raise Exception(f"Unsupported sample width {width} in {name}")
+        wf.rewind()
+        raw = np.frombuffer(wf.readframes(wf.getnframes()), dtype=_SAMPLE_TYPES[width])
+        samples = raw.astype(np.float32)
+        if width == 1:
+            samples = (samples - 128.0) / 128.0
+        else:
+            samples /= float(2 ** (8 * width - 1))
+        # positional sources are mono; panning creates the stereo image
+        samples = samples.reshape(-1, wf.getnchannels()).mean(axis=1)
+        rate = wf.getframerate()
+        if rate != MIX_RATE:
+            count = int(len(samples) * MIX_RATE / rate)
+            samples = np.interp(
+                np.arange(count) * (rate / MIX_RATE), np.arange(len(samples)), samples
+            ).astype(np.float32)
+        return cls(np.ascontiguousarray(samples, dtype=np.float32), name)
+
+    @property
+    def duration(self):
+        return len(self.samples) / float(MIX_RATE)
+
+
+class Bus:
+    """Mixer bus: effect chain (edelweiss.dsp effects), gain and optional ducking."""
+
+    def __init__(self, name, gain=1.0):
+        self.name = name
+        self.gain = float(gain)
+        self.effects = []
+        self.duck_source = None  # name of the bus whose signal ducks this one
+        self.duck_db = -12.0
+        self.duck_threshold = 0.02  # source RMS above which ducking engages
+        self.duck_attack = 0.05
+        self.duck_release = 0.4
+        self.level = 0.0  # output peak of the last block, for meters
+        self.cost = 0.0  # seconds spent in effects during the last block
+        self._applied = float(gain)  # gain at the end of the last block
+        self._duck = 1.0
+
+    def add_effect(self, effect):
+        self.effects.append(effect)
+        return effect
+
+    def remove_effect(self, effect):
+        self.effects.remove(effect)
+
+    def duck(self, source, amount_db=-12.0, threshold=0.02, attack=0.05, release=0.4):
+        """Lower this bus by amount_db while the source bus is playing."""
+        # checked here: a bad name would fail in the audio callback on every block
+        if source not in BUSES:
+            raise ValueError(f"Unknown duck source '{source}', expected one of {BUSES}")
+        if source == self.name:
+            raise ValueError(f"Bus '{self.name}' cannot duck itself")
+        self.duck_source = source
+        self.duck_db = amount_db
+        self.duck_threshold = threshold
+        self.duck_attack = attack
+        self.duck_release = release
+
+    def _update_duck(self, source_rms, block_seconds):
+        engaged = source_rms > self.duck_threshold
+        target = db_to_gain(self.duck_db) if engaged else 1.0
+        tau = self.duck_attack if engaged else self.duck_release
+        self._duck += (target - self._duck) * (1.0 - np.exp(-block_seconds / tau))
+
+    def process(self, block, rate):
+        start = time.perf_counter()
+        for effect in tuple(self.effects):  # the main thread may edit the chain
+            effect(block, rate)  # bypassed effects return immediately
+        self.cost = time.perf_counter() - start
+        gain = self.gain * self._duck
+        if gain != self._applied:
+            # ramp across the block to avoid zipper noise
+            ramp = np.linspace(self._applied, gain, len(block), dtype=np.float32)
+            block *= ramp[:, None]
+        elif gain != 1.0:
+            block *= gain
+        self._applied = gain
+        self.level = float(np.abs(block).max()) if len(block) else 0.0
+
+
+class Mixer:
+    """Single stereo output stream mixing positional voices in its audio callback.
+
+    Voice state lives in arrays. Once per block, distance attenuation and
+    equal-power panning are computed for every active voice at once. Only the
+    MAX_REAL_VOICES loudest audible voices are mixed; the others are virtual and
+    just advance their play cursor, so they cost no mixing time.
+
+    Voices are summed into their bus (music, sfx, ui); each bus runs its effects
+    and gain, then everything is summed into the master bus.
+    """
+
+    def __init__(self, pyaudio_instance, capacity=256):
+        self.capacity = capacity
+        self.active = np.zeros(capacity, dtype=bool)
+        self.loop = np.zeros(capacity, dtype=bool)
+        self.positional = np.zeros(capacity, dtype=bool)
+        self.cursor = np.zeros(capacity, dtype=np.int64)
+        self.length = np.ones(capacity, dtype=np.int64)
+        self.volume = np.ones(capacity, dtype=np.float32)
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.sounds = [None] * capacity  # voice -> Sound
+        self.bus = np.zeros(capacity, dtype=np.int8)  # index into BUSES
+        # bumped on every play(), so handles to a recycled voice can be told apart
+        self.generation = np.zeros(capacity, dtype=np.int64)
+        self.master = Bus("master")
+        self.buses = {name: Bus(name) for name in BUSES}
+        self._bus_list = [self.buses[name] for name in BUSES]
+        self.dsp_time = 0.0  # seconds spent in bus processing during the last block
+        self.listener = np.zeros(2, dtype=np.float32)
+        # attenuation: full volume inside ref_distance, silent beyond max_distance
+        self.ref_distance = 0.25
+        self.max_distance = 4.0
+        self.rolloff = 1.0
+        self.pan_width = 1.0  # horizontal distance at which a voice is fully panned
+        self.real_voices = 0  # voices mixed in the last block
+        self.virtual_voices = 0
+        self._lock = threading.Lock()
+        self._free = list(range(capacity - 1, -1, -1))
+        self.stream = pyaudio_instance.open(
+            format=pyaudio.paFloat32,
+            channels=2,
+            rate=MIX_RATE,
+            output=True,
+            frames_per_buffer=BLOCK_FRAMES,
+            stream_callback=self._callback,
+        )
+
+    # ------------------------------ voices ----------------------------------
+    def play(self, sound, position=None, loop=False, volume=1.0, bus="sfx"):
+        """Start a voice; position=None plays it centered without attenuation."""
+        bus_index = BUSES.index(bus)
+        with self._lock:
+            if not self._free:
+                return None  # every voice busy; drop the sound
+            voice = self._free.pop()
+            self.sounds[voice] = sound
+            self.generation[voice] += 1
+            self.cursor[voice] = 0
+            self.length[voice] = max(1, len(sound.samples))
+            self.loop[voice] = loop
+            self.volume[voice] = volume
+            self.bus[voice] = bus_index
+            self.positional[voice] = position is not None
+            if position is not None:
+                self.position[voice] = position[:2]
+            self.active[voice] = True
+        return voice
+
+    def stop(self, voice, generation=None):
+        """Stop a voice; with generation, only if it still plays that sound."""
+        with self._lock:
+            if generation is None or self.generation[voice] == generation:
+                self._release(voice)
+
+    def is_playing(self, voice, generation):
+        return bool(self.active[voice]) and self.generation[voice] == generation
+
+    def _release(self, voice):
+        if self.active[voice]:
+            self.active[voice] = False
+            self.sounds[voice] = None
+            self._free.append(voice)
+
+    def set_listener(self, x, y):
+        with self._lock:
+            self.listener[:] = (x, y)
+
+    def set_positions(self, voices, positions, generations=None):
+        """Move many voices at once (one array write under the lock).
+
+        With generations, voices recycled for another sound meanwhile are skipped.
+        """
+        with self._lock:
+            if generations is not None:
+                current = self.generation[voices] == generations
+                voices, positions = voices[current], positions[current]
+            self.position[voices] = positions
+
+    # ------------------------------ mixing ----------------------------------
+    def gains(self):
+        """Per-voice (left, right) gains for the current listener, all voices at once."""
+        offset = self.position - self.listener
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        clamped = np.maximum(distance, self.ref_distance)
+        attenuation = self.ref_distance / (
+            self.ref_distance + self.rolloff * (clamped - self.ref_distance)
+        )
+        attenuation[distance > self.max_distance] = 0.0
+        pan = np.clip(offset[:, 0] / self.pan_width, -1.0, 1.0)
+        angle = (pan + 1.0) * (np.pi / 4.0)
+        left, right = np.cos(angle), np.sin(angle)
+        # non-positional voices: centered, unattenuated, same loudness as hard-panned
+        attenuation[~self.positional] = 1.0
+        left[~self.positional] = right[~self.positional] = np.sqrt(0.5)
+        gain = self.volume * attenuation * self.active
+        return np.stack((gain * left, gain * right), axis=1).astype(np.float32)
+
+    def mix(self, frames):
+        """Mix one block of stereo float32 frames and advance every voice."""
+        blocks = np.zeros((len(BUSES), frames, 2), dtype=np.float32)
+        with self._lock:
+            gains = self.gains()
+            loudness = gains.max(axis=1)
+            audible = np.flatnonzero(loudness > AUDIBLE_GAIN)
+            if len(audible) > MAX_REAL_VOICES:
+                order = np.argsort(loudness[audible])[::-1]
+                audible = audible[order[:MAX_REAL_VOICES]]
+            for voice in audible:
+                samples = self.sounds[voice].samples
+                cursor = int(self.cursor[voice])
+                chunk = self._read(samples, cursor, frames, self.loop[voice])
+                target = blocks[self.bus[voice]]
+                target[: len(chunk)] += chunk[:, None] * gains[voice]
+            self.real_voices = len(audible)
+            self.virtual_voices = int(np.count_nonzero(self.active)) - len(audible)
+
+            # virtual voices keep time too, so they resume at the right spot
+            active = self.active
+            self.cursor[active] += frames
+            looping = active & self.loop
+            self.cursor[looping] %= self.length[looping]
+            ended = active & ~self.loop & (self.cursor >= self.length)
+            for voice in np.flatnonzero(ended):
+                self._release(voice)
+
+        start = time.perf_counter()
+        out = self._process_buses(blocks)
+        self.dsp_time = time.perf_counter() - start
+        return out
+
+    def _process_buses(self, blocks):
+        """Ducking, per-bus effects and gain, then the master bus."""
+        block_seconds = blocks.shape[1] / float(MIX_RATE)
+        for bus in self._bus_list:
+            if bus.duck_source is not None:
+                source = blocks[BUSES.index(bus.duck_source)]
+                bus._update_duck(float(np.sqrt(np.mean(source**2))), block_seconds)
+        out = np.zeros(blocks.shape[1:], dtype=np.float32)
+        for index, bus in enumerate(self._bus_list):
+            bus.process(blocks[index], MIX_RATE)
+            out += blocks[index]
+        self.master.process(out, MIX_RATE)
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    @staticmethod
+    def _read(samples, cursor, frames, loop):
+        chunk = samples[cursor : cursor + frames]
+        if loop and len(chunk) < frames:
+            reps = (frames - len(chunk)) // len(samples) + 2
+            chunk = np.concatenate((chunk, np.tile(samples, reps)))[:frames]
+        return chunk
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        return (self.mix(frame_count).tobytes(), pyaudio.paContinue)
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+
+
+class SoundEmitter:
+    """Voice attached to a GameObject; follows it via SoundManager.update()."""
+
+    def __init__(self, manager, obj, sound, loop=True, volume=1.0, bus="sfx"):
+        self.manager = manager
+        self.obj = obj
+        self.sound = sound
+        self.voice = manager.mixer.play(sound, obj.position, loop, volume, bus)
+        # the voice slot is reused once the sound ends; the generation identifies ours
+        self.generation = (
+            None if self.voice is None else int(manager.mixer.generation[self.voice])
+        )
+
+    @property
+    def playing(self):
+        return self.voice is not None and self.manager.mixer.is_playing(
+            self.voice, self.generation
+        )
+
+    def stop(self):
+        if self.voice is not None:
+            self.manager.mixer.stop(self.voice, self.generation)
+        self.voice = None
+        if self in self.manager.emitters:
+            self.manager.emitters.remove(self)
 
 
 class SoundManager:
@@ -15,9 +327,19 @@ class SoundManager:
             cls._instance = super(SoundManager, cls).__new__(cls, *args, **kwargs)
             cls.pyaudio_instance = pyaudio.PyAudio()
             cls.run = True
+            cls._mixer = None
+            cls.emitters = []
+            cls.listener = None  # object with a position; None = the scene camera
 
         return cls._instance
 
+    @property
+    def mixer(self):
+        """Stream for positional audio, opened on first use."""
+        if self._mixer is None:
+            SoundManager._mixer = Mixer(self.pyaudio_instance)
+        return self._mixer
+
     def load_sound(self, filename):
         try:
             wf = wave.open(filename, "rb")
@@ -26,7 +348,29 @@ class SoundManager:
             raise Exception(f"Failed to load sound from file: {filename}, error: {e}")
         return wf
 
-    def play_sound(self, wf, loop=False, position=0):
+    def load_sample(self, filename):
+        """Decode a wave file into a Sound for the mixer (emitters, positional play)."""
+        wf = self.load_sound(filename)
+        try:
+            return Sound.from_wave(wf, filename)
+        finally:
+            wf.close()
+
+    def play_sound(self, wf, loop=False, position=None, bus=None, volume=1.0):
+        """Play a loaded wave file; with position=(x, y) it is attenuated and panned
+        relative to the listener. Positional sounds and sounds sent to a bus go
+        through the mixer and return a voice index (None when every voice is busy);
+        others keep the original direct stream and return its playback Thread."""
+        if position is not None and np.ndim(position) == 0:
+            position = None  # scalar positions (the old default 0) were never positional
+        if position is not None:
+            position = np.asarray(position, dtype=np.float32).reshape(-1)
+            if len(position) < 2:
+                raise ValueError(f"Sound position must be (x, y), got {position.tolist()}")
+        if position is not None or bus is not None:
+            sound = wf if isinstance(wf, Sound) else Sound.from_wave(wf)
+            return self.mixer.play(sound, position, loop, volume, bus or "sfx")
+
         def play():
             p = pyaudio.PyAudio()
 
@@ -39,7 +383,12 @@ class SoundManager:
 
             data = wf.readframes(1024)
 
-            while data != "" and self.run:
+            while self.run:
+                if not data:
+                    if not loop:
+                        break
+                    wf.rewind()
+                    data = wf.readframes(1024)
                 self.stream.write(data)
                 data = wf.readframes(1024)
 
@@ -52,10 +401,58 @@ class SoundManager:
         thread.start()
         return thread
 
+    def emitter(self, obj, sound, loop=True, volume=1.0, bus="sfx"):
+        """Attach a sound to a GameObject; it follows the object's position."""
+        emitter = SoundEmitter(self, obj, sound, loop, volume, bus)
+        self.emitters.append(emitter)
+        return emitter
+
+    def bus(self, name):
+        """Mixer bus by name: "master", "music", "sfx" or "ui"."""
+        if name == "master":
+            return self.mixer.master
+        return self.mixer.buses[name]
+
+    def dsp_report(self):
+        """Milliseconds spent per bus and effect in the last audio block."""
+        mixer = self.mixer
+        print(f"audio block: {mixer.dsp_time * 1000.0:.3f} ms DSP")
+        for bus in list(mixer.buses.values()) + [mixer.master]:
+            print(f"  {bus.name:<8} {bus.cost * 1000.0:7.3f} ms  gain {bus._applied:.2f}")
+            for effect in bus.effects:
+                state = "bypassed" if effect.bypass else f"{effect.cost * 1000.0:7.3f} ms"
+                print(f"    {type(effect).__name__:<12} {state}")
+
+    def set_listener(self, obj):
+        """Hear the world from obj (anything with .position); None = active camera."""
+        self.listener = obj
+
+    def update(self):
+        """Copy emitter and listener positions to the mixer; called once per frame."""
+        if self._mixer is None:
+            return
+        listener = self.listener
+        if listener is None:
+            from edelweiss.camera import get_camera
+
+            listener = get_camera()
+        if listener is not None:
+            self._mixer.set_listener(listener.position[0], listener.position[1])
+        live = [emitter for emitter in self.emitters if emitter.playing]
+        self.emitters[:] = live
+        if live:
+            voices = np.fromiter((emitter.voice for emitter in live), dtype=np.int64)
+            generations = np.fromiter((e.generation for e in live), dtype=np.int64)
+            positions = np.array([emitter.obj.position[:2] for emitter in live])
+            self._mixer.set_positions(voices, positions, generations)
+
     def stop(self):
         self.run = False
 
     def close(self):
+        if self._mixer is not None:
+            self._mixer.close()
+            SoundManager._mixer = None
         self.pyaudio_instance.terminate()
 
 
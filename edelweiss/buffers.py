@@ -0,0 +1,159 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+from edelweiss import resources
+from edelweiss.figure import _gl_version_tuple
+
+# Upload strategies, picked from the GL version of the current context
+PERSISTENT = "persistent"  # GL 4.4+: glBufferStorage + persistently mapped ring
+SUBDATA = "subdata"  # GL 3.2+: glBufferSubData into ring regions guarded by fences
+ORPHAN = "orphan"  # GL 2.1: orphan the whole buffer every frame
+
+_FENCE_TIMEOUT_NS = 1_000_000_000
+
+
+def upload_dynamic(vbo, data, capacity, target=GL_ARRAY_BUFFER):
+    """Update a buffer in place when data fits, otherwise reallocate it. Returns the capacity."""
+    glBindBuffer(target, vbo)
+    if data.nbytes <= capacity:
+        glBufferSubData(target, 0, data.nbytes, data)
+    else:
+        capacity = data.nbytes
+        glBufferData(target, capacity, data, GL_DYNAMIC_DRAW)
+        resources.resize("buffer", vbo, capacity)
+    glBindBuffer(target, 0)
+    return capacity
+
+
+class StreamingBuffer:
+    """Ring of per-frame regions in one vertex buffer for geometry rewritten every frame.
+
+    write() copies data into the region of the current frame and returns its byte
+    offset in self.vbo; end_frame() fences the region and moves to the next one, so the
+    CPU never writes into memory the GPU may still be reading.
+    """
+
+    def __init__(self, region_size=1 << 20, regions=3, strategy=None, owner=None):
+        self.region_size = int(region_size)
+        self.regions = int(regions)
+        self.strategy = strategy or self._pick_strategy()
+        self.owner = owner  # for the resource registry
+
+        self.vbo = None
+        self._mapped = None  # numpy view of the persistent mapping
+        self._fences = [None] * self.regions
+        self._region = 0
+        self._cursor = 0  # write offset inside the current region
+        self._frame_bytes = 0
+        self.bytes_uploaded = 0  # counter for the last completed frame
+
+        self._allocate()
+
+    @staticmethod
+    def _pick_strategy():
+        version = _gl_version_tuple()
+        if version >= (4, 4):
+            return PERSISTENT
+        if version >= (3, 2):
+            return SUBDATA
+        return ORPHAN
+
+    @property
+    def size(self):
+        if self.strategy == ORPHAN:
+            return self.region_size
+        return self.region_size * self.regions
+
+    def _allocate(self):
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        if self.strategy == PERSISTENT:
+            flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+            glBufferStorage(GL_ARRAY_BUFFER, self.size, None, flags)
+            ptr = glMapBufferRange(GL_ARRAY_BUFFER, 0, self.size, flags)
+            address = ptr.value if hasattr(ptr, "value") else ptr
+            raw = (ctypes.c_ubyte * self.size).from_address(address)
+            self._mapped = np.frombuffer(raw, dtype=np.uint8)
+        else:
+            glBufferData(GL_ARRAY_BUFFER, self.size, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        resources.track("buffer", self.vbo, self.owner or self, self.size)
+
+    def _release(self):
+        for index, fence in enumerate(self._fences):
+            if fence is not None:
+                glDeleteSync(fence)
+            self._fences[index] = None
+        if self.vbo:
+            if self._mapped is not None:
+                glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+                glUnmapBuffer(GL_ARRAY_BUFFER)
+                glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glDeleteBuffers(1, [self.vbo])
+            resources.untrack("buffer", self.vbo)
+        self.vbo = None
+        self._mapped = None
+
+    def _wait_region(self, region):
+        fence = self._fences[region]
+        if fence is not None:
+            glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, _FENCE_TIMEOUT_NS)
+            glDeleteSync(fence)
+            self._fences[region] = None
+
+    def _grow(self, nbytes):
+        """Reallocate with regions large enough for nbytes (the buffer name changes)."""
+        for region in range(self.regions):
+            self._wait_region(region)
+        self._release()
+        while self.region_size < self._cursor + nbytes:
+            self.region_size *= 2
+        self._cursor = 0
+        self._allocate()
+
+    def write(self, data, align=16):
+        """Copy a contiguous array into this frame's region; returns its byte offset in vbo."""
+        data = np.ascontiguousarray(data)
+        nbytes = data.nbytes
+        cursor = -(-self._cursor // align) * align
+        if cursor + nbytes > self.region_size:
+            self._cursor = 0
+            self._grow(nbytes)
+            cursor = 0
+
+        if self._cursor == 0:
+            if self.strategy == ORPHAN:
+                # hand the old storage to the driver and get a fresh block without a sync
+                glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+                glBufferData(GL_ARRAY_BUFFER, self.size, None, GL_STREAM_DRAW)
+                glBindBuffer(GL_ARRAY_BUFFER, 0)
+            else:
+                self._wait_region(self._region)
+
+        offset = cursor
+        if self.strategy != ORPHAN:
+            offset += self._region * self.region_size
+
+        if self.strategy == PERSISTENT:
+            self._mapped[offset : offset + nbytes] = data.view(np.uint8).reshape(-1)
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferSubData(GL_ARRAY_BUFFER, offset, nbytes, data)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self._cursor = cursor + nbytes
+        self._frame_bytes += nbytes
+        return offset
+
+    def end_frame(self):
+        """Fence the region used this frame and advance to the next one."""
+        if self._cursor and self.strategy != ORPHAN:
+            self._fences[self._region] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+            self._region = (self._region + 1) % self.regions
+        self._cursor = 0
+        self.bytes_uploaded = self._frame_bytes
+        self._frame_bytes = 0
+
+    def cleanup(self):
+        self._release()
@@ -0,0 +1,186 @@
+from OpenGL.GL import *
+import numpy as np
+
+from edelweiss import resources
+
+CAMERA_BLOCK = "Camera"
+CAMERA_BINDING = 0  # uniform buffer binding point shared by all world shaders
+
+
+class Camera2D:
+    """2D camera with pan, zoom and rotation.
+
+    view_width/view_height are the world units visible at zoom 1; the defaults
+    (2 x 2 centered on the origin) map world coordinates 1:1 to NDC, so scenes
+    without an explicit camera look exactly as before.
+    """
+
+    def __init__(
+        self,
+        view_width=2.0,
+        view_height=2.0,
+        position=(0.0, 0.0),
+        zoom=1.0,
+        rotation=0.0,
+    ):
+        self.view_width = float(view_width)
+        self.view_height = float(view_height)
+        self.position = np.array(position, dtype=np.float32)
+        self.zoom = float(zoom)
+        self.rotation = float(rotation)  # radians, counter-clockwise
+        self.version = 0  # bumped whenever the matrix changes
+        self._matrix = None
+
+    # ------------------------------ controls --------------------------------
+    def _changed(self):
+        self._matrix = None
+        self.version += 1
+
+    def set_position(self, x, y):
+        self.position = np.array([x, y], dtype=np.float32)
+        self._changed()
+
+    def pan(self, dx, dy):
+        self.position = self.position + np.array([dx, dy], dtype=np.float32)
+        self._changed()
+
+    def set_zoom(self, zoom):
+        self.zoom = float(zoom)
+        self._changed()
+
+    def set_rotation(self, rotation):
+        self.rotation = float(rotation)
+        self._changed()
+
+    def resize(self, view_width, view_height):
+        self.view_width = float(view_width)
+        self.view_height = float(view_height)
+        self._changed()
+
+    # ------------------------------ matrices --------------------------------
+    def view_projection(self):
+        """Row-major 4x4 world -> NDC matrix."""
+        if self._matrix is None:
+            c, s = np.cos(-self.rotation), np.sin(-self.rotation)
+            sx = 2.0 * self.zoom / self.view_width
+            sy = 2.0 * self.zoom / self.view_height
+            px, py = float(self.position[0]), float(self.position[1])
+            m = np.identity(4, dtype=np.float32)
+            m[0, 0], m[0, 1] = sx * c, -sx * s
+            m[1, 0], m[1, 1] = sy * s, sy * c
+            m[0, 3] = -(m[0, 0] * px + m[0, 1] * py)
+            m[1, 3] = -(m[1, 0] * px + m[1, 1] * py)
+            self._matrix = m
+        return self._matrix
+
+    def view_rect(self):
+        """Axis-aligned world rectangle (x0, y0, x1, y1) covering the view, for culling."""
+        half_w = self.view_width / (2.0 * self.zoom)
+        half_h = self.view_height / (2.0 * self.zoom)
+        c, s = abs(np.cos(self.rotation)), abs(np.sin(self.rotation))
+        ext_x = half_w * c + half_h * s
+        ext_y = half_w * s + half_h * c
+        px, py = float(self.position[0]), float(self.position[1])
+        return (px - ext_x, py - ext_y, px + ext_x, py + ext_y)
+
+    def screen_to_world(self, xpos, ypos, window_width, window_height):
+        """Convert a cursor position in window pixels to world coordinates."""
+        norm_x = (xpos / window_width) * 2.0 - 1.0
+        norm_y = 1.0 - (ypos / window_height) * 2.0
+        ndc = np.array([norm_x, norm_y, 0.0, 1.0], dtype=np.float32)
+        world = np.linalg.inv(self.view_projection()) @ ndc
+        return float(world[0]), float(world[1])
+
+
+class CameraUniforms:
+    """Uploads the active camera once per frame for every world-space shader.
+
+    On GL 3.3+ the matrix lives in a uniform buffer bound to CAMERA_BINDING; legacy
+    GL 2.1 programs get a plain u_view_proj uniform, re-sent only when it changed.
+    """
+
+    def __init__(self):
+        self.camera = Camera2D()
+        self.ubo = None
+        self._use_ubo = None
+        self._uploaded_version = None
+        self._program_versions = {}  # legacy path: program -> camera version it has
+
+    def _setup(self):
+        # imported here: figure.py itself imports this module
+        from edelweiss.figure import _gl_version_tuple
+
+        major, _ = _gl_version_tuple()
+        self._use_ubo = major >= 3
+        if self._use_ubo:
+            self.ubo = glGenBuffers(1)
+            glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+            glBufferData(GL_UNIFORM_BUFFER, 64, None, GL_DYNAMIC_DRAW)
+            resources.track("buffer", self.ubo, self, 64)
+            glBindBuffer(GL_UNIFORM_BUFFER, 0)
+            glBindBufferBase(GL_UNIFORM_BUFFER, CAMERA_BINDING, self.ubo)
+
+    def register_program(self, program):
+        """Hook a freshly linked program up to the camera block; returns the legacy location."""
+        if self._use_ubo is None:
+            self._setup()
+        self._program_versions.pop(program, None)
+        if self._use_ubo:
+            index = glGetUniformBlockIndex(program, CAMERA_BLOCK)
+            if index != GL_INVALID_INDEX:
+                glUniformBlockBinding(program, index, CAMERA_BINDING)
+            return -1
+        return glGetUniformLocation(program, "u_view_proj")
+
+    def begin_frame(self):
+        """Upload the camera matrix (once per frame, and only if it changed)."""
+        if self._use_ubo is None:
+            self._setup()
+        if not self._use_ubo or self._uploaded_version == self.camera.version:
+            return
+        # std140 mat4 is column-major
+        data = np.ascontiguousarray(self.camera.view_projection().T)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, 64, data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        self._uploaded_version = self.camera.version
+
+    def apply(self, program, location):
+        """Call after glUseProgram(); a no-op with uniform buffers."""
+        if self._use_ubo or location is None or location < 0:
+            return
+        version = self.camera.version
+        if self._program_versions.get(program) != version:
+            glUniformMatrix4fv(location, 1, GL_TRUE, self.camera.view_projection())
+            self._program_versions[program] = version
+
+    def cleanup(self):
+        if self.ubo:
+            glDeleteBuffers(1, [self.ubo])
+            resources.untrack("buffer", self.ubo)
+        self.ubo = None
+        self._use_ubo = None
+        self._uploaded_version = None
+        self._program_versions = {}
+
+
+_camera_uniforms = None
+
+
+def get_camera_uniforms():
+    global _camera_uniforms
+    if _camera_uniforms is None:
+        _camera_uniforms = CameraUniforms()
+    return _camera_uniforms
+
+
+def get_camera():
+    """The camera world-space shaders currently render with."""
+    return get_camera_uniforms().camera
+
+
+def set_camera(camera):
+    uniforms = get_camera_uniforms()
+    uniforms.camera = camera
+    uniforms._uploaded_version = None
+    uniforms._program_versions = {}
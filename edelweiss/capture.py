@@ -0,0 +1,225 @@
+import ctypes
+import os
+import queue
+import threading
+
+import glfw
+import numpy as np
+from OpenGL.GL import *
+
+from edelweiss import resources
+from edelweiss.figure import _gl_version_tuple
+
+PNG = "png"
+RAW = "raw"
+
+
+class FrameCapture:
+    """Asynchronous framebuffer capture to a PNG sequence or raw RGBA files.
+
+    Each captured frame is read into the next pixel buffer object of a ring
+    (glReadPixels into a PBO returns immediately) and mapped ring-1 frames later,
+    when the GPU is done with it. Pixels are then handed to a writer thread.
+    Frames are dropped, and counted, instead of stalling the main loop: when a
+    PBO is not ready yet (GL 3.2+ fences) or the writer queue is full. Raw
+    capture starts a new frames_<n>.rgba file whenever the window is resized.
+    """
+
+    def __init__(self, path, fmt=PNG, ring=3, queue_size=8, every=1):
+        if fmt not in (PNG, RAW):
+            raise ValueError(f"Unknown capture format '{fmt}', expected 'png' or 'raw'")
+        if fmt == PNG:
+            from PIL import Image  # noqa: F401 - fail now, not on the writer thread
+        self.path = path
+        self.fmt = fmt
+        self.ring = max(2, ring)
+        self.every = max(1, every)  # capture every n-th frame
+        self.window = glfw.get_current_context()
+        self.width = 0
+        self.height = 0
+        self.pbos = []
+        self._fences = [None] * self.ring
+        self._pending = [None] * self.ring  # frame number read into each PBO
+        self._index = 0
+        self._use_fences = _gl_version_tuple() >= (3, 2)
+        self._frame = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._spare = queue.Queue()  # recycled pixel arrays
+        self._raw_file = None
+        self._raw_size = None  # (width, height) of the open raw file
+        self._raw_segment = 0  # a resize starts a new raw file
+        # statistics
+        self.captured = 0  # frames read back from the GPU
+        self.written = 0
+        self.dropped_gpu = 0  # PBO still busy when its slot came round, or resized away
+        self.dropped_writer = 0  # writer thread behind, queue full
+        os.makedirs(path, exist_ok=True)
+        self._writer = threading.Thread(
+            target=self._write_loop, name="edelweiss-capture", daemon=True
+        )
+        self._writer.start()
+
+    # ------------------------------ GL side ---------------------------------
+    def _allocate(self, width, height):
+        self._release_pbos()
+        self.width, self.height = width, height
+        self.pbos = [int(pbo) for pbo in np.atleast_1d(glGenBuffers(self.ring))]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, width * height * 4, None, GL_STREAM_READ)
+            resources.track("buffer", pbo, self, width * height * 4)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._spare = queue.Queue()  # arrays of the old size are useless now
+
+    def _release_pbos(self):
+        for index, fence in enumerate(self._fences):
+            if fence is not None:
+                glDeleteSync(fence)
+            self._fences[index] = None
+        # reads still in flight are lost (only happens on a resize; stop() collects them)
+        self.dropped_gpu += sum(frame is not None for frame in self._pending)
+        self._pending = [None] * self.ring
+        if self.pbos:
+            glDeleteBuffers(len(self.pbos), self.pbos)
+            for pbo in self.pbos:
+                resources.untrack("buffer", pbo)
+        self.pbos = []
+
+    def capture(self):
+        """Queue a readback of the back buffer; call once per frame before swapping."""
+        self._frame += 1
+        if self._frame % self.every:
+            return
+        width, height = glfw.get_framebuffer_size(self.window)
+        if (width, height) != (self.width, self.height):
+            self._allocate(width, height)
+
+        index = self._index
+        if self._pending[index] is not None:
+            self._collect(index)  # the oldest read comes round again: map it first
+
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[index])
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadBuffer(GL_BACK)
+        glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        if self._use_fences:
+            self._fences[index] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self._pending[index] = self._frame
+        self._index = (index + 1) % self.ring
+
+    def _ready(self, index):
+        fence = self._fences[index]
+        if fence is None:
+            return True  # no fences (GL < 3.2): rely on the ring's latency
+        status = glClientWaitSync(fence, 0, 0)
+        return status in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED)
+
+    def _collect(self, index, wait=False):
+        """Map a finished PBO and hand its pixels to the writer (or drop them)."""
+        frame = self._pending[index]
+        self._pending[index] = None
+        if not wait and not self._ready(index):
+            self.dropped_gpu += 1
+        else:
+            pixels = self._take_array()
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[index])
+            pointer = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+            if pointer:
+                ctypes.memmove(pixels.ctypes.data, pointer, pixels.nbytes)
+                glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+                self.captured += 1
+                try:
+                    self._queue.put_nowait((frame, pixels))
+                except queue.Full:
+                    self.dropped_writer += 1
+                    self._spare.put(pixels)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        if self._fences[index] is not None:
+            glDeleteSync(self._fences[index])
+            self._fences[index] = None
+
+    def _take_array(self):
+        try:
+            pixels = self._spare.get_nowait()
+            if pixels.shape == (self.height, self.width, 4):
+                return pixels
+        except queue.Empty:
+            pass
+        return np.empty((self.height, self.width, 4), dtype=np.uint8)
+
+    # ------------------------------ writer thread ---------------------------
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            frame, pixels = item
+            try:
+                self._write(frame, pixels)
+                self.written += 1
+            except Exception as e:
+                print(f"Frame capture: failed to write frame {frame}: {e}")
+            self._spare.put(pixels)
+
+    def _write(self, frame, pixels):
+        if self.fmt == PNG:
+            from PIL import Image
+
+            # GL rows start at the bottom
+            image = Image.fromarray(np.flipud(pixels), "RGBA")
+            name = os.path.join(self.path, f"frame_{frame:06d}.png")
+            image.save(name, compress_level=1)  # fast; PNG stays lossless
+            return
+        height, width = pixels.shape[:2]
+        if self._raw_file is not None and self._raw_size != (width, height):
+            # one raw file holds one frame size: roll over to the next one
+            self._raw_file.close()
+            self._raw_file = None
+            self._raw_segment += 1
+        if self._raw_file is None:
+            self._open_raw(width, height)
+        self._raw_file.write(pixels.data)
+
+    def _open_raw(self, width, height):
+        suffix = f"_{self._raw_segment}" if self._raw_segment else ""
+        name = f"frames{suffix}.rgba"
+        self._raw_file = open(os.path.join(self.path, name), "wb")
+        self._raw_size = (width, height)
+        with open(os.path.join(self.path, f"frames{suffix}.txt"), "w") as info:
+            info.write(
+                f"{width}x{height} rgba, bottom-up rows\n"
+                f"ffmpeg -f rawvideo -pix_fmt rgba -s {width}x{height} -r 60 "
+                f"-i {name} -vf vflip capture{suffix}.mp4\n"
+            )
+
+    # ------------------------------ shutdown --------------------------------
+    def stop(self):
+        """Collect in-flight frames, finish writing and free the PBOs."""
+        for offset in range(self.ring):
+            index = (self._index + offset) % self.ring
+            if self._pending[index] is not None:
+                self._collect(index, wait=True)
+        self._release_pbos()
+        self._queue.put(None)
+        self._writer.join()
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
+        return self.stats()
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "written": self.written,
+            "dropped_gpu": self.dropped_gpu,
+            "dropped_writer": self.dropped_writer,
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(
+            "capture: {captured} read back, {written} written, "
+            "{dropped_gpu} dropped (GPU busy), "
+            "{dropped_writer} dropped (writer behind)".format(**stats)
+        )
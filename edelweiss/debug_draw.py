@@ -0,0 +1,261 @@
+import ctypes
+import os
+
+import glfw
+import numpy as np
+from OpenGL.GL import *
+
+from edelweiss import resources
+from edelweiss.buffers import StreamingBuffer
+from edelweiss.camera import get_camera, get_camera_uniforms
+from edelweiss.figure import _gl_version_tuple
+from edelweiss.shaders import get_program, release_program
+from edelweiss.stroke import tessellate
+
+# Immediate-mode debug shapes in world coordinates (the camera's, or NDC without
+# one). Calls from Scene.update() append vertices to CPU arrays; GameEngine.frame()
+# flushes them after Scene.render() with one draw for lines and one for fills.
+# While disabled every call returns at once, so instrumentation can stay in
+# shipped code. Enable with set_enabled(True) or EDELWEISS_DEBUG_DRAW=1.
+
+_enabled = bool(os.environ.get("EDELWEISS_DEBUG_DRAW"))
+
+_FLOATS = 7  # x, y, z, r, g, b, a
+_CIRCLE_SEGMENTS = 24
+_angles = np.linspace(0.0, 2.0 * np.pi, _CIRCLE_SEGMENTS + 1, dtype=np.float32)
+_UNIT_CIRCLE = np.stack((np.cos(_angles), np.sin(_angles)), axis=1)
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+    if not _enabled and _debug_draw is not None:
+        _debug_draw.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def _rgba(color):
+    return tuple(color) + (1.0,) if len(color) == 3 else tuple(color)
+
+
+class _VertexList:
+    """Growable (n, 7) float32 array, reset every frame without reallocating."""
+
+    def __init__(self, capacity=1024):
+        self.data = np.zeros((capacity, _FLOATS), dtype=np.float32)
+        self.count = 0
+
+    def reserve(self, count):
+        """Rows [start, start + count) for the caller to fill."""
+        start = self.count
+        if start + count > len(self.data):
+            grown = np.zeros((max(len(self.data) * 2, start + count), _FLOATS), np.float32)
+            grown[:start] = self.data[:start]
+            self.data = grown
+        self.count += count
+        return self.data[start : start + count]
+
+
+class DebugDraw:
+    def __init__(self):
+        self.lines = _VertexList()  # GL_LINES pairs
+        self.triangles = _VertexList()  # GL_TRIANGLES
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self._u_view_proj = None
+        self.vao = None
+        self._has_vao = False
+        self.stream = None
+
+    # ------------------------------ recording -------------------------------
+    def line(self, x0, y0, x1, y1, color=(0.0, 1.0, 0.0)):
+        rows = self.lines.reserve(2)
+        rows[0, :3] = (x0, y0, 0.0)
+        rows[1, :3] = (x1, y1, 0.0)
+        rows[:, 3:] = _rgba(color)
+
+    def polyline(self, points, color=(0.0, 1.0, 0.0), closed=False, width=None):
+        """Hairline path, or a stroke of width world units (drawn as triangles)."""
+        points = np.asarray(points, dtype=np.float32)[:, :2]
+        if width:
+            mesh = tessellate(points, width, closed)
+            rows = self.triangles.reserve(len(mesh))
+            rows[:, :2] = mesh
+            rows[:, 2] = 0.0
+            rows[:, 3:] = _rgba(color)
+            return
+        if closed:
+            points = np.concatenate((points, points[:1]))
+        segments = len(points) - 1
+        if segments < 1:
+            return
+        rows = self.lines.reserve(2 * segments)
+        rows[0::2, :2] = points[:-1]
+        rows[1::2, :2] = points[1:]
+        rows[:, 2] = 0.0
+        rows[:, 3:] = _rgba(color)
+
+    def rect(
+        self, x, y, width, height, color=(0.0, 1.0, 0.0), filled=False, line_width=None
+    ):
+        """Axis-aligned rectangle centered on (x, y), like Square."""
+        hw, hh = width / 2.0, height / 2.0
+        corners = np.array(
+            [(x - hw, y - hh), (x + hw, y - hh), (x + hw, y + hh), (x - hw, y + hh)],
+            dtype=np.float32,
+        )
+        if not filled:
+            self.polyline(corners, color, closed=True, width=line_width)
+            return
+        rows = self.triangles.reserve(6)
+        rows[:, :2] = corners[[0, 1, 2, 0, 2, 3]]
+        rows[:, 2] = 0.0
+        rows[:, 3:] = _rgba(color)
+
+    def circle(self, x, y, radius, color=(0.0, 1.0, 0.0), filled=False, line_width=None):
+        ring = _UNIT_CIRCLE * radius + np.array((x, y), dtype=np.float32)
+        if not filled:
+            self.polyline(ring, color, closed=bool(line_width), width=line_width)
+            return
+        rows = self.triangles.reserve(3 * _CIRCLE_SEGMENTS)
+        rows[0::3, :2] = (x, y)
+        rows[1::3, :2] = ring[:-1]
+        rows[2::3, :2] = ring[1:]
+        rows[:, 2] = 0.0
+        rows[:, 3:] = _rgba(color)
+
+    def text(self, text, x, y, color=(1.0, 1.0, 1.0), size=14):
+        """Label at a world position; goes through the shared text renderer."""
+        from edelweiss.text import get_text_renderer
+
+        window = glfw.get_current_context()
+        width, height = glfw.get_window_size(window)
+        clip = get_camera().view_projection() @ np.array((x, y, 0.0, 1.0), np.float32)
+        px = (clip[0] / clip[3] + 1.0) * 0.5 * width
+        py = (1.0 - clip[1] / clip[3]) * 0.5 * height
+        get_text_renderer().draw_text(text, px, py, color=color[:3], size=size)
+
+    def clear(self):
+        self.lines.count = 0
+        self.triangles.count = 0
+
+    # ------------------------------ drawing ---------------------------------
+    def _setup(self):
+        suffix = "" if _gl_version_tuple()[0] >= 3 else "_120"
+        self._program = get_program(
+            f"vertex_shader_debug{suffix}.glsl",
+            f"fragment_shader_debug{suffix}.glsl",
+            ("a_pos", "a_color"),
+        )
+        self.shader = self._program.program
+        self._has_vao = True
+        try:
+            self.vao = glGenVertexArrays(1)
+            if glGetError() != GL_NO_ERROR:
+                self._has_vao = False
+                self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
+        except Exception:
+            self._has_vao = False
+            self.vao = None
+        self.stream = StreamingBuffer(region_size=64 * 1024, owner=self)
+
+    def _draw(self, vertices, mode):
+        if not vertices.count:
+            return
+        offset = self.stream.write(vertices.data[: vertices.count])
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+        stride = _FLOATS * 4
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(
+            1, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset + 12)
+        )
+        glDrawArrays(mode, 0, vertices.count)
+
+    def flush(self):
+        """Draw and forget everything recorded this frame."""
+        if not self.lines.count and not self.triangles.count:
+            return
+        if self.shader is None:
+            self._setup()
+        glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._u_view_proj = get_camera_uniforms().register_program(self.shader)
+            self._program_generation = self._program.generation
+        get_camera_uniforms().apply(self.shader, self._u_view_proj)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        if self._has_vao:
+            glBindVertexArray(self.vao)
+
+        self._draw(self.triangles, GL_TRIANGLES)
+        self._draw(self.lines, GL_LINES)  # outlines on top of fills
+
+        if self._has_vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+            glDisableVertexAttribArray(1)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+        glDisable(GL_BLEND)
+        self.stream.end_frame()
+        self.clear()
+
+    def cleanup(self):
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.stream:
+            self.stream.cleanup()
+        if self.shader:
+            release_program(self.shader)
+        self.vao = None
+        self.stream = None
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+
+
+_debug_draw = None
+
+
+def get_debug_draw():
+    global _debug_draw
+    if _debug_draw is None:
+        _debug_draw = DebugDraw()
+    return _debug_draw
+
+
+def draw_line(x0, y0, x1, y1, color=(0.0, 1.0, 0.0)):
+    if _enabled:
+        get_debug_draw().line(x0, y0, x1, y1, color)
+
+
+def draw_polyline(points, color=(0.0, 1.0, 0.0), closed=False, width=None):
+    if _enabled:
+        get_debug_draw().polyline(points, color, closed, width)
+
+
+def draw_rect(
+    x, y, width, height, color=(0.0, 1.0, 0.0), filled=False, line_width=None
+):
+    if _enabled:
+        get_debug_draw().rect(x, y, width, height, color, filled, line_width)
+
+
+def draw_circle(x, y, radius, color=(0.0, 1.0, 0.0), filled=False, line_width=None):
+    if _enabled:
+        get_debug_draw().circle(x, y, radius, color, filled, line_width)
+
+
+def draw_text(text, x, y, color=(1.0, 1.0, 1.0), size=14):
+    if _enabled:
+        get_debug_draw().text(text, x, y, color, size)
@@ -0,0 +1,231 @@
+import time
+
+import numpy as np
+
+try:
+    from scipy.signal import lfilter  # optional: C implementation of the biquad loop
+except ImportError:
+    lfilter = None
+
+# Block effects for the audio mixer. Every effect processes a (frames, 2) float32
+# block in place on the audio thread. A bypassed effect is skipped entirely.
+
+
+def db_to_gain(db):
+    return 10.0 ** (db / 20.0)
+
+
+def gain_to_db(gain):
+    return 20.0 * np.log10(np.maximum(gain, 1e-9))
+
+
+class Effect:
+    """Base class: subclasses implement process(block, rate)."""
+
+    def __init__(self):
+        self.bypass = False
+        self.cost = 0.0  # seconds spent in the last processed block
+
+    def __call__(self, block, rate):
+        if self.bypass:
+            self.cost = 0.0
+            return
+        start = time.perf_counter()
+        self.process(block, rate)
+        self.cost = time.perf_counter() - start
+
+    def process(self, block, rate):
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget filter state / tails."""
+
+
+class Biquad(Effect):
+    """RBJ cookbook low-pass or high-pass filter."""
+
+    def __init__(self, kind="lowpass", cutoff=1000.0, q=0.7071):
+        super().__init__()
+        if kind not in ("lowpass", "highpass"):
+            raise ValueError(f"Unknown filter kind '{kind}'")
+        self.kind = kind
+        self.cutoff = float(cutoff)
+        self.q = float(q)
+        self._coefficients = None  # (b, a) for (cutoff, q, rate)
+        self._state = np.zeros((2, 2), dtype=np.float64)  # direct form II, per channel
+
+    def set_cutoff(self, cutoff):
+        self.cutoff = float(cutoff)
+        self._coefficients = None
+
+    def _design(self, rate):
+        w0 = 2.0 * np.pi * min(self.cutoff, rate * 0.45) / rate
+        alpha = np.sin(w0) / (2.0 * self.q)
+        cos_w0 = np.cos(w0)
+        if self.kind == "lowpass":
+            b = np.array([(1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2])
+        else:
+            b = np.array([(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2])
+        a = np.array([1 + alpha, -2 * cos_w0, 1 - alpha])
+        self._coefficients = (b / a[0], a / a[0], rate)
+
+    def process(self, block, rate):
+        if self._coefficients is None or self._coefficients[2] != rate:
+            self._design(rate)
+        b, a, _ = self._coefficients
+        if lfilter is not None:
+            # transposed direct form II state, one column per channel
+            block[:], state = lfilter(b, a, block, axis=0, zi=self._state)
+            self._state = state
+            return
+        # fallback: plain-float loop per channel (far cheaper than per-sample NumPy ops)
+        b0, b1, b2 = (float(value) for value in b)
+        a1, a2 = float(a[1]), float(a[2])
+        for channel in range(block.shape[1]):
+            z1, z2 = (float(value) for value in self._state[:, channel])
+            out = []
+            for x in block[:, channel].tolist():
+                y = b0 * x + z1
+                z1 = b1 * x - a1 * y + z2
+                z2 = b2 * x - a2 * y
+                out.append(y)
+            block[:, channel] = out
+            self._state[:, channel] = (z1, z2)
+
+    def reset(self):
+        self._state[:] = 0.0
+
+
+class Compressor(Effect):
+    """Feed-forward peak compressor; the gain is computed per segment, not per sample.
+
+    The block is split into segments, their peaks come from one vectorized
+    reduction, and the smoothed gain is interpolated back to every sample.
+    """
+
+    SEGMENT = 64
+
+    def __init__(
+        self, threshold_db=-18.0, ratio=4.0, attack=0.005, release=0.1, makeup_db=0.0
+    ):
+        super().__init__()
+        self.threshold_db = threshold_db
+        self.ratio = ratio
+        self.attack = attack
+        self.release = release
+        self.makeup_db = makeup_db
+        self.gain_reduction_db = 0.0  # current reduction, for meters
+        self._envelope = 0.0  # smoothed reduction in dB (<= 0)
+
+    def process(self, block, rate):
+        frames = len(block)
+        segments = max(1, frames // self.SEGMENT)
+        usable = segments * self.SEGMENT if frames >= self.SEGMENT else frames
+        peaks = np.abs(block[:usable]).reshape(segments, -1).max(axis=1)
+        if usable < frames:
+            peaks[-1] = max(peaks[-1], np.abs(block[usable:]).max())
+        over = gain_to_db(peaks) - self.threshold_db
+        target = np.where(over > 0.0, -over * (1.0 - 1.0 / self.ratio), 0.0)
+
+        dt = (frames / segments) / rate
+        attack = 1.0 - np.exp(-dt / max(self.attack, 1e-6))
+        release = 1.0 - np.exp(-dt / max(self.release, 1e-6))
+        envelope = self._envelope
+        curve = np.empty(segments)
+        for index, value in enumerate(target):  # one step per segment, not per sample
+            coefficient = attack if value < envelope else release
+            envelope += (value - envelope) * coefficient
+            curve[index] = envelope
+        self._envelope = envelope
+        self.gain_reduction_db = envelope
+
+        positions = (np.arange(segments) + 0.5) * (frames / segments)
+        gain_db = np.interp(np.arange(frames), positions, curve) + self.makeup_db
+        block *= db_to_gain(gain_db).astype(np.float32)[:, None]
+
+    def reset(self):
+        self._envelope = 0.0
+        self.gain_reduction_db = 0.0
+
+
+class Limiter(Compressor):
+    """Brick-wall style limiter: very high ratio, fast attack, hard clip at ceiling."""
+
+    def __init__(self, ceiling_db=-0.3, release=0.05):
+        super().__init__(
+            threshold_db=ceiling_db, ratio=100.0, attack=0.0005, release=release
+        )
+        self.ceiling = db_to_gain(ceiling_db)
+
+    def process(self, block, rate):
+        super().process(block, rate)
+        np.clip(block, -self.ceiling, self.ceiling, out=block)
+
+
+class _FeedbackDelay:
+    """y[n] = x[n] + g * y[n - delay], computed in chunks no longer than the delay
+    so every chunk only reads history: no per-sample loop."""
+
+    def __init__(self, delay, feedback):
+        self.delay = delay
+        self.feedback = feedback
+        self.history = np.zeros((delay, 2), dtype=np.float32)  # last `delay` outputs
+
+    def comb(self, block):
+        out = np.empty_like(block)
+        start = 0
+        while start < len(block):
+            size = min(self.delay, len(block) - start)
+            chunk = block[start : start + size] + self.feedback * self.history[:size]
+            out[start : start + size] = chunk
+            self.history = np.concatenate((self.history[size:], chunk))
+            start += size
+        return out
+
+    def allpass(self, block):
+        """Schroeder allpass: v[n] = x[n] + g*v[n-d], y[n] = v[n-d] - g*v[n]."""
+        previous = self.history
+        v = self.comb(block)
+        delayed = np.concatenate((previous, v))[: len(block)]
+        return delayed - self.feedback * v
+
+    def reset(self):
+        self.history[:] = 0.0
+
+
+class Reverb(Effect):
+    """Small Schroeder/Freeverb-style reverb: parallel combs into series allpasses."""
+
+    COMBS = (1116, 1188, 1277, 1356, 1422, 1491, 1557, 1617)  # samples at 44.1 kHz
+    ALLPASSES = (556, 441, 341, 225)
+
+    def __init__(self, room=0.7, wet=0.25):
+        super().__init__()
+        self.room = room
+        self.wet = wet
+        self._rate = None
+        self._combs = []
+        self._allpasses = []
+
+    def _build(self, rate):
+        scale = rate / 44100.0
+        feedback = 0.7 + 0.28 * self.room
+        self._combs = [_FeedbackDelay(int(d * scale), feedback) for d in self.COMBS]
+        self._allpasses = [_FeedbackDelay(int(d * scale), 0.5) for d in self.ALLPASSES]
+        self._rate = rate
+
+    def process(self, block, rate):
+        if self._rate != rate:
+            self._build(rate)
+        dry = block.copy()
+        wet = np.zeros_like(block)
+        source = dry * 0.015  # input gain as in Freeverb
+        for comb in self._combs:
+            wet += comb.comb(source)
+        for allpass in self._allpasses:
+            wet = allpass.allpass(wet)
+        block[:] = dry * (1.0 - self.wet) + wet * self.wet * 3.0
+
+    def reset(self):
+        for delay in self._combs + self._allpasses:
+            delay.reset()
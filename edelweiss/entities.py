@@ -0,0 +1,318 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+from edelweiss import resources
+from edelweiss.buffers import StreamingBuffer
+from edelweiss.camera import get_camera_uniforms
+from edelweiss.figure import Square, _gl_version_tuple
+from edelweiss.shaders import get_program, release_program
+
+# Array-backed alternative to one GameObject per shape. A GameObject carries a
+# __dict__, GL handles and three small NumPy arrays (~1 KB in total); an entity
+# is one row in shared arrays (40 bytes) plus an optional 2-slot handle.
+
+
+class EntityStore:
+    """Struct-of-arrays storage for position/color/scale/velocity of many entities.
+
+    IDs are row indices and are recycled after destroy(). Arrays grow by doubling;
+    keep IDs rather than views across create() calls.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = 0
+        self.count = 0  # rows in use (alive or free) from the start of the arrays
+        self.position = np.zeros((0, 3), dtype=np.float32)
+        self.color = np.zeros((0, 3), dtype=np.float32)
+        self.scale = np.zeros(0, dtype=np.float32)
+        self.velocity = np.zeros((0, 3), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self._free = []
+        self._reserve(capacity)
+
+    @classmethod
+    def from_arrays(cls, position, color, scale, velocity=None):
+        """Store using existing arrays (e.g. memory-mapped scene columns) without copying."""
+        store = cls(0)
+        count = len(position)
+        store.position = position
+        store.color = color
+        store.scale = scale
+        store.velocity = (
+            velocity if velocity is not None else np.zeros((count, 3), dtype=np.float32)
+        )
+        store.alive = np.ones(count, dtype=bool)
+        store.capacity = store.count = count
+        return store
+
+    def _reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        for field in ("position", "color", "scale", "velocity", "alive"):
+            old = getattr(self, field)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count - len(self._free)
+
+    def create(self, position=(0.0, 0.0, 0.0), color=(1.0, 0.5, 0.2), scale=1.0):
+        """Allocate an entity and return its ID."""
+        if self._free:
+            entity = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._reserve(max(16, self.capacity * 2))
+            entity = self.count
+            self.count += 1
+        self.position[entity, : len(position)] = position
+        self.color[entity] = color
+        self.scale[entity] = scale
+        self.velocity[entity] = 0.0
+        self.alive[entity] = True
+        return entity
+
+    def destroy(self, entity):
+        if not self.alive[entity]:
+            raise ValueError(f"Entity {entity} is not alive")
+        self.alive[entity] = False
+        self._free.append(entity)
+
+    def alive_ids(self):
+        return np.flatnonzero(self.alive[: self.count])
+
+    def entity(self, entity):
+        """Lightweight handle with the GameObject setter API."""
+        return Entity(self, entity)
+
+    def nbytes(self):
+        """Bytes held by the arrays (allocated capacity, not just live rows)."""
+        return sum(
+            getattr(self, field).nbytes
+            for field in ("position", "color", "scale", "velocity", "alive")
+        )
+
+
+class Entity:
+    """Handle into an EntityStore; only the store reference and the row are kept."""
+
+    __slots__ = ("store", "id")
+
+    def __init__(self, store, entity):
+        self.store = store
+        self.id = entity
+
+    @property
+    def position(self):
+        return self.store.position[self.id]
+
+    @property
+    def color(self):
+        return self.store.color[self.id]
+
+    @property
+    def scale(self):
+        return float(self.store.scale[self.id])
+
+    def set_position(self, x, y, z=0.0):
+        """Set new position"""
+        self.store.position[self.id] = (x, y, z)
+
+    def set_color(self, r, g, b):
+        """Set new color"""
+        self.store.color[self.id] = (r, g, b)
+
+    def set_scale(self, scale):
+        """Set new scale"""
+        self.store.scale[self.id] = scale
+
+    def destroy(self):
+        self.store.destroy(self.id)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Entity) and other.store is self.store and other.id == self.id
+        )
+
+    def __hash__(self):
+        return hash((id(self.store), self.id))
+
+
+def _triangulate(geometry, primitive):
+    """Triangle list (3 rows per triangle) of a strip or fan, for the expanded path."""
+    count = len(geometry)
+    if primitive == GL_TRIANGLE_STRIP:
+        first = np.arange(count - 2)
+        index = np.stack((first, first + 1, first + 2), axis=1)
+    elif primitive == GL_TRIANGLE_FAN:
+        first = np.arange(1, count - 1)
+        index = np.stack((np.zeros_like(first), first, first + 1), axis=1)
+    else:
+        index = np.arange(count - count % 3)
+    return geometry[index.reshape(-1)]
+
+
+class EntityLayer:
+    """Scene object drawing every live entity of a store with one shape's geometry.
+
+    On GL 3.3+ the store columns are uploaded as per-instance attributes and the
+    whole layer is one instanced draw. Older contexts get one draw of the shape
+    expanded on the CPU; shapes without class-level geometry fall back to one draw
+    per entity.
+    """
+
+    def __init__(self, store, shape=Square, name=None):
+        self.store = store
+        self.shape = shape(name=name)
+        self.name = self.shape.name
+        self.initialized = False
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self._u_view_proj = None
+        self._instanced = False
+        self.vao = None
+        self.stream = None
+        self._triangles = None  # geometry as a triangle list (expanded path)
+
+    def initialize(self):
+        shape = self.shape
+        shape.initialize()
+        shape.initialized = True
+        self._instanced = shape._has_vao and _gl_version_tuple() >= (3, 3)
+        geometry = getattr(shape, "geometry", None)
+        if self._instanced or geometry is not None:
+            if shape._has_vao:
+                self.vao = glGenVertexArrays(1)
+                resources.track("vao", self.vao, self)
+        if self._instanced:
+            self._program = get_program(
+                "vertex_shader_shape_instanced.glsl",
+                "fragment_shader_debug.glsl",  # per-vertex color
+                ("position", "i_offset", "i_color"),
+            )
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, shape.vbo)
+            shape._enable_attr_pointer()
+            for location in (1, 2):
+                glEnableVertexAttribArray(location)
+                glVertexAttribDivisor(location, 1)
+            glBindVertexArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        elif geometry is not None:
+            self._program = get_program(
+                "vertex_shader_debug_120.glsl",
+                "fragment_shader_debug_120.glsl",
+                ("a_pos", "a_color"),
+            )
+            self._triangles = _triangulate(geometry, shape.primitive)
+        else:
+            return  # drawn through the shape's own program, one entity at a time
+        self.shader = self._program.program
+        # instance rows (or expanded vertices) are rewritten every frame
+        self.stream = StreamingBuffer(region_size=256 * 1024, owner=self)
+
+    def instance_data(self):
+        """IDs of the live entities and their (n, 7) float32 rows of x, y, z, scale, r, g, b."""
+        store = self.store
+        ids = store.alive_ids()
+        data = np.empty((len(ids), 7), dtype=np.float32)
+        data[:, 0:3] = store.position[ids]
+        data[:, 3] = store.scale[ids]
+        data[:, 4:7] = store.color[ids]
+        return ids, data
+
+    def render(self):
+        if self._program is None:
+            self._render_each()
+            return
+        ids, data = self.instance_data()
+        if not len(ids):
+            return
+        glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._u_view_proj = get_camera_uniforms().register_program(self.shader)
+            self._program_generation = self._program.generation
+        get_camera_uniforms().apply(self.shader, self._u_view_proj)
+
+        if self._instanced:
+            offset = self.stream.write(data)
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, 28, ctypes.c_void_p(offset))
+            glVertexAttribPointer(
+                2, 3, GL_FLOAT, GL_FALSE, 28, ctypes.c_void_p(offset + 16)
+            )
+            glDrawArraysInstanced(
+                self.shape.primitive, 0, self.shape._vertex_count, len(ids)
+            )
+            glBindVertexArray(0)
+        else:
+            triangles = self._triangles
+            vertices = np.empty((len(ids), len(triangles), 7), dtype=np.float32)
+            vertices[:, :, 0:3] = triangles * data[:, None, 3:4] + data[:, None, 0:3]
+            vertices[:, :, 3:6] = data[:, None, 4:7]
+            vertices[:, :, 6] = 1.0
+            offset = self.stream.write(vertices)
+            if self.vao:
+                glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 28, ctypes.c_void_p(offset))
+            glEnableVertexAttribArray(1)
+            glVertexAttribPointer(
+                1, 4, GL_FLOAT, GL_FALSE, 28, ctypes.c_void_p(offset + 12)
+            )
+            glDrawArrays(GL_TRIANGLES, 0, len(ids) * len(triangles))
+            if self.vao:
+                glBindVertexArray(0)
+            else:
+                glDisableVertexAttribArray(0)
+                glDisableVertexAttribArray(1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+        self.stream.end_frame()
+
+    def _render_each(self):
+        shape = self.shape
+        shape._use_shader()
+        if shape._has_vao and shape.vao:
+            glBindVertexArray(shape.vao)
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, shape.vbo)
+            shape._enable_attr_pointer()
+
+        store = self.store
+        for entity in store.alive_ids():
+            glUniform3fv(shape._u_pos, 1, store.position[entity])
+            glUniform1f(shape._u_scale, store.scale[entity])
+            glUniform3fv(shape._u_color, 1, store.color[entity])
+            glDrawArrays(shape.primitive, 0, shape._vertex_count)
+
+        if shape._has_vao and shape.vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+
+    def cleanup(self):
+        self.shape.cleanup()
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.stream:
+            self.stream.cleanup()
+        if self.shader:
+            release_program(self.shader)
+        self.vao = None
+        self.stream = None
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self._triangles = None
+        self.initialized = False
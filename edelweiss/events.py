@@ -0,0 +1,114 @@
+import time
+
+# Event kinds stored in the queue
+KEY = 0
+MOUSE_BUTTON = 1
+CURSOR_POS = 2
+
+
+class EventQueue:
+    """Buffers input events during glfw.poll_events() and dispatches them once per frame.
+
+    Consecutive cursor moves are merged into the latest one, so a fast mouse costs
+    one scene walk per frame instead of one per OS event. Events are stored as
+    (timestamp, kind, a, b, c) tuples; a recorder can observe the dispatched stream.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._last_cursor = None  # index of the trailing cursor event, if any
+        self.frame = 0
+
+        # per-frame counters, valid after dispatch()
+        self.received = 0
+        self.coalesced = 0
+        self.dispatched = 0
+        self._received = 0
+        self._coalesced = 0
+
+        self.recorder = None  # object with record_event(frame, event) / end_frame(frame)
+
+    def push(self, kind, a, b=0, c=0):
+        """Queue an event (called from GLFW callbacks)."""
+        self._received += 1
+        event = (time.perf_counter(), kind, a, b, c)
+        if kind == CURSOR_POS and self._last_cursor is not None:
+            # nothing happened since the previous move: keep only the newest position
+            self._events[self._last_cursor] = event
+            self._coalesced += 1
+            return
+        self._events.append(event)
+        self._last_cursor = len(self._events) - 1 if kind == CURSOR_POS else None
+
+    def push_key(self, key, action, mods):
+        self.push(KEY, key, action, mods)
+
+    def push_mouse_button(self, button, action, mods):
+        self.push(MOUSE_BUTTON, button, action, mods)
+
+    def push_cursor_pos(self, xpos, ypos):
+        self.push(CURSOR_POS, xpos, ypos)
+
+    def inject(self, events):
+        """Queue pre-recorded (kind, a, b, c) events as-is, e.g. for replay."""
+        now = time.perf_counter()
+        self._events.extend((now, kind, a, b, c) for kind, a, b, c in events)
+        self._received += len(events)
+        self._last_cursor = None
+
+    def __len__(self):
+        return len(self._events)
+
+    def drain(self):
+        """Take all pending events and reset the per-frame counters."""
+        events, self._events = self._events, []
+        self._last_cursor = None
+        self.received = self._received
+        self.coalesced = self._coalesced
+        self.dispatched = len(events)
+        self._received = 0
+        self._coalesced = 0
+        return events
+
+    def dispatch(self, handler):
+        """Deliver pending events to handler(kind, a, b, c) in arrival order."""
+        events = self.drain()
+        recorder = self.recorder
+        for event in events:
+            if recorder is not None:
+                recorder.record_event(self.frame, event)
+            handler(event[1], event[2], event[3], event[4])
+        if recorder is not None:
+            recorder.end_frame(self.frame)
+        self.frame += 1
+        return len(events)
+
+    def counts(self):
+        """Counters of the last dispatched frame."""
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "dispatched": self.dispatched,
+        }
+
+
+class EventRecorder:
+    """Keeps the dispatched event stream in memory so it can be replayed later."""
+
+    def __init__(self):
+        self.events = []  # (frame, timestamp, kind, a, b, c)
+        self.frames = 0
+
+    def record_event(self, frame, event):
+        # frames are counted from the start of the recording, not of the engine
+        self.events.append((self.frames,) + tuple(event))
+
+    def end_frame(self, frame):
+        self.frames += 1
+
+    def frame_events(self):
+        """Events grouped per frame: list indexed by frame number."""
+        grouped = [[] for _ in range(self.frames)]
+        for frame, _, kind, a, b, c in self.events:
+            grouped[frame].append((kind, a, b, c))
+        return grouped
@@ -1,8 +1,16 @@
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
 import numpy as np
 import abc
 import ctypes
+import itertools
+
+from edelweiss import resources
+from edelweiss.camera import get_camera_uniforms
+from edelweiss.shaders import get_program, release_program
+
+
+# unique object IDs; id(self) can repeat once an object has been collected
+_object_ids = itertools.count(1)
 
 
 def _gl_version_tuple():
@@ -26,74 +34,16 @@ def _gl_version_tuple():
 
 
 def _make_shader_program():
-    """Create a shader program compatible with modern (GLSL 330) or legacy (GLSL 120) contexts."""
+    """Shared shape program: GLSL 330 files on modern contexts, GLSL 120 on legacy ones."""
     major, _ = _gl_version_tuple()
     use_modern = major >= 3
-
-    if use_modern:
-        vert_src = """
-        #version 330 core
-        layout(location = 0) in vec3 position;
-        uniform vec3 u_position;
-        uniform float u_scale;
-        void main() {
-            vec3 scaled_pos = position * u_scale;
-            vec3 final_pos = scaled_pos + u_position;
-            gl_Position = vec4(final_pos, 1.0);
-        }
-        """
-        frag_src = """
-        #version 330 core
-        out vec4 color;
-        uniform vec3 u_color;
-        void main() {
-            color = vec4(u_color, 1.0);
-        }
-        """
-    else:
-        # GLSL 1.20 (OpenGL 2.1): no layout qualifiers, use attribute + gl_FragColor
-        vert_src = """
-        #version 120
-        attribute vec3 position;
-        uniform vec3 u_position;
-        uniform float u_scale;
-        void main() {
-            vec3 scaled_pos = position * u_scale;
-            vec3 final_pos = scaled_pos + u_position;
-            gl_Position = vec4(final_pos, 1.0);
-        }
-        """
-        frag_src = """
-        #version 120
-        uniform vec3 u_color;
-        void main() {
-            gl_FragColor = vec4(u_color, 1.0);
-        }
-        """
-
-    vs = compileShader(vert_src, GL_VERTEX_SHADER)
-    fs = compileShader(frag_src, GL_FRAGMENT_SHADER)
-
-    program = glCreateProgram()
-    glAttachShader(program, vs)
-    glAttachShader(program, fs)
-
-    if not use_modern:
-        # bind attribute index for legacy GLSL before linking
-        glBindAttribLocation(program, 0, b"position")
-
-    glLinkProgram(program)
-
-    # shaders are attached; they can be deleted after link
-    glDeleteShader(vs)
-    glDeleteShader(fs)
-
-    # Uniform locations
-    loc_pos = glGetUniformLocation(program, "u_position")
-    loc_scale = glGetUniformLocation(program, "u_scale")
-    loc_color = glGetUniformLocation(program, "u_color")
-
-    return program, loc_pos, loc_scale, loc_color, use_modern
+    suffix = "" if use_modern else "_120"
+    program = get_program(
+        f"vertex_shader_shape{suffix}.glsl",
+        f"fragment_shader_shape{suffix}.glsl",
+        ("position",),
+    )
+    return program, use_modern
 
 
 class GameObject(abc.ABC):
@@ -102,7 +52,8 @@ class GameObject(abc.ABC):
     def __init__(
         self, name=None, position=(0.0, 0.0, 0.0), color=(1.0, 0.5, 0.2), scale=1.0
     ):
-        self.name = name if name else f"obj_{id(self)}"
+        self.id = next(_object_ids)
+        self.name = name if name else "obj_%d" % self.id
         self.position = np.array(position, dtype=np.float32)
         self.color = np.array(color, dtype=np.float32)
         self.scale = float(scale)
@@ -111,17 +62,37 @@ class GameObject(abc.ABC):
         self.vao = None
         self.vbo = None
         self.shader = None
+        self._program = None  # shared ShaderProgram behind self.shader
+        self._program_generation = None
         self._u_pos = None
         self._u_scale = None
         self._u_color = None
+        self._u_view_proj = None
         self._has_vao = False
         self._vertex_count = 0
+        self.initialized = False  # GL resources are created lazily by the scene
+        self.pool = None  # ObjectPool that recycles this instance, if any
 
     def setup_shader(self):
         """Setup shaders considering color and position (with legacy fallback)."""
-        self.shader, self._u_pos, self._u_scale, self._u_color, self._use_modern = (
-            _make_shader_program()
-        )
+        self._program, self._use_modern = _make_shader_program()
+        self.shader = self._program.program
+        self._query_uniforms()
+
+    def _query_uniforms(self):
+        """Cache uniform locations; repeated whenever the program is relinked."""
+        self._u_pos = glGetUniformLocation(self.shader, "u_position")
+        self._u_scale = glGetUniformLocation(self.shader, "u_scale")
+        self._u_color = glGetUniformLocation(self.shader, "u_color")
+        self._u_view_proj = get_camera_uniforms().register_program(self.shader)
+        self._program_generation = self._program.generation
+
+    def _use_shader(self):
+        """Bind the program and the camera; picks up hot-reloaded shaders."""
+        glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._query_uniforms()
+        get_camera_uniforms().apply(self.shader, self._u_view_proj)
 
     @abc.abstractmethod
     def initialize(self):
@@ -137,10 +108,17 @@ class GameObject(abc.ABC):
         """Clean up resources"""
         if self.vao:
             glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
         if self.vbo:
             glDeleteBuffers(1, [self.vbo])
+            resources.untrack("buffer", self.vbo)
         if self.shader:
-            glDeleteProgram(self.shader)
+            release_program(self.shader)
+        self.vao = None
+        self.vbo = None
+        self.shader = None
+        self._program = None
+        self.initialized = False
 
     def set_position(self, x, y, z=0.0):
         """Set new position"""
@@ -164,6 +142,8 @@ class GameObject(abc.ABC):
             if err != GL_NO_ERROR:
                 self._has_vao = False
                 self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
         except Exception:
             self._has_vao = False
             self.vao = None
@@ -174,27 +154,29 @@ class GameObject(abc.ABC):
         glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
 
 
+def _circle_geometry(segments=32):
+    angles = 2.0 * np.pi * np.arange(segments + 1) / segments
+    rim = np.stack((0.5 * np.cos(angles), 0.5 * np.sin(angles), np.zeros_like(angles)), 1)
+    return np.vstack(([0.0, 0.0, 0.0], rim)).astype(np.float32)  # center first
+
+
 class Square(GameObject):
     """Square class"""
 
+    primitive = GL_TRIANGLE_STRIP
+    # (n, 3) vertices drawn with primitive; shared by every instance (and EntityLayer)
+    geometry = np.array(
+        [
+            [-0.5, 0.5, 0.0],  # Top-left
+            [0.5, 0.5, 0.0],  # Top-right
+            [-0.5, -0.5, 0.0],  # Bottom-left
+            [0.5, -0.5, 0.0],  # Bottom-right
+        ],
+        dtype=np.float32,
+    )
+
     def initialize(self):
-        vertices = np.array(
-            [
-                -0.5,
-                0.5,
-                0.0,  # Top-left
-                0.5,
-                0.5,
-                0.0,  # Top-right
-                -0.5,
-                -0.5,
-                0.0,  # Bottom-left
-                0.5,
-                -0.5,
-                0.0,  # Bottom-right
-            ],
-            dtype=np.float32,
-        )
+        vertices = self.geometry.reshape(-1)
 
         self.setup_shader()
         self._vertex_count = 4
@@ -204,6 +186,7 @@ class Square(GameObject):
         self.vbo = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        resources.track("buffer", self.vbo, self, vertices.nbytes)
 
         if self._has_vao:
             glBindVertexArray(self.vao)
@@ -214,20 +197,20 @@ class Square(GameObject):
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     def render(self):
-        glUseProgram(self.shader)
+        self._use_shader()
         glUniform3fv(self._u_pos, 1, self.position)
         glUniform1f(self._u_scale, self.scale)
         glUniform3fv(self._u_color, 1, self.color)
 
         if self._has_vao and self.vao:
             glBindVertexArray(self.vao)
-            glDrawArrays(GL_TRIANGLE_STRIP, 0, self._vertex_count)
+            glDrawArrays(self.primitive, 0, self._vertex_count)
             glBindVertexArray(0)
         else:
             # no VAO path
             glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
             self._enable_attr_pointer()
-            glDrawArrays(GL_TRIANGLE_STRIP, 0, self._vertex_count)
+            glDrawArrays(self.primitive, 0, self._vertex_count)
             glDisableVertexAttribArray(0)
             glBindBuffer(GL_ARRAY_BUFFER, 0)
 
@@ -237,16 +220,11 @@ class Square(GameObject):
 class Circle(GameObject):
     """Circle class"""
 
-    def initialize(self):
-        segments = 32
-        verts = [0.0, 0.0, 0.0]  # center
-        for i in range(segments + 1):
-            angle = 2.0 * np.pi * i / segments
-            x = 0.5 * np.cos(angle)
-            y = 0.5 * np.sin(angle)
-            verts.extend([x, y, 0.0])
+    primitive = GL_TRIANGLE_FAN
+    geometry = _circle_geometry()
 
-        vertices = np.array(verts, dtype=np.float32)
+    def initialize(self):
+        vertices = self.geometry.reshape(-1)
 
         self.setup_shader()
         self._vertex_count = len(vertices) // 3
@@ -255,6 +233,7 @@ class Circle(GameObject):
         self.vbo = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        resources.track("buffer", self.vbo, self, vertices.nbytes)
 
         if self._has_vao:
             glBindVertexArray(self.vao)
@@ -265,19 +244,19 @@ class Circle(GameObject):
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     def render(self):
-        glUseProgram(self.shader)
+        self._use_shader()
         glUniform3fv(self._u_pos, 1, self.position)
         glUniform1f(self._u_scale, self.scale)
         glUniform3fv(self._u_color, 1, self.color)
 
         if self._has_vao and self.vao:
             glBindVertexArray(self.vao)
-            glDrawArrays(GL_TRIANGLE_FAN, 0, self._vertex_count)
+            glDrawArrays(self.primitive, 0, self._vertex_count)
             glBindVertexArray(0)
         else:
             glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
             self._enable_attr_pointer()
-            glDrawArrays(GL_TRIANGLE_FAN, 0, self._vertex_count)
+            glDrawArrays(self.primitive, 0, self._vertex_count)
             glDisableVertexAttribArray(0)
             glBindBuffer(GL_ARRAY_BUFFER, 0)
 
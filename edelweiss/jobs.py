@@ -0,0 +1,273 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Jobs run on a thread pool. NumPy releases the GIL inside most array operations,
+# so chunked array work (physics, particles, culling, image decode) scales with
+# cores. OpenGL contexts are bound to the main thread: anything touching GL must
+# be submitted with main_thread=True and runs inside GameEngine.frame().
+
+PENDING = "pending"  # waiting for dependencies
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_MAIN_THREAD = threading.main_thread()
+
+
+def is_main_thread():
+    return threading.current_thread() is _MAIN_THREAD
+
+
+class JobError(Exception):
+    """A job (or one of its dependencies) raised; the original error is __cause__."""
+
+
+class Job:
+    """Handle of a submitted unit of work."""
+
+    def __init__(self, system, fn, args, kwargs, deps, name, main_thread):
+        self.system = system
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.deps = list(deps)
+        self.name = name or getattr(fn, "__name__", "job")
+        self.main_thread = main_thread
+        self.state = PENDING
+        self.error = None
+        self._result = None
+        self._remaining = 0  # unfinished dependencies
+        self._dependents = []
+        self._done = threading.Event()
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.thread = None
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def elapsed(self):
+        """Seconds spent running (None until finished)."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def wait(self, timeout=None):
+        """Block until the job finished; on the main thread, main-thread jobs keep running."""
+        return self.system.wait([self], timeout)
+
+    def result(self, timeout=None):
+        if not self.wait(timeout):
+            raise TimeoutError(f"Job '{self.name}' did not finish in time")
+        if self.state == FAILED:
+            raise JobError(f"Job '{self.name}' failed") from self.error
+        return self._result
+
+    def __repr__(self):
+        return f"Job({self.name!r}, {self.state})"
+
+
+class JobSystem:
+    """Thread pool scheduler with explicit dependencies and per-job timings."""
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) - 1)  # leave a core for the main thread
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._main_queue = queue.Queue()
+        self._wakeup = threading.Condition(self._lock)
+        self._finished = []  # jobs finished since the last end_frame()
+        self.last_frame = []  # finished jobs of the previous frame, for profiling
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="edelweiss-job"
+            )
+        return self._pool
+
+    # ------------------------------ submission ------------------------------
+    def submit(self, fn, *args, deps=(), name=None, main_thread=False, **kwargs):
+        """Schedule fn(*args, **kwargs) once every job in deps has finished.
+
+        main_thread=True defers the job to run_main_thread(); use it for GL calls.
+        """
+        job = Job(self, fn, args, kwargs, deps, name, main_thread)
+        with self._lock:
+            failed = None
+            for dep in job.deps:
+                if dep.state == FAILED:
+                    failed = dep
+                elif not dep.done:
+                    job._remaining += 1
+                    dep._dependents.append(job)
+        if failed is not None:
+            self._fail(job, failed.error)
+        elif job._remaining == 0:
+            self._enqueue(job)
+        return job
+
+    def call_on_main_thread(self, fn, *args, deps=(), name=None, **kwargs):
+        """Shortcut for submit(..., main_thread=True), e.g. to upload decoded data."""
+        return self.submit(fn, *args, deps=deps, name=name, main_thread=True, **kwargs)
+
+    def parallel_for(self, fn, count, chunks=None, deps=(), name=None):
+        """Split range(count) into chunks and call fn(start, stop) for each in parallel.
+
+        Returns the list of jobs; pass it as deps to run something afterwards.
+        """
+        if count <= 0:
+            return []
+        chunks = min(count, chunks or self.workers)
+        bounds = [count * index // chunks for index in range(chunks + 1)]
+        name = name or getattr(fn, "__name__", "parallel_for")
+        return [
+            self.submit(fn, start, stop, deps=deps, name=f"{name}[{index}]")
+            for index, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    def _enqueue(self, job):
+        job.state = QUEUED
+        if job.main_thread:
+            self._main_queue.put(job)
+            with self._lock:
+                self._wakeup.notify_all()
+        else:
+            self._get_pool().submit(self._run, job)
+
+    # ------------------------------ execution -------------------------------
+    def _run(self, job):
+        job.state = RUNNING
+        job.thread = threading.current_thread().name
+        job.started = time.perf_counter()
+        try:
+            job._result = job.fn(*job.args, **job.kwargs)
+        except BaseException as e:
+            job.finished = time.perf_counter()
+            self._fail(job, e)
+            return
+        job.finished = time.perf_counter()
+        self._complete(job, DONE)
+
+    def _fail(self, job, error):
+        job.error = error
+        self._complete(job, FAILED)
+
+    def _complete(self, job, state):
+        ready = []
+        failed = []
+        with self._lock:
+            job.state = state
+            self._finished.append(job)
+            for dependent in job._dependents:
+                if dependent.done:
+                    continue
+                if state == FAILED:
+                    failed.append(dependent)
+                else:
+                    dependent._remaining -= 1
+                    if dependent._remaining == 0:
+                        ready.append(dependent)
+            job._dependents = []
+            job._done.set()
+            self._wakeup.notify_all()
+        for dependent in failed:
+            self._fail(dependent, job.error)
+        for dependent in ready:
+            self._enqueue(dependent)
+
+    def run_main_thread(self, budget=None):
+        """Run queued main-thread jobs; called once per frame by the engine.
+
+        With a budget (seconds) the rest is left for the next frame. Returns the count run.
+        """
+        if not is_main_thread():
+            raise RuntimeError("run_main_thread() must be called from the main thread")
+        deadline = None if budget is None else time.perf_counter() + budget
+        count = 0
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                job = self._main_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._run(job)
+            count += 1
+        return count
+
+    def wait(self, jobs, timeout=None):
+        """Wait for all jobs; returns False on timeout.
+
+        On the main thread, main-thread jobs are executed while waiting so that
+        dependencies on GL work cannot deadlock.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        main = is_main_thread()
+        while True:
+            if main:
+                self.run_main_thread()
+            with self._lock:
+                if all(job.done for job in jobs):
+                    return True
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                if not (main and not self._main_queue.empty()):
+                    self._wakeup.wait(remaining)
+
+    # ------------------------------ profiling -------------------------------
+    def end_frame(self):
+        """Rotate the finished-job list; timings of the frame are in last_frame."""
+        with self._lock:
+            self.last_frame, self._finished = self._finished, []
+        return self.last_frame
+
+    def frame_timings(self):
+        """(name, thread, start offset ms, duration ms) of jobs finished last frame."""
+        jobs = [job for job in self.last_frame if job.started is not None]
+        if not jobs:
+            return []
+        origin = min(job.started for job in jobs)
+        return [
+            (
+                job.name,
+                job.thread,
+                (job.started - origin) * 1000.0,
+                job.elapsed * 1000.0,
+            )
+            for job in sorted(jobs, key=lambda job: job.started)
+        ]
+
+    def print_timings(self):
+        for name, thread, start, duration in self.frame_timings():
+            print(f"  {name:<32} {thread:<20} +{start:7.2f} ms {duration:8.2f} ms")
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        if wait:
+            self.run_main_thread()
+
+
+_job_system = None
+
+
+def get_job_system():
+    """The shared job system (created on first use)."""
+    global _job_system
+    if _job_system is None:
+        _job_system = JobSystem()
+    return _job_system
+
+
+def submit(fn, *args, **kwargs):
+    return get_job_system().submit(fn, *args, **kwargs)
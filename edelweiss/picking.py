@@ -0,0 +1,588 @@
+import bisect
+import ctypes
+
+import glfw
+import numpy as np
+from OpenGL.GL import *
+
+from edelweiss import resources
+from edelweiss.buffers import StreamingBuffer
+from edelweiss.camera import get_camera, get_camera_uniforms
+from edelweiss.figure import _gl_version_tuple
+from edelweiss.shaders import get_program, release_program
+
+# Pixel-exact hit testing: objects are drawn with their own geometry but a flat
+# per-object ID instead of a color, and the ID under the cursor is read back. The
+# target is a single texel and the viewport is shifted so the cursor pixel lands
+# on it, so the pass costs one vertex pass and no fill rate. Readback goes through
+# a PBO and is collected a frame later, so picking never stalls the pipeline.
+# Entity and sprite layers get a range of IDs and are drawn with one call each.
+
+_RING = 2
+
+# quad of sprites.py: corner offset (x, y) and uv weights (s, t)
+_QUAD = np.array(
+    [
+        [-0.5, 0.5, 0.0, 0.0],
+        [0.5, 0.5, 1.0, 0.0],
+        [-0.5, -0.5, 0.0, 1.0],
+        [0.5, 0.5, 1.0, 0.0],
+        [0.5, -0.5, 1.0, 1.0],
+        [-0.5, -0.5, 0.0, 1.0],
+    ],
+    dtype=np.float32,
+)
+
+# programs of the layer paths: instanced (integer IDs) and CPU-expanded (packed IDs)
+_LAYER_PROGRAMS = {
+    "entities": (
+        "vertex_shader_pick_instanced.glsl",
+        "fragment_shader_pick_instanced.glsl",
+        ("position", "i_offset"),
+    ),
+    "entities_120": (
+        "vertex_shader_debug_120.glsl",  # per-vertex color carries the packed ID
+        "fragment_shader_debug_120.glsl",
+        ("a_pos", "a_color"),
+    ),
+    "sprites": (
+        "vertex_shader_pick_sprite.glsl",
+        "fragment_shader_pick_sprite.glsl",
+        ("corner", "i_rect", "i_uv"),
+    ),
+    "sprites_120": (
+        "vertex_shader_pick_sprite_120.glsl",
+        "fragment_shader_pick_sprite_120.glsl",
+        ("position", "uv", "a_id"),
+    ),
+}
+
+_active = None
+
+
+def get_active():
+    """Picker enabled with GameEngine.enable_picking(), or None."""
+    return _active
+
+
+def set_active(picker):
+    global _active
+    _active = picker
+
+
+def _packed(ids):
+    """(n, 3) float32 RGB bytes of IDs for the RGBA8 target, normalized to 0..1."""
+    ids = np.asarray(ids, dtype=np.int64)
+    return (np.stack((ids, ids >> 8, ids >> 16), axis=1) & 0xFF).astype(np.float32) / 255.0
+
+
+class _IdTable:
+    """IDs handed out in one pass: one per object, or a range per layer."""
+
+    def __init__(self):
+        self.next_id = 1  # ID 0 = nothing
+        self._firsts = []
+        self._entries = []  # (object, rows or None)
+
+    def add(self, obj, rows=None):
+        """First ID of obj, or of its rows (one ID per row, in order)."""
+        first = self.next_id
+        self._firsts.append(first)
+        self._entries.append((obj, rows))
+        self.next_id += 1 if rows is None else len(rows)
+        return first
+
+    def lookup(self, object_id):
+        if not 0 < object_id < self.next_id:
+            return None, None
+        index = bisect.bisect_right(self._firsts, object_id) - 1
+        obj, rows = self._entries[index]
+        if rows is None:
+            return obj, None
+        return obj, int(rows[object_id - self._firsts[index]])
+
+
+class Picker:
+    """Renders object IDs under the cursor when the cursor, camera or scene changed.
+
+    Moving objects under a still cursor are only picked up after invalidate(), or
+    on every frame with always=True. hovered is the topmost object from the last
+    completed readback: an Entity handle for EntityLayer rows, the layer for
+    SpriteLayer rows (hovered_row is the sprite ID) and the TileMap for tiles.
+
+    Shapes, buttons, entity layers, sprite layers (transparent texels excluded) and
+    tile maps (whole tiles) take part and occlude in scene order; other objects,
+    such as text or debug drawing, are transparent to picks.
+    """
+
+    def __init__(self, always=False):
+        self.window = glfw.get_current_context()
+        self.always = always
+        self.hovered = None
+        self.hovered_row = None  # row of a layer hit (sprite ID), else None
+        self.hovered_id = 0
+        self.ready = False  # at least one readback collected
+        self.passes = 0  # pick passes rendered
+        version = _gl_version_tuple()
+        # GL_R32UI with GLSL 330 shaders; RGBA8 with packed IDs before
+        self._integer = version >= (3, 3)
+        self._use_fences = version >= (3, 2)
+        self.fbo = None
+        self.texture = None
+        self.vao = None
+        self.quad_vbo = None
+        self.stream = None  # layer rows of the current pass
+        self._layer_programs = {}
+        self.pbos = []
+        self._fences = [None] * _RING
+        self._tables = [None] * _RING  # ID -> object list of the pass read into each PBO
+        self._index = 0
+        self._key = None
+        self._dirty = True
+        self._scene = None
+        self._program = None
+        self._program_generation = None
+        self._cursor = (0.0, 0.0)
+
+    def invalidate(self):
+        """Re-render the pick pass on the next update (e.g. objects moved)."""
+        self._dirty = True
+
+    # ------------------------------ GL setup --------------------------------
+    def _setup(self):
+        if not bool(glGenFramebuffers):
+            raise RuntimeError("Framebuffer objects are not supported by this context")
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        if self._integer:
+            glTexImage2D(
+                GL_TEXTURE_2D, 0, GL_R32UI, 1, 1, 0,
+                GL_RED_INTEGER, GL_UNSIGNED_INT, None,
+            )
+        else:
+            glTexImage2D(
+                GL_TEXTURE_2D, 0, GL_RGBA8, 1, 1, 0, GL_RGBA, GL_UNSIGNED_BYTE, None
+            )
+        glBindTexture(GL_TEXTURE_2D, 0)
+        resources.track("texture", self.texture, self, 4)
+
+        self.fbo = glGenFramebuffers(1)
+        resources.track("framebuffer", self.fbo, self)
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferTexture2D(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0
+        )
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, int(previous))
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.cleanup()
+            raise RuntimeError(f"Pick framebuffer incomplete: 0x{status:x}")
+
+        self.pbos = [int(pbo) for pbo in np.atleast_1d(glGenBuffers(_RING))]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, 4, None, GL_STREAM_READ)
+            resources.track("buffer", pbo, self, 4)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        suffix = "" if self._integer else "_120"
+        self._program = get_program(
+            f"vertex_shader_pick{suffix}.glsl",
+            f"fragment_shader_pick{suffix}.glsl",
+            ("position",),
+        )
+        try:
+            self.vao = glGenVertexArrays(1)  # layer draws (required by core profiles)
+            resources.track("vao", self.vao, self)
+        except Exception:
+            self.vao = None  # GL 2.1 without VAO support
+        self.stream = StreamingBuffer(region_size=256 * 1024, owner=self)
+
+    def _query_uniforms(self):
+        program = self._program.program
+        self._u_pos = glGetUniformLocation(program, "u_position")
+        self._u_scale = glGetUniformLocation(program, "u_scale")
+        self._u_world = glGetUniformLocation(program, "u_world")
+        self._u_id = glGetUniformLocation(program, "u_id")
+        self._u_view_proj = get_camera_uniforms().register_program(program)
+        self._program_generation = self._program.generation
+
+    # ------------------------------ per frame -------------------------------
+    def update(self, scene):
+        """Collect finished readbacks, then re-render the pick pass if needed."""
+        if self.fbo is None:
+            self._setup()
+        self._collect(scene)
+        if scene is not self._scene:
+            self._scene = scene
+            self._dirty = True
+        cursor = glfw.get_cursor_pos(self.window)
+        key = (cursor, get_camera().version, scene.version)
+        if not (self.always or self._dirty or key != self._key):
+            return
+        self._key = key
+        self._dirty = False
+        self._render(scene, cursor)
+
+    def _render(self, scene, cursor):
+        self._cursor = cursor
+        window_width, window_height = glfw.get_window_size(self.window)
+        fb_width, fb_height = glfw.get_framebuffer_size(self.window)
+        x = int(cursor[0] * fb_width / max(window_width, 1))
+        y = fb_height - 1 - int(cursor[1] * fb_height / max(window_height, 1))
+        if not (0 <= x < fb_width and 0 <= y < fb_height):
+            self._set_hovered(scene, 0, None, None)  # cursor outside the window
+            return
+
+        previous_fbo = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        # the whole window maps to the viewport, the cursor pixel to texel (0, 0)
+        glViewport(-x, -y, fb_width, fb_height)
+        if self._integer:
+            glClearBufferuiv(GL_COLOR, 0, np.zeros(4, dtype=np.uint32))
+        else:
+            glClearColor(0.0, 0.0, 0.0, 0.0)
+            glClear(GL_COLOR_BUFFER_BIT)
+        glDisable(GL_BLEND)
+
+        program = self._program.program
+        glUseProgram(program)
+        if self._program.generation != self._program_generation:
+            self._query_uniforms()
+        get_camera_uniforms().apply(program, self._u_view_proj)
+        table = _IdTable()
+        for obj in scene.objects.values():
+            self._draw(obj, table)
+        glUseProgram(0)
+        self.stream.end_frame()
+
+        index = self._index
+        self._release_fence(index)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[index])
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        if self._integer:
+            glReadPixels(0, 0, 1, 1, GL_RED_INTEGER, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        else:
+            glReadPixels(0, 0, 1, 1, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        if self._use_fences:
+            self._fences[index] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self._tables[index] = table
+        self._index = (index + 1) % _RING
+        self.passes += 1
+
+        glBindFramebuffer(GL_FRAMEBUFFER, int(previous_fbo))
+        glViewport(*[int(value) for value in viewport])
+        glClearColor(*[float(value) for value in clear_color])
+
+    # ------------------------------ drawing ---------------------------------
+    def _draw(self, obj, table):
+        if not getattr(obj, "initialized", False):
+            return
+        widgets = getattr(obj, "widgets", None)
+        if widgets is not None:  # UILayer
+            for widget in widgets.values():
+                self._draw(widget, table)
+            return
+        if hasattr(obj, "store"):  # EntityLayer: one ID per live entity
+            self._draw_entities(obj, table)
+            return
+        if hasattr(obj, "sheet"):  # SpriteLayer: one ID per live sprite
+            self._draw_sprites(obj, table)
+            return
+        if hasattr(obj, "tiles"):  # TileMap: its visible chunks, one ID
+            self._draw_tiles(obj, table)
+            return
+        if hasattr(obj, "_fill_count"):  # Button: NDC triangles, outline included
+            mode, count, world, scale = (
+                GL_TRIANGLES,
+                obj._fill_count + obj._outline_count,
+                0.0,
+                1.0,
+            )
+        elif getattr(obj, "primitive", None) is not None:  # Square, Circle
+            mode, count, world, scale = obj.primitive, obj._vertex_count, 1.0, obj.scale
+        else:
+            return
+        self._set_id(table.add(obj))
+        self._bind(obj)
+        glUniform3fv(self._u_pos, 1, obj.position)
+        glUniform1f(self._u_scale, scale)
+        glUniform1f(self._u_world, world)
+        glDrawArrays(mode, 0, count)
+        self._unbind(obj)
+
+    def _draw_tiles(self, tilemap, table):
+        self._set_id(table.add(tilemap))
+        glUniform3fv(self._u_pos, 1, tilemap.position)
+        glUniform1f(self._u_scale, tilemap.scale)
+        glUniform1f(self._u_world, 1.0)
+        if tilemap._has_vao:
+            glBindVertexArray(tilemap.vao)
+        rows, cols = tilemap.visible_chunks()
+        for chunk_row in rows:
+            for chunk_col in cols:
+                chunk = tilemap._chunks.get((chunk_row, chunk_col))
+                if chunk is None or not chunk[2]:
+                    continue  # not built by render() yet, or empty
+                glBindBuffer(GL_ARRAY_BUFFER, chunk[0])
+                glEnableVertexAttribArray(0)  # x, y of (x, y, u, v) vertices
+                glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(0))
+                glDrawArrays(GL_TRIANGLES, 0, chunk[2])
+        if tilemap._has_vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _draw_entities(self, layer, table):
+        ids, data = layer.instance_data()
+        if not len(ids):
+            return
+        shape = layer.shape
+        if self._integer:
+            entry = self._use_layer_program("entities")
+            glUniform1ui(entry["u_id_base"], table.add(layer, ids))
+            offset = self.stream.write(data)
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, shape.vbo)
+            self._attribute(0, 3, 12, 0)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            self._attribute(1, 4, 28, offset, divisor=1)
+            glDrawArraysInstanced(shape.primitive, 0, shape._vertex_count, len(ids))
+            self._end_layer()
+        elif layer._triangles is not None:
+            entry = self._use_layer_program("entities_120")
+            triangles = layer._triangles
+            vertices = np.empty((len(ids), len(triangles), 7), dtype=np.float32)
+            vertices[:, :, 0:3] = triangles * data[:, None, 3:4] + data[:, None, 0:3]
+            first = table.add(layer, ids)
+            vertices[:, :, 3:6] = _packed(first + np.arange(len(ids)))[:, None]
+            vertices[:, :, 6] = 1.0
+            offset = self.stream.write(vertices)
+            self._bind_layer_vao()
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            self._attribute(0, 3, 28, offset)
+            self._attribute(1, 4, 28, offset + 12)
+            glDrawArrays(GL_TRIANGLES, 0, len(ids) * len(triangles))
+            self._end_layer(1)
+        else:
+            # shapes without class-level geometry: one draw per entity
+            self._bind(shape)
+            glUniform1f(self._u_world, 1.0)
+            for entity in ids:
+                self._set_id(table.add(layer.store.entity(int(entity))))
+                glUniform3fv(self._u_pos, 1, layer.store.position[entity])
+                glUniform1f(self._u_scale, layer.store.scale[entity])
+                glDrawArrays(shape.primitive, 0, shape._vertex_count)
+            self._unbind(shape)
+
+    def _draw_sprites(self, layer, table):
+        ids = layer.alive_ids()
+        if not len(ids):
+            return
+        data = layer.instance_data()
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, layer.sheet.texture)
+        if self._integer:
+            entry = self._use_layer_program("sprites")
+            glUniform1i(entry["u_texture"], 0)
+            glUniform1ui(entry["u_id_base"], table.add(layer, ids))
+            offset = self.stream.write(data)
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self._quad())
+            self._attribute(0, 4, 16, 0)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            self._attribute(1, 4, 32, offset, divisor=1)
+            self._attribute(2, 4, 32, offset + 16, divisor=1)
+            glDrawArraysInstanced(GL_TRIANGLES, 0, 6, len(ids))
+            self._end_layer(2)
+        else:
+            entry = self._use_layer_program("sprites_120")
+            glUniform1i(entry["u_texture"], 0)
+            vertices = np.empty((len(ids), 6, 7), dtype=np.float32)
+            vertices[:, :, 0:2] = data[:, None, 0:2] + _QUAD[:, 0:2] * data[:, None, 2:4]
+            vertices[:, :, 2:4] = data[:, None, 4:6] + _QUAD[:, 2:4] * (
+                data[:, None, 6:8] - data[:, None, 4:6]
+            )
+            first = table.add(layer, ids)
+            vertices[:, :, 4:7] = _packed(first + np.arange(len(ids)))[:, None]
+            offset = self.stream.write(vertices)
+            self._bind_layer_vao()
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            self._attribute(0, 2, 28, offset)
+            self._attribute(1, 2, 28, offset + 8)
+            self._attribute(2, 3, 28, offset + 16)
+            glDrawArrays(GL_TRIANGLES, 0, len(ids) * 6)
+            self._end_layer(2)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    # ------------------------------ layer helpers ---------------------------
+    def _use_layer_program(self, key):
+        """Bind a layer program (created on first use) with the camera applied."""
+        entry = self._layer_programs.get(key)
+        if entry is None:
+            entry = {"program": get_program(*_LAYER_PROGRAMS[key]), "generation": None}
+            self._layer_programs[key] = entry
+        shader = entry["program"]
+        program = shader.program
+        glUseProgram(program)
+        if entry["generation"] != shader.generation:
+            entry["u_id_base"] = glGetUniformLocation(program, "u_id_base")
+            entry["u_texture"] = glGetUniformLocation(program, "u_texture")
+            entry["u_view_proj"] = get_camera_uniforms().register_program(program)
+            entry["generation"] = shader.generation
+        get_camera_uniforms().apply(program, entry["u_view_proj"])
+        return entry
+
+    def _bind_layer_vao(self):
+        if self.vao:
+            glBindVertexArray(self.vao)
+
+    @staticmethod
+    def _attribute(location, size, stride, offset, divisor=0):
+        glEnableVertexAttribArray(location)
+        glVertexAttribPointer(
+            location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset)
+        )
+        if divisor:
+            glVertexAttribDivisor(location, divisor)
+
+    def _end_layer(self, last_location=1):
+        """Reset the attribute state of a layer draw and rebind the object program."""
+        for location in range(last_location + 1):
+            if self._integer:
+                glVertexAttribDivisor(location, 0)
+            glDisableVertexAttribArray(location)
+        if self.vao:
+            glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(self._program.program)
+
+    def _quad(self):
+        if self.quad_vbo is None:
+            self.quad_vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self.quad_vbo)
+            glBufferData(GL_ARRAY_BUFFER, _QUAD.nbytes, _QUAD, GL_STATIC_DRAW)
+            resources.track("buffer", self.quad_vbo, self, _QUAD.nbytes)
+        return self.quad_vbo
+
+    def _set_id(self, object_id):
+        if self._integer:
+            glUniform1ui(self._u_id, object_id)
+        else:
+            packed = (object_id & 0xFF, (object_id >> 8) & 0xFF, (object_id >> 16) & 0xFF)
+            glUniform3f(self._u_id, *[value / 255.0 for value in packed])
+
+    @staticmethod
+    def _bind(obj):
+        if obj._has_vao and obj.vao:
+            glBindVertexArray(obj.vao)
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, obj.vbo)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
+
+    @staticmethod
+    def _unbind(obj):
+        if obj._has_vao and obj.vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    # ------------------------------ readback --------------------------------
+    def _ready(self, index):
+        fence = self._fences[index]
+        if fence is None:
+            return True  # no fences (GL < 3.2): the ring gives one frame of latency
+        status = glClientWaitSync(fence, 0, 0)
+        return status in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED)
+
+    def _collect(self, scene):
+        """Map finished PBOs oldest first; the newest result wins."""
+        for offset in range(_RING):
+            index = (self._index + offset) % _RING
+            table = self._tables[index]
+            if table is None:
+                continue
+            if not self._ready(index):
+                break
+            texel = (ctypes.c_ubyte * 4)()
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[index])
+            pointer = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+            if pointer:
+                ctypes.memmove(texel, pointer, 4)
+                glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            self._release_fence(index)
+            self._tables[index] = None
+            if self._integer:
+                object_id = int(np.frombuffer(texel, dtype=np.uint32)[0])
+            else:
+                object_id = texel[0] | (texel[1] << 8) | (texel[2] << 16)
+            obj, row = table.lookup(object_id)
+            if row is not None and hasattr(obj, "store"):
+                obj, row = obj.store.entity(row), None  # EntityLayer rows as handles
+            self._set_hovered(scene, object_id, obj, row)
+
+    def _set_hovered(self, scene, object_id, hit, row):
+        self.ready = True
+        changed = hit != self.hovered or row != self.hovered_row
+        self.hovered_id = object_id
+        self.hovered = hit
+        self.hovered_row = row
+        if changed:
+            # widgets test against the pick result, so let them re-evaluate hover
+            scene.handle_cursor_pos(*self._cursor)
+
+    def _release_fence(self, index):
+        if self._fences[index] is not None:
+            glDeleteSync(self._fences[index])
+            self._fences[index] = None
+
+    # ------------------------------ cleanup ---------------------------------
+    def cleanup(self):
+        for index in range(_RING):
+            self._release_fence(index)
+            self._tables[index] = None
+        if self.pbos:
+            glDeleteBuffers(len(self.pbos), self.pbos)
+            for pbo in self.pbos:
+                resources.untrack("buffer", pbo)
+        if self.fbo:
+            glDeleteFramebuffers(1, [self.fbo])
+            resources.untrack("framebuffer", self.fbo)
+        if self.texture:
+            glDeleteTextures(1, [self.texture])
+            resources.untrack("texture", self.texture)
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.quad_vbo:
+            glDeleteBuffers(1, [self.quad_vbo])
+            resources.untrack("buffer", self.quad_vbo)
+        if self.stream:
+            self.stream.cleanup()
+        if self._program is not None:
+            release_program(self._program.program)
+        for entry in self._layer_programs.values():
+            release_program(entry["program"].program)
+        self.pbos = []
+        self.fbo = None
+        self.texture = None
+        self.vao = None
+        self.quad_vbo = None
+        self.stream = None
+        self._layer_programs = {}
+        self._program = None
+        self._program_generation = None
+        self.hovered = None
+        self.hovered_row = None
+        self.hovered_id = 0
+        self.ready = False
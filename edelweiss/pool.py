@@ -0,0 +1,95 @@
+class ObjectPool:
+    """Recycles GameObjects of one class, including their GL resources.
+
+    Instances and their names are created up front ("<prefix>#<index>"), so
+    spawn()/despawn() only move objects between the free list and the scene and
+    write state into the existing arrays: no new Python objects, arrays or GL
+    buffers. The pool grows by doubling when exhausted, up to max_size.
+    """
+
+    def __init__(self, cls, size=64, scene=None, prefix=None, max_size=None, **kwargs):
+        self.cls = cls
+        self.scene = scene
+        self.prefix = prefix or cls.__name__.lower()
+        self.max_size = max_size
+        self.kwargs = kwargs  # constructor arguments for every instance
+        self.objects = []  # every instance, index == pool slot
+        self._free = []  # stack of idle instances
+        self._active = set()
+        self._grow(size)
+
+    def _grow(self, count):
+        if self.max_size is not None:
+            count = min(count, self.max_size - len(self.objects))
+        if count <= 0:
+            raise RuntimeError(
+                f"ObjectPool '{self.prefix}' exhausted ({len(self.objects)} objects)"
+            )
+        start = len(self.objects)
+        for index in range(start, start + count):
+            obj = self.cls(name=f"{self.prefix}#{index}", **self.kwargs)
+            obj.pool = self
+            self.objects.append(obj)
+        # reversed so the lowest slots are handed out first
+        self._free.extend(reversed(self.objects[start:]))
+
+    def __len__(self):
+        return len(self._active)
+
+    @property
+    def capacity(self):
+        return len(self.objects)
+
+    @property
+    def active(self):
+        return self._active
+
+    def spawn(self, position=None, color=None, scale=None, velocity=None):
+        """Take an idle instance, reset its state in place and add it to the scene."""
+        if not self._free:
+            self._grow(max(1, len(self.objects)))
+        obj = self._free.pop()
+        if position is not None:
+            obj.position[: len(position)] = position
+        if color is not None:
+            obj.color[:] = color
+        if scale is not None:
+            obj.scale = float(scale)
+        if velocity is not None:
+            obj.velocity[: len(velocity)] = velocity
+        self._active.add(obj)
+        if self.scene is not None:
+            self.scene.objects[obj.name] = obj  # name is reserved, no duplicate check
+            self.scene.version += 1
+        return obj
+
+    def despawn(self, obj):
+        """Return an instance to the pool; its GL resources are kept for reuse."""
+        if getattr(obj, "pool", None) is not self:
+            raise ValueError(f"Object '{obj.name}' does not belong to this pool")
+        if obj not in self._active:
+            return
+        self._active.remove(obj)
+        if self.scene is not None:
+            self.scene.objects.pop(obj.name, None)
+            self.scene.version += 1
+        self._free.append(obj)
+
+    def clear(self):
+        """Despawn every active instance."""
+        for obj in list(self._active):
+            self.despawn(obj)
+
+    def preload(self):
+        """Create GL resources of all instances now instead of on first spawn."""
+        for obj in self.objects:
+            if not getattr(obj, "initialized", False):
+                obj.initialize()
+                obj.initialized = True
+
+    def cleanup(self):
+        """Free GL resources of all instances; they are recreated on next render."""
+        for obj in self.objects:
+            if getattr(obj, "initialized", False):
+                obj.cleanup()
+                obj.initialized = False
@@ -0,0 +1,418 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+import glfw
+
+from edelweiss import resources
+from edelweiss.figure import _gl_version_tuple
+from edelweiss.shaders import get_program, release_program
+
+# One triangle covering the whole viewport (cheaper than a two-triangle quad)
+_FULLSCREEN_TRIANGLE = np.array([-1.0, -1.0, 3.0, -1.0, -1.0, 3.0], dtype=np.float32)
+
+
+def _shader_suffix():
+    major, _ = _gl_version_tuple()
+    return "" if major >= 3 else "_120"
+
+
+class RenderTarget:
+    """Offscreen framebuffer with a color texture that can be sampled afterwards."""
+
+    def __init__(
+        self, width, height, internal_format=GL_RGBA8, filtering=GL_LINEAR, owner=None
+    ):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.internal_format = internal_format
+        self.filtering = filtering
+        self.owner = owner  # for the resource registry
+        self.fbo = None
+        self.texture = None
+        self._create()
+
+    def _create(self):
+        if not bool(glGenFramebuffers):
+            raise RuntimeError("Framebuffer objects are not supported by this context")
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, self.filtering)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, self.filtering)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, self.internal_format, self.width, self.height, 0,
+            GL_RGBA, GL_UNSIGNED_BYTE, None,
+        )
+        glBindTexture(GL_TEXTURE_2D, 0)
+        resources.track("texture", self.texture, self.owner or self, self.size_bytes)
+
+        self.fbo = glGenFramebuffers(1)
+        resources.track("framebuffer", self.fbo, self.owner or self)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferTexture2D(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0
+        )
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.cleanup()
+            raise RuntimeError(f"Framebuffer incomplete: 0x{status:x}")
+
+    @property
+    def size_bytes(self):
+        return self.width * self.height * 4
+
+    def resize(self, width, height):
+        width, height = max(1, int(width)), max(1, int(height))
+        if (width, height) == (self.width, self.height):
+            return
+        self.cleanup()
+        self.width, self.height = width, height
+        self._create()
+
+    def bind(self):
+        """Redirect rendering into this target."""
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    @staticmethod
+    def bind_default():
+        """Render to the window again."""
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        width, height = glfw.get_framebuffer_size(glfw.get_current_context())
+        glViewport(0, 0, width, height)
+
+    def cleanup(self):
+        if self.fbo:
+            glDeleteFramebuffers(1, [self.fbo])
+            resources.untrack("framebuffer", self.fbo)
+        if self.texture:
+            glDeleteTextures(1, [self.texture])
+            resources.untrack("texture", self.texture)
+        self.fbo = None
+        self.texture = None
+
+
+class FullscreenQuad:
+    """Shared geometry for drawing a texture over the whole viewport."""
+
+    def __init__(self):
+        self.vao = None
+        self.vbo = None
+        self._has_vao = False
+
+    def _setup(self):
+        self._has_vao = True
+        try:
+            self.vao = glGenVertexArrays(1)
+            if glGetError() != GL_NO_ERROR:
+                self._has_vao = False
+                self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
+        except Exception:
+            self._has_vao = False
+            self.vao = None
+
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(
+            GL_ARRAY_BUFFER,
+            _FULLSCREEN_TRIANGLE.nbytes,
+            _FULLSCREEN_TRIANGLE,
+            GL_STATIC_DRAW,
+        )
+        resources.track("buffer", self.vbo, self, _FULLSCREEN_TRIANGLE.nbytes)
+        if self._has_vao:
+            glBindVertexArray(self.vao)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
+            glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        if self.vbo is None:
+            self._setup()
+        if self._has_vao:
+            glBindVertexArray(self.vao)
+            glDrawArrays(GL_TRIANGLES, 0, 3)
+            glBindVertexArray(0)
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
+            glDrawArrays(GL_TRIANGLES, 0, 3)
+            glDisableVertexAttribArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def cleanup(self):
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.vbo:
+            glDeleteBuffers(1, [self.vbo])
+            resources.untrack("buffer", self.vbo)
+        self.vao = None
+        self.vbo = None
+
+
+_quad = None
+_copy_program = None
+
+
+def get_fullscreen_quad():
+    global _quad
+    if _quad is None:
+        _quad = FullscreenQuad()
+    return _quad
+
+
+def _get_copy_program():
+    global _copy_program
+    if _copy_program is None:
+        suffix = _shader_suffix()
+        _copy_program = get_program(
+            f"vertex_shader_fullscreen{suffix}.glsl",
+            f"fragment_shader_copy{suffix}.glsl",
+            ("position",),
+        )
+    return _copy_program
+
+
+def draw_texture(texture, blend=False):
+    """Draw a texture over the current viewport (used for blits and UI compositing)."""
+    program = _get_copy_program()
+    glUseProgram(program.program)
+    glActiveTexture(GL_TEXTURE0)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glUniform1i(glGetUniformLocation(program.program, "u_source"), 0)
+    if blend:
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)  # targets hold premultiplied alpha
+    get_fullscreen_quad().draw()
+    if blend:
+        glDisable(GL_BLEND)
+    glBindTexture(GL_TEXTURE_2D, 0)
+    glUseProgram(0)
+
+
+def cleanup():
+    """Free the shared quad and copy program."""
+    global _quad, _copy_program
+    if _quad is not None:
+        _quad.cleanup()
+    if _copy_program is not None:
+        release_program(_copy_program.program)
+    _quad = None
+    _copy_program = None
+
+
+class PostPass:
+    """One full-screen pass: samples the previous image and writes its own target.
+
+    scale is relative to the size of the image the pass reads (0.5 = half-size
+    pass), so passes after a Downscale stay at the reduced size.
+    Subclasses set extra uniforms in set_uniforms(); enabled=False skips the pass.
+    """
+
+    fragment = "copy"
+
+    def __init__(self, scale=1.0):
+        self.scale = float(scale)
+        self.enabled = True
+        self.target = None
+        self.program = None
+
+    def setup(self):
+        suffix = _shader_suffix()
+        self.program = get_program(
+            f"vertex_shader_fullscreen{suffix}.glsl",
+            f"fragment_shader_{self.fragment}{suffix}.glsl",
+            ("position",),
+        )
+
+    def ensure_target(self, width, height):
+        width = max(1, int(width * self.scale))
+        height = max(1, int(height * self.scale))
+        if self.target is None:
+            self.target = RenderTarget(width, height)
+        else:
+            self.target.resize(width, height)
+        return self.target
+
+    def uniform(self, name):
+        return glGetUniformLocation(self.program.program, name)
+
+    def set_uniforms(self, source):
+        pass
+
+    def run(self, source, width, height):
+        """Render source (a RenderTarget) through this pass; returns the output target."""
+        if self.program is None:
+            self.setup()
+        target = self.ensure_target(width, height)
+        target.bind()
+        glUseProgram(self.program.program)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, source.texture)
+        glUniform1i(self.uniform("u_source"), 0)
+        self.set_uniforms(source)
+        get_fullscreen_quad().draw()
+        return target
+
+    def cleanup(self):
+        if self.target:
+            self.target.cleanup()
+        if self.program:
+            release_program(self.program.program)
+        self.target = None
+        self.program = None
+
+
+class Downscale(PostPass):
+    """Copy into a smaller target; later passes then run at the reduced size."""
+
+    def __init__(self, scale=0.5):
+        super().__init__(scale)
+
+
+class ColorGrading(PostPass):
+    fragment = "color_grading"
+
+    def __init__(
+        self, exposure=1.0, contrast=1.0, saturation=1.0, tint=(1.0, 1.0, 1.0)
+    ):
+        super().__init__()
+        self.exposure = exposure
+        self.contrast = contrast
+        self.saturation = saturation
+        self.tint = np.array(tint, dtype=np.float32)
+
+    def set_uniforms(self, source):
+        glUniform1f(self.uniform("u_exposure"), self.exposure)
+        glUniform1f(self.uniform("u_contrast"), self.contrast)
+        glUniform1f(self.uniform("u_saturation"), self.saturation)
+        glUniform3fv(self.uniform("u_tint"), 1, self.tint)
+
+
+class _BrightPass(PostPass):
+    fragment = "bright_pass"
+
+    def __init__(self, scale, threshold):
+        super().__init__(scale)
+        self.threshold = threshold
+
+    def set_uniforms(self, source):
+        glUniform1f(self.uniform("u_threshold"), self.threshold)
+
+
+class _BlurPass(PostPass):
+    fragment = "blur"
+
+    def __init__(self, scale, horizontal):
+        super().__init__(scale)
+        self.horizontal = horizontal
+
+    def set_uniforms(self, source):
+        if self.horizontal:
+            direction = (1.0 / source.width, 0.0)
+        else:
+            direction = (0.0, 1.0 / source.height)
+        glUniform2f(self.uniform("u_direction"), *direction)
+
+
+class Bloom(PostPass):
+    """Bright pass and separable blur at reduced resolution, added back onto the image."""
+
+    fragment = "bloom_composite"
+
+    def __init__(self, threshold=0.7, intensity=0.8, downscale=0.5):
+        super().__init__()
+        self.intensity = intensity
+        self._subpasses = [
+            _BrightPass(downscale, threshold),
+            _BlurPass(downscale, horizontal=True),
+            _BlurPass(downscale, horizontal=False),
+        ]
+        self._bloom = None
+
+    @property
+    def threshold(self):
+        return self._subpasses[0].threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        self._subpasses[0].threshold = value
+
+    def run(self, source, width, height):
+        bloom = source
+        for subpass in self._subpasses:
+            bloom = subpass.run(bloom, width, height)
+        self._bloom = bloom
+        return super().run(source, width, height)
+
+    def set_uniforms(self, source):
+        glActiveTexture(GL_TEXTURE1)
+        glBindTexture(GL_TEXTURE_2D, self._bloom.texture)
+        glUniform1i(self.uniform("u_bloom"), 1)
+        glUniform1f(self.uniform("u_intensity"), self.intensity)
+        glActiveTexture(GL_TEXTURE0)
+
+    def cleanup(self):
+        for subpass in self._subpasses:
+            subpass.cleanup()
+        super().cleanup()
+
+
+class PostProcessChain:
+    """Renders the scene offscreen at resolution_scale, runs the passes, then upscales.
+
+    With resolution_scale < 1 the world is drawn at a lower internal resolution and
+    stretched to the window, which is the main lever for weak GPUs.
+    """
+
+    def __init__(self, passes=(), resolution_scale=1.0):
+        self.passes = list(passes)
+        self.resolution_scale = float(resolution_scale)
+        self.scene_target = None
+
+    def add_pass(self, post_pass):
+        self.passes.append(post_pass)
+        return post_pass
+
+    def internal_size(self):
+        width, height = glfw.get_framebuffer_size(glfw.get_current_context())
+        return (
+            max(1, int(width * self.resolution_scale)),
+            max(1, int(height * self.resolution_scale)),
+        )
+
+    def begin(self):
+        """Start capturing the frame; call before Scene.render()."""
+        width, height = self.internal_size()
+        if self.scene_target is None:
+            self.scene_target = RenderTarget(width, height)
+        else:
+            self.scene_target.resize(width, height)
+        self.scene_target.bind()
+
+    def end(self):
+        """Run the enabled passes and present the result to the window."""
+        width, height = self.scene_target.width, self.scene_target.height
+        image = self.scene_target
+        for post_pass in self.passes:
+            if post_pass.enabled:
+                image = post_pass.run(image, width, height)
+                width, height = image.width, image.height  # next pass reads this size
+
+        # the only upscale: the final image stretched over the window
+        RenderTarget.bind_default()
+        draw_texture(image.texture)
+
+    def cleanup(self):
+        for post_pass in self.passes:
+            post_pass.cleanup()
+        if self.scene_target:
+            self.scene_target.cleanup()
+        self.scene_target = None
@@ -0,0 +1,158 @@
+import struct
+import time
+import glfw
+import numpy as np
+from OpenGL.GL import glFinish
+
+from edelweiss.events import EventRecorder, CURSOR_POS
+
+# File layout: header, then the event table, then the per-frame table (both little-endian).
+_MAGIC = b"EDLREC"
+_VERSION = 1
+_HEADER = struct.Struct("<6sHIId")  # magic, version, event count, frame count, fixed dt
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("frame", "<u4"),
+        ("time", "<f4"),  # seconds since the recording started
+        ("kind", "u1"),
+        ("a", "<f8"),  # key / button / cursor x
+        ("b", "<f8"),  # action / cursor y
+        ("c", "<i4"),  # mods
+    ]
+)
+FRAME_DTYPE = np.dtype([("time", "<f8"), ("duration", "<f4")])
+
+
+class InputRecording:
+    """Timestamped input events plus frame boundaries of one session."""
+
+    def __init__(self, events, frames, fixed_dt=1.0 / 60.0):
+        self.events = events
+        self.frames = frames
+        self.fixed_dt = fixed_dt
+
+    @property
+    def frame_count(self):
+        return len(self.frames)
+
+    def frame_events(self):
+        """Per-frame lists of (kind, a, b, c) ready for EventQueue.inject()."""
+        grouped = [[] for _ in range(self.frame_count)]
+        for frame, _, kind, a, b, c in self.events.tolist():
+            # keys, buttons and actions are integers; cursor coordinates stay floats
+            if kind != CURSOR_POS:
+                a, b = int(a), int(b)
+            grouped[frame].append((kind, a, b, c))
+        return grouped
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC, _VERSION, len(self.events), len(self.frames), self.fixed_dt
+                )
+            )
+            f.write(self.events.astype(EVENT_DTYPE, copy=False).tobytes())
+            f.write(self.frames.astype(FRAME_DTYPE, copy=False).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, n_events, n_frames, fixed_dt = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported input recording version: {version}")
+        offset = _HEADER.size
+        events = np.frombuffer(data, EVENT_DTYPE, n_events, offset)
+        offset += n_events * EVENT_DTYPE.itemsize
+        frames = np.frombuffer(data, FRAME_DTYPE, n_frames, offset)
+        return cls(events, frames, fixed_dt)
+
+
+class InputRecorder(EventRecorder):
+    """EventRecorder that also timestamps events and frame boundaries for saving to disk."""
+
+    def __init__(self, fixed_dt=1.0 / 60.0):
+        super().__init__()
+        self.fixed_dt = fixed_dt
+        self._start = time.perf_counter()
+        self._last_frame = self._start
+        self._frames = []
+
+    def record_event(self, frame, event):
+        timestamp, kind, a, b, c = event
+        self.events.append((self.frames, timestamp - self._start, kind, a, b, c))
+
+    def end_frame(self, frame):
+        now = time.perf_counter()
+        self._frames.append((now - self._start, now - self._last_frame))
+        self._last_frame = now
+        self.frames += 1
+
+    def recording(self):
+        return InputRecording(
+            np.array(self.events, dtype=EVENT_DTYPE),
+            np.array(self._frames, dtype=FRAME_DTYPE),
+            self.fixed_dt,
+        )
+
+    def save(self, path):
+        self.recording().save(path)
+
+
+def replay(engine, recording, fixed_dt=None):
+    """Feed a recording through the engine frame by frame; returns frame times in seconds.
+
+    Live input is discarded while replaying and every frame advances engine.dt by the
+    same fixed step, so two runs (or two engine versions) process identical work.
+    Create the engine with visible=False to profile without showing a window.
+    """
+    if isinstance(recording, str):
+        recording = InputRecording.load(recording)
+    dt = fixed_dt if fixed_dt is not None else recording.fixed_dt
+
+    engine.start()
+    glfw.swap_interval(0)  # measure the engine, not vsync
+    frame_times = np.empty(recording.frame_count, dtype=np.float64)
+    for index, events in enumerate(recording.frame_events()):
+        if not engine.running or glfw.window_should_close(engine.window):
+            frame_times = frame_times[:index]
+            break
+        start = time.perf_counter()
+        glfw.poll_events()
+        engine.events.drain()  # ignore real input during replay
+        engine.events.inject(events)
+        engine.frame(dt)
+        glFinish()  # include GPU time, not just command submission
+        frame_times[index] = time.perf_counter() - start
+    return frame_times
+
+
+def frame_time_summary(frame_times):
+    """Mean and percentile frame times in milliseconds."""
+    ms = np.asarray(frame_times, dtype=np.float64) * 1000.0
+    if not len(ms):
+        return {"frames": 0}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "frames": len(ms),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max()),
+    }
+
+
+def compare_frame_times(baseline, candidate):
+    """Print baseline vs candidate frame time statistics side by side."""
+    a = frame_time_summary(baseline)
+    b = frame_time_summary(candidate)
+    for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"):
+        if key in a and key in b:
+            change = (b[key] - a[key]) / a[key] * 100.0 if a[key] else 0.0
+            print(f"{key:>8}: {a[key]:8.3f} -> {b[key]:8.3f} ({change:+.1f}%)")
+    return a, b
@@ -0,0 +1,181 @@
+import collections
+import os
+import sys
+
+# Registry of live GL objects (programs, buffers, vertex arrays, textures,
+# framebuffers). Every create site calls track() and every delete site untrack(),
+# so counts and estimated GPU bytes are available at any time, and Scene.unload()
+# can name the objects whose resources outlived them.
+
+KINDS = ("program", "buffer", "vao", "texture", "framebuffer")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_HISTORY = 600  # frames kept by end_frame()
+
+
+class Resource:
+    __slots__ = ("kind", "handle", "owner", "owner_id", "nbytes", "site")
+
+    def __init__(self, kind, handle, owner, owner_id, nbytes, site):
+        self.kind = kind
+        self.handle = handle
+        self.owner = owner
+        self.owner_id = owner_id
+        self.nbytes = nbytes
+        self.site = site
+
+    def __repr__(self):
+        return f"<{self.kind} {self.handle} {self.nbytes} B owner={self.owner} at {self.site}>"
+
+
+def _describe(owner):
+    if owner is None or isinstance(owner, str):
+        return owner
+    name = getattr(owner, "name", None)
+    if name:
+        return f"{type(owner).__name__} '{name}'"
+    return type(owner).__name__
+
+
+def _location(frame):
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+def _creation_site():
+    """Engine line that created the object, plus the first caller outside the package."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    inner = frame
+    while frame is not None and os.path.abspath(frame.f_code.co_filename).startswith(
+        _PACKAGE_DIR + os.sep
+    ):
+        frame = frame.f_back
+    if frame is None or frame is inner:
+        return _location(inner)
+    return f"{_location(inner)} from {_location(frame)}"
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self.live = {}  # (kind, handle) -> Resource
+        self.counts = dict.fromkeys(KINDS, 0)
+        self.bytes = dict.fromkeys(KINDS, 0)
+        self.budget = None  # bytes; see set_budget()
+        self._over_budget = False
+        self.history = collections.deque(maxlen=_HISTORY)  # (count, bytes) per frame
+
+    def track(self, kind, handle, owner=None, nbytes=0):
+        if not handle:
+            return
+        key = (kind, int(handle))
+        if key in self.live:
+            self.untrack(kind, handle)  # GL reused the name; the old entry was missed
+        self.live[key] = Resource(
+            kind,
+            key[1],
+            _describe(owner),
+            None if owner is None or isinstance(owner, str) else id(owner),
+            int(nbytes),
+            _creation_site(),
+        )
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.bytes[kind] = self.bytes.get(kind, 0) + int(nbytes)
+
+    def resize(self, kind, handle, nbytes):
+        resource = self.live.get((kind, int(handle))) if handle else None
+        if resource is None:
+            return
+        self.bytes[kind] += int(nbytes) - resource.nbytes
+        resource.nbytes = int(nbytes)
+
+    def untrack(self, kind, handle):
+        resource = self.live.pop((kind, int(handle)), None) if handle else None
+        if resource is None:
+            return
+        self.counts[kind] -= 1
+        self.bytes[kind] -= resource.nbytes
+
+    def total_bytes(self):
+        return sum(self.bytes.values())
+
+    def stats(self):
+        """{kind: (live count, estimated bytes)} plus a 'total' entry."""
+        stats = {kind: (self.counts[kind], self.bytes[kind]) for kind in self.counts}
+        stats["total"] = (len(self.live), self.total_bytes())
+        return stats
+
+    def owned_by(self, owners):
+        ids = {id(owner) for owner in owners}
+        return [r for r in self.live.values() if r.owner_id in ids]
+
+    def check_leaks(self, owners, context="scene"):
+        """Warn about resources still held by owners (e.g. objects of an unloaded scene)."""
+        leaked = self.owned_by(owners)
+        if leaked:
+            total = sum(r.nbytes for r in leaked)
+            print(f"Warning: {len(leaked)} GPU resources ({total} B) leaked by {context}:")
+            for resource in leaked[:20]:
+                print(
+                    f"  {resource.kind} {resource.handle} ({resource.nbytes} B) "
+                    f"owned by {resource.owner}, created at {resource.site}"
+                )
+            if len(leaked) > 20:
+                print(f"  ... and {len(leaked) - 20} more")
+        return leaked
+
+    def set_budget(self, nbytes):
+        """Warn once when the estimated GPU memory goes above nbytes (None disables)."""
+        self.budget = nbytes
+        self._over_budget = False
+
+    def end_frame(self):
+        """Record this frame's totals; called by GameEngine.frame()."""
+        total = self.total_bytes()
+        self.history.append((len(self.live), total))
+        if self.budget is None:
+            return
+        if total > self.budget and not self._over_budget:
+            print(
+                f"Warning: estimated GPU memory {total / 2**20:.1f} MB is over the "
+                f"budget of {self.budget / 2**20:.1f} MB"
+            )
+            self.report(top=10)
+        self._over_budget = total > self.budget
+
+    def report(self, top=0):
+        """Print live counts and bytes per kind, and optionally the largest resources."""
+        print("GPU resources:")
+        for kind, (count, nbytes) in self.stats().items():
+            print(f"  {kind:<12} {count:>6}  {nbytes / 1024:>10.1f} KB")
+        if top:
+            largest = sorted(self.live.values(), key=lambda r: r.nbytes, reverse=True)
+            for resource in largest[:top]:
+                print(
+                    f"  {resource.nbytes / 1024:>10.1f} KB  {resource.kind} "
+                    f"{resource.handle} owned by {resource.owner} ({resource.site})"
+                )
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = ResourceRegistry()
+    return _registry
+
+
+def track(kind, handle, owner=None, nbytes=0):
+    get_registry().track(kind, handle, owner, nbytes)
+
+
+def resize(kind, handle, nbytes):
+    get_registry().resize(kind, handle, nbytes)
+
+
+def untrack(kind, handle):
+    get_registry().untrack(kind, handle)
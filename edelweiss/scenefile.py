@@ -0,0 +1,288 @@
+import json
+import struct
+
+import numpy as np
+
+# Binary scene files: a small versioned JSON header followed by 64-byte aligned
+# column blocks (position, color, scale, velocity, names...). Columns are opened
+# with np.memmap, so loading costs a header parse regardless of object count and
+# the arrays are used directly as object / EntityStore storage.
+
+MAGIC = b"EDLSCENE"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")  # magic, format version, header length
+_ALIGN = 64
+
+COLUMNS = (
+    ("position", np.float32, (3,)),
+    ("color", np.float32, (3,)),
+    ("scale", np.float32, ()),
+    ("velocity", np.float32, (3,)),
+)
+
+# type name in the file -> GameObject class; see register_type()
+_TYPES = {}
+
+_BUTTON_FIELDS = (
+    "x",
+    "y",
+    "width_pixels",
+    "height_pixels",
+    "outline_width",
+    "radius",
+    "text",
+    "font_path",
+    "font_size",
+    "transition",
+)
+_BUTTON_COLORS = ("base_color", "outline_color", "text_color")
+
+
+def register_type(name, cls):
+    """Make a GameObject subclass storable under name (Square and Circle are built in)."""
+    _TYPES[name] = cls
+
+
+def _object_types():
+    if not _TYPES:
+        from edelweiss.figure import Square, Circle
+
+        register_type("square", Square)
+        register_type("circle", Circle)
+    return _TYPES
+
+
+def _type_name(cls):
+    for name, registered in _object_types().items():
+        if registered is cls:
+            return name
+    return None
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def save_scene(scene, path):
+    """Write the scene's shapes, entity layers and buttons to path.
+
+    Rows are grouped by type so every type loads as one contiguous slice.
+    Objects of unregistered types are skipped with a warning.
+    """
+    from edelweiss.entities import EntityLayer
+
+    groups = {}  # type name -> list of (names, {column: array})
+    widgets = []
+    for obj in scene.objects.values():
+        if isinstance(obj, EntityLayer):
+            type_name = _type_name(type(obj.shape))
+            ids = obj.store.alive_ids()
+            rows = {
+                column: getattr(obj.store, column)[ids] for column, _, _ in COLUMNS
+            }
+            names = [""] * len(ids)  # entities are anonymous
+        elif hasattr(obj, "base_color") and hasattr(obj, "width_pixels"):
+            widgets.append(_button_record(obj))
+            continue
+        else:
+            type_name = _type_name(type(obj))
+            rows = {
+                column: np.asarray(getattr(obj, column), dtype=np.float32)[None]
+                for column, _, _ in COLUMNS
+            }
+            names = [obj.name]
+        if type_name is None:
+            kind = type(obj).__name__
+            print(f"save_scene: skipping '{obj.name}' ({kind} is not registered)")
+            continue
+        groups.setdefault(type_name, []).append((names, rows))
+
+    types, ranges, names, columns = [], {}, [], {name: [] for name, _, _ in COLUMNS}
+    count = 0
+    for type_name, parts in groups.items():
+        start = count
+        for part_names, rows in parts:
+            names.extend(part_names)
+            for column, dtype, shape in COLUMNS:
+                columns[column].append(
+                    np.asarray(rows[column], dtype=dtype).reshape((-1,) + shape)
+                )
+            count += len(part_names)
+        types.append(type_name)
+        ranges[type_name] = [start, count]
+
+    blocks = {}
+    for column, dtype, shape in COLUMNS:
+        parts = columns[column]
+        blocks[column] = (
+            np.concatenate(parts) if parts else np.zeros((0,) + shape, dtype=dtype)
+        )
+    encoded = [name.encode("utf-8") for name in names]
+    lengths = [0] + [len(name) for name in encoded]
+    blocks["name_offsets"] = np.cumsum(lengths, dtype=np.int64)
+    blocks["name_data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    header = {
+        "count": count,
+        "types": types,
+        "ranges": ranges,
+        "widgets": widgets,
+        "columns": {},
+    }
+    # column offsets are stored in the header, so grow the data start until the
+    # header (with its final offsets) fits in front of it
+    data_start = _aligned(_PREAMBLE.size + 1024)
+    while True:
+        offset = data_start
+        for column, array in blocks.items():
+            header["columns"][column] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset = _aligned(offset + array.nbytes)
+        header_bytes = json.dumps(header).encode("utf-8")
+        if _PREAMBLE.size + len(header_bytes) <= data_start:
+            break
+        data_start = _aligned(_PREAMBLE.size + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - _PREAMBLE.size, b" ")
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for column, array in blocks.items():
+            f.seek(header["columns"][column]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    return count
+
+
+def _button_record(button):
+    record = {"name": button.name}
+    for field in _BUTTON_FIELDS:
+        record[field] = getattr(button, field, None)
+    for field in _BUTTON_COLORS:
+        record[field] = [float(value) for value in getattr(button, field)]
+    return record
+
+
+class SceneFile:
+    """Header and memory-mapped columns of a scene file.
+
+    mmap_mode "c" (default) is copy-on-write: objects may move freely and the file
+    is never modified. "r" maps read-only, "r+" writes changes back to the file.
+    """
+
+    def __init__(self, path, mmap_mode="c"):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        with open(path, "rb") as f:
+            magic, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an edelweiss scene file")
+            if version > FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} uses scene format {version}; this version reads up to "
+                    f"{FORMAT_VERSION}"
+                )
+            header = json.loads(f.read(header_length).decode("utf-8"))
+        self.version = version
+        self.count = header["count"]
+        self.types = header["types"]
+        self.ranges = {name: tuple(bounds) for name, bounds in header["ranges"].items()}
+        self.widgets = header["widgets"]
+        self._layout = header["columns"]
+        self._columns = {}
+
+    def column(self, name):
+        """Memory-mapped column ((count, 3) or (count,) float32 for object data)."""
+        if name not in self._columns:
+            layout = self._layout[name]
+            shape = tuple(layout["shape"])
+            if 0 in shape:
+                array = np.zeros(shape, dtype=layout["dtype"])  # mmap can't map 0 bytes
+            else:
+                array = np.memmap(
+                    self.path,
+                    dtype=layout["dtype"],
+                    mode=self.mmap_mode,
+                    offset=layout["offset"],
+                    shape=shape,
+                )
+            self._columns[name] = array
+        return self._columns[name]
+
+    def names(self, start=0, stop=None):
+        """Object names of rows start..stop (decoded on demand)."""
+        offsets = self.column("name_offsets")
+        data = self.column("name_data")
+        stop = self.count if stop is None else stop
+        return [
+            bytes(data[offsets[row] : offsets[row + 1]]).decode("utf-8")
+            for row in range(start, stop)
+        ]
+
+    def type_columns(self, type_name):
+        """Column views of the contiguous rows of one object type."""
+        start, stop = self.ranges[type_name]
+        return {name: self.column(name)[start:stop] for name, _, _ in COLUMNS}
+
+
+def load_scene(path, scene, entities=True, mmap_mode="c"):
+    """Add the objects of a scene file to scene and return the SceneFile.
+
+    entities=True creates one EntityLayer per type whose EntityStore is backed by
+    the mapped columns directly: loading cost does not depend on object count.
+    entities=False creates named GameObjects whose position and color arrays are
+    views into the mapped columns. Buttons are recreated without callbacks.
+    """
+    scene_file = SceneFile(path, mmap_mode)
+    types = _object_types()
+    for type_name in scene_file.types:
+        if type_name not in types:
+            print(f"load_scene: skipping unknown object type '{type_name}'")
+            continue
+        cls = types[type_name]
+        columns = scene_file.type_columns(type_name)
+        if entities:
+            from edelweiss.entities import EntityStore, EntityLayer
+
+            store = EntityStore.from_arrays(
+                columns["position"],
+                columns["color"],
+                columns["scale"],
+                columns["velocity"],
+            )
+            scene.add_object(EntityLayer(store, cls, name=f"{type_name}_entities"))
+            continue
+        start, stop = scene_file.ranges[type_name]
+        for row, name in enumerate(scene_file.names(start, stop)):
+            obj = cls(name=name or None)
+            obj.position = columns["position"][row]
+            obj.color = columns["color"][row]
+            obj.scale = float(columns["scale"][row])
+            obj.velocity = columns["velocity"][row]
+            scene.add_object(obj)
+
+    if scene_file.widgets:
+        from edelweiss.widgets.button import Button
+
+        for record in scene_file.widgets:
+            scene.add_object(
+                Button(
+                    record["name"],
+                    record["x"],
+                    record["y"],
+                    record["width_pixels"],
+                    record["height_pixels"],
+                    record["base_color"],
+                    outline_color=record["outline_color"],
+                    outline_width=record["outline_width"],
+                    radius=record["radius"],
+                    text=record["text"],
+                    text_color=record["text_color"],
+                    font_path=record["font_path"],
+                    font_size=record["font_size"],
+                    transition=record["transition"] or 0.0,
+                )
+            )
+    return scene_file
@@ -9,18 +9,67 @@ from OpenGL.GL import (
 from OpenGL.GL import (
     glCreateProgram,
     glAttachShader,
+    glDetachShader,
     glLinkProgram,
     glGetProgramiv,
     GL_LINK_STATUS,
     glGetProgramInfoLog,
     glDeleteShader,
+    glDeleteProgram,
+    glBindAttribLocation,
+)
+from OpenGL.GL import (
+    glGetString,
+    glGetIntegerv,
+    glProgramParameteri,
+    glGetProgramBinary,
+    glProgramBinary,
+    GL_VENDOR,
+    GL_RENDERER,
+    GL_VERSION,
+    GL_NUM_PROGRAM_BINARY_FORMATS,
+    GL_PROGRAM_BINARY_LENGTH,
+    GL_PROGRAM_BINARY_RETRIEVABLE_HINT,
+    GL_TRUE,
 )
 from OpenGL.GL import GL_VERTEX_SHADER, GL_FRAGMENT_SHADER
+import hashlib
+import os
+import re
+import time
+import numpy as np
+
+from edelweiss import resources
+
+SHADER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shaders")
+
+_INCLUDE_RE = re.compile(r'^[ \t]*#include[ \t]+"([^"]+)"[ \t]*$', re.MULTILINE)
+
 
+def _resolve(file_path):
+    """Bare names (e.g. "vertex_shader_shape.glsl") are looked up in SHADER_DIR."""
+    if os.path.isabs(file_path) or os.path.exists(file_path):
+        return file_path
+    return os.path.join(SHADER_DIR, file_path)
 
-def load_shader(file_path):
+
+def load_shader(file_path, included=None):
+    """Read a shader file, expanding #include "name" lines relative to its directory.
+
+    If included is a list, the paths of every file read are appended to it.
+    """
+    file_path = _resolve(file_path)
     with open(file_path, "r") as f:
-        return f.read()
+        source = f.read()
+    if included is not None:
+        included.append(file_path)
+
+    base = os.path.dirname(file_path)
+
+    def expand(match):
+        return load_shader(os.path.join(base, match.group(1)), included)
+
+    return _INCLUDE_RE.sub(expand, source)
 
 
 def compile_shader(shader_code, shader_type):
@@ -54,4 +103,271 @@ def create_shader_program(vertex_shader_code, fragment_shader_code):
     glDeleteShader(vertex_shader)
     glDeleteShader(fragment_shader)
 
+    resources.track("program", shader_program)
     return shader_program
+
+
+def _link(program, vertex_code, fragment_code, attributes, retrievable=False):
+    """Compile both stages and (re)link them into program. Raises RuntimeError on failure."""
+    vs = compile_shader(vertex_code, GL_VERTEX_SHADER)
+    fs = compile_shader(fragment_code, GL_FRAGMENT_SHADER)
+    if vs is None or fs is None:
+        for shader in (vs, fs):
+            if shader is not None:
+                glDeleteShader(shader)
+        raise RuntimeError("Shader compilation failed")
+
+    glAttachShader(program, vs)
+    glAttachShader(program, fs)
+    # legacy GLSL 1.20 has no layout(location=...), so bind attribute indices before linking
+    for index, name in enumerate(attributes):
+        glBindAttribLocation(program, index, name.encode("ascii"))
+    if retrievable:
+        glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+    glLinkProgram(program)
+    # detach so a later in-place relink starts from an empty program
+    glDetachShader(program, vs)
+    glDetachShader(program, fs)
+    glDeleteShader(vs)
+    glDeleteShader(fs)
+
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        info = glGetProgramInfoLog(program)
+        raise RuntimeError(f"Shader program link failed: {info}")
+
+
+class ShaderProgram:
+    """A linked program shared by every object that uses the same shader files.
+
+    program keeps its GL name across hot reloads; generation is bumped on every
+    (re)link so users know to query their uniform locations again.
+    """
+
+    def __init__(self, key, vertex_file, fragment_file, attributes):
+        self.key = key
+        self.vertex_file = vertex_file
+        self.fragment_file = fragment_file
+        self.attributes = tuple(attributes)
+        self.program = None
+        self.generation = 0
+        self.refcount = 0
+        self.from_cache = False
+        self._files = {}  # path -> mtime of every file the sources were built from
+
+    def sources(self):
+        included = []
+        vertex_code = load_shader(self.vertex_file, included)
+        fragment_code = load_shader(self.fragment_file, included)
+        self._files = {path: os.path.getmtime(path) for path in included}
+        return vertex_code, fragment_code
+
+    def changed(self):
+        for path, mtime in self._files.items():
+            try:
+                if os.path.getmtime(path) != mtime:
+                    return True
+            except OSError:
+                continue
+        return False
+
+
+class ShaderLibrary:
+    """Loads programs from edelweiss/shaders, caches them per context and on disk.
+
+    In development mode the source files are watched and changed programs are
+    relinked in place. Otherwise linked binaries are stored in cache_dir keyed by a
+    hash of the sources and the driver string, so later starts skip GLSL compilation.
+    """
+
+    def __init__(self, hot_reload=None, cache_dir=None, poll_interval=0.25):
+        if hot_reload is None:
+            hot_reload = bool(os.environ.get("EDELWEISS_SHADER_DEV"))
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "EDELWEISS_SHADER_CACHE",
+                os.path.join(os.path.expanduser("~"), ".cache", "edelweiss", "shaders"),
+            )
+        self.hot_reload = hot_reload
+        self.cache_dir = cache_dir
+        self.poll_interval = poll_interval
+        self._programs = {}
+        self._by_name = {}
+        self._driver = None
+        self._binary_supported = None
+        self._next_poll = 0.0
+
+    # ------------------------------ binary cache ----------------------------
+    def _driver_string(self):
+        if self._driver is None:
+            parts = []
+            for name in (GL_VENDOR, GL_RENDERER, GL_VERSION):
+                value = glGetString(name)
+                parts.append(value.decode("utf-8", errors="ignore") if value else "")
+            self._driver = "|".join(parts)
+        return self._driver
+
+    def _use_binary_cache(self):
+        if self.hot_reload or not self.cache_dir:
+            return False
+        if self._binary_supported is None:
+            try:
+                self._binary_supported = bool(glGetProgramBinary) and bool(
+                    glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS)
+                )
+            except Exception:
+                self._binary_supported = False
+        return self._binary_supported
+
+    def _cache_path(self, vertex_code, fragment_code, attributes):
+        digest = hashlib.sha256()
+        driver = self._driver_string()
+        for part in (vertex_code, fragment_code, ",".join(attributes), driver):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return os.path.join(self.cache_dir, digest.hexdigest() + ".bin")
+
+    def _load_binary(self, program, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        if len(data) <= 4:
+            return False  # truncated cache file
+        binary_format = int.from_bytes(data[:4], "little")
+        binary = np.frombuffer(data, dtype=np.uint8, offset=4)
+        try:
+            glProgramBinary(program, binary_format, binary, len(binary))
+        except Exception:
+            return False
+        # drivers reject binaries from other versions; that simply means a recompile
+        return bool(glGetProgramiv(program, GL_LINK_STATUS))
+
+    def _store_binary(self, program, path):
+        try:
+            length = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+            if not length:
+                return
+            written = np.zeros(1, dtype=np.int32)
+            binary_format = np.zeros(1, dtype=np.uint32)
+            binary = np.empty(length, dtype=np.uint8)
+            glGetProgramBinary(program, length, written, binary_format, binary)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(int(binary_format[0]).to_bytes(4, "little"))
+                f.write(binary[: int(written[0])].tobytes())
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Shader cache write failed: {e}")
+
+    # ------------------------------ programs --------------------------------
+    def get(self, vertex_file, fragment_file, attributes=()):
+        """Return the shared ShaderProgram for these files, building it on first use."""
+        key = (vertex_file, fragment_file, tuple(attributes))
+        entry = self._programs.get(key)
+        if entry is None:
+            entry = ShaderProgram(key, vertex_file, fragment_file, attributes)
+            self._build(entry)
+            self._programs[key] = entry
+            self._by_name[entry.program] = entry
+            resources.track("program", entry.program, f"{vertex_file} + {fragment_file}")
+        entry.refcount += 1
+        return entry
+
+    def _build(self, entry):
+        vertex_code, fragment_code = entry.sources()
+        program = glCreateProgram()
+        use_cache = self._use_binary_cache()
+        path = None
+        if use_cache:
+            path = self._cache_path(vertex_code, fragment_code, entry.attributes)
+            if self._load_binary(program, path):
+                entry.program = program
+                entry.from_cache = True
+                entry.generation += 1
+                return
+        try:
+            _link(program, vertex_code, fragment_code, entry.attributes, use_cache)
+        except RuntimeError:
+            glDeleteProgram(program)
+            raise
+        if use_cache:
+            self._store_binary(program, path)
+        entry.program = program
+        entry.from_cache = False
+        entry.generation += 1
+
+    def release(self, program):
+        """Drop one reference to a program name; it is deleted with the last user."""
+        entry = self._by_name.get(program)
+        if entry is None:
+            glDeleteProgram(program)
+            resources.untrack("program", program)
+            return
+        entry.refcount -= 1
+        if entry.refcount <= 0:
+            glDeleteProgram(entry.program)
+            resources.untrack("program", entry.program)
+            del self._by_name[entry.program]
+            del self._programs[entry.key]
+
+    def reload(self, entry):
+        """Relink a program in place from its current files; keeps the old one on errors."""
+        try:
+            vertex_code, fragment_code = entry.sources()
+            # validate with a scratch program first so a broken edit never breaks rendering
+            scratch = glCreateProgram()
+            try:
+                _link(scratch, vertex_code, fragment_code, entry.attributes)
+            finally:
+                glDeleteProgram(scratch)
+            _link(entry.program, vertex_code, fragment_code, entry.attributes)
+        except (RuntimeError, OSError) as e:
+            print(f"Shader reload failed for {entry.vertex_file}: {e}")
+            return False
+        entry.generation += 1
+        print(f"Reloaded shader {entry.vertex_file} + {entry.fragment_file}")
+        return True
+
+    def poll(self):
+        """Development mode: relink programs whose source files changed (throttled)."""
+        if not self.hot_reload:
+            return 0
+        now = time.perf_counter()
+        if now < self._next_poll:
+            return 0
+        self._next_poll = now + self.poll_interval
+        reloaded = 0
+        for entry in list(self._programs.values()):
+            if entry.changed() and self.reload(entry):
+                reloaded += 1
+        return reloaded
+
+    def cleanup(self):
+        for entry in self._programs.values():
+            glDeleteProgram(entry.program)
+            resources.untrack("program", entry.program)
+        self._programs = {}
+        self._by_name = {}
+        self._driver = None
+        self._binary_supported = None
+
+
+_library = None
+
+
+def get_shader_library():
+    global _library
+    if _library is None:
+        _library = ShaderLibrary()
+    return _library
+
+
+def get_program(vertex_file, fragment_file, attributes=()):
+    """Shared program for a pair of shader files (see ShaderLibrary)."""
+    return get_shader_library().get(vertex_file, fragment_file, attributes)
+
+
+def release_program(program):
+    get_shader_library().release(program)
@@ -0,0 +1,4 @@
+// Shared camera block (binding 0), uploaded once per frame by edelweiss.camera
+layout(std140) uniform Camera {
+    mat4 u_view_proj;
+};
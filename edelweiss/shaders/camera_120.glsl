@@ -0,0 +1,2 @@
+// Legacy GLSL 1.20 has no uniform blocks: the camera is a plain uniform
+uniform mat4 u_view_proj;
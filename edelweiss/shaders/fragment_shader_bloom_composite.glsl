@@ -0,0 +1,16 @@
+#version 330 core
+
+in vec2 v_uv;
+
+out vec4 color;
+
+uniform sampler2D u_source;
+uniform sampler2D u_bloom;
+uniform float u_intensity;
+
+void main()
+{
+    vec4 src = texture(u_source, v_uv);
+    vec3 bloom = texture(u_bloom, v_uv).rgb * u_intensity;
+    color = vec4(src.rgb + bloom, src.a);
+}
@@ -0,0 +1,14 @@
+#version 120
+
+varying vec2 v_uv;
+
+uniform sampler2D u_source;
+uniform sampler2D u_bloom;
+uniform float u_intensity;
+
+void main()
+{
+    vec4 src = texture2D(u_source, v_uv);
+    vec3 bloom = texture2D(u_bloom, v_uv).rgb * u_intensity;
+    gl_FragColor = vec4(src.rgb + bloom, src.a);
+}
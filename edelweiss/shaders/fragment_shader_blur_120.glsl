@@ -0,0 +1,17 @@
+#version 120
+
+varying vec2 v_uv;
+
+uniform sampler2D u_source;
+uniform vec2 u_direction;  // one texel along the blur axis
+
+void main()
+{
+    // 9-tap gaussian using linear filtering between texels
+    vec4 sum = texture2D(u_source, v_uv) * 0.2270270270;
+    sum += texture2D(u_source, v_uv + u_direction * 1.3846153846) * 0.3162162162;
+    sum += texture2D(u_source, v_uv - u_direction * 1.3846153846) * 0.3162162162;
+    sum += texture2D(u_source, v_uv + u_direction * 3.2307692308) * 0.0702702703;
+    sum += texture2D(u_source, v_uv - u_direction * 3.2307692308) * 0.0702702703;
+    gl_FragColor = sum;
+}
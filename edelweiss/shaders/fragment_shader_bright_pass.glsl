@@ -0,0 +1,15 @@
+#version 330 core
+
+in vec2 v_uv;
+
+out vec4 color;
+
+uniform sampler2D u_source;
+uniform float u_threshold;
+
+void main()
+{
+    vec4 src = texture(u_source, v_uv);
+    float luma = dot(src.rgb, vec3(0.2126, 0.7152, 0.0722));
+    color = vec4(src.rgb * step(u_threshold, luma), 1.0);
+}
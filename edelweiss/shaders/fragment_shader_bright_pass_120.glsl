@@ -0,0 +1,13 @@
+#version 120
+
+varying vec2 v_uv;
+
+uniform sampler2D u_source;
+uniform float u_threshold;
+
+void main()
+{
+    vec4 src = texture2D(u_source, v_uv);
+    float luma = dot(src.rgb, vec3(0.2126, 0.7152, 0.0722));
+    gl_FragColor = vec4(src.rgb * step(u_threshold, luma), 1.0);
+}
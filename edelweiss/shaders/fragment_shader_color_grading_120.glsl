@@ -0,0 +1,19 @@
+#version 120
+
+varying vec2 v_uv;
+
+uniform sampler2D u_source;
+uniform float u_exposure;
+uniform float u_contrast;
+uniform float u_saturation;
+uniform vec3 u_tint;
+
+void main()
+{
+    vec4 src = texture2D(u_source, v_uv);
+    vec3 c = src.rgb * u_exposure;
+    c = (c - 0.5) * u_contrast + 0.5;
+    float luma = dot(c, vec3(0.2126, 0.7152, 0.0722));
+    c = mix(vec3(luma), c, u_saturation) * u_tint;
+    gl_FragColor = vec4(clamp(c, 0.0, 1.0), src.a);
+}
@@ -0,0 +1,12 @@
+#version 330 core
+
+in vec2 v_uv;
+
+out vec4 color;
+
+uniform sampler2D u_source;
+
+void main()
+{
+    color = texture(u_source, v_uv);
+}
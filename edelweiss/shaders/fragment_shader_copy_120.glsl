@@ -0,0 +1,10 @@
+#version 120
+
+varying vec2 v_uv;
+
+uniform sampler2D u_source;
+
+void main()
+{
+    gl_FragColor = texture2D(u_source, v_uv);
+}
@@ -0,0 +1,8 @@
+#version 120
+
+varying vec4 v_color;
+
+void main()
+{
+    gl_FragColor = v_color;
+}
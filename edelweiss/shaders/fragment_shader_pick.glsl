@@ -0,0 +1,10 @@
+#version 330 core
+
+out uint id;  // GL_R32UI attachment
+
+uniform uint u_id;
+
+void main()
+{
+    id = u_id;
+}
@@ -0,0 +1,9 @@
+#version 120
+
+// no integer targets: the ID is packed into the RGB bytes of an RGBA8 texel
+uniform vec3 u_id;
+
+void main()
+{
+    gl_FragColor = vec4(u_id, 1.0);
+}
@@ -0,0 +1,10 @@
+#version 330 core
+
+flat in uint v_id;
+
+out uint id;  // GL_R32UI attachment
+
+void main()
+{
+    id = v_id;
+}
@@ -0,0 +1,16 @@
+#version 330 core
+
+in vec2 v_uv;
+flat in uint v_id;
+
+out uint id;  // GL_R32UI attachment
+
+uniform sampler2D u_texture;
+
+void main()
+{
+    // transparent texels do not hide what is behind the sprite
+    if (texture(u_texture, v_uv).a < 0.5)
+        discard;
+    id = v_id;
+}
@@ -0,0 +1,13 @@
+#version 120
+
+varying vec2 v_uv;
+varying vec3 v_id;
+
+uniform sampler2D u_texture;
+
+void main()
+{
+    if (texture2D(u_texture, v_uv).a < 0.5)
+        discard;
+    gl_FragColor = vec4(v_id, 1.0);
+}
@@ -0,0 +1,8 @@
+#version 120
+
+uniform vec3 u_color;
+
+void main()
+{
+    gl_FragColor = vec4(u_color, 1.0);
+}
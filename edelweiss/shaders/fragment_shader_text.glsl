@@ -0,0 +1,13 @@
+#version 330 core
+
+in vec2 v_uv;
+in vec3 v_color;
+
+out vec4 color;
+
+uniform sampler2D u_texture;  // single-channel glyph atlas
+
+void main()
+{
+    color = vec4(v_color, texture(u_texture, v_uv).r);
+}
@@ -0,0 +1,11 @@
+#version 120
+
+varying vec2 v_uv;
+varying vec3 v_color;
+
+uniform sampler2D u_texture;  // GL_ALPHA glyph atlas
+
+void main()
+{
+    gl_FragColor = vec4(v_color, texture2D(u_texture, v_uv).a);
+}
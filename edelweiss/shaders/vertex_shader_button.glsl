@@ -1,14 +1,10 @@
 #version 330 core
 
-layout(location = 0) in vec3 a_position;  // Vertex position
-layout(location = 1) in vec3 a_color;     // Vertex color
+layout(location = 0) in vec3 aPos;  // Vertex position relative to the button center
 
-out vec3 v_color;  // Color to pass to the fragment shader
-
-uniform vec3 u_position;
+uniform vec3 u_position;  // Button center in NDC
 
 void main()
 {
-    gl_Position = vec4(a_position + u_position, 1.0);  // Shift position by button coordinates
-    v_color = a_color;  // Pass the color to the fragment shader
+    gl_Position = vec4(aPos + u_position, 1.0);
 }
@@ -0,0 +1,10 @@
+#version 120
+
+attribute vec3 aPos;
+
+uniform vec3 u_position;
+
+void main()
+{
+    gl_Position = vec4(aPos + u_position, 1.0);
+}
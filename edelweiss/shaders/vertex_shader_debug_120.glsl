@@ -0,0 +1,14 @@
+#version 120
+
+attribute vec3 a_pos;
+attribute vec4 a_color;
+
+varying vec4 v_color;
+
+#include "camera_120.glsl"
+
+void main()
+{
+    v_color = a_color;
+    gl_Position = u_view_proj * vec4(a_pos, 1.0);
+}
@@ -0,0 +1,15 @@
+#version 330 core
+
+layout(location = 0) in vec3 position;
+
+uniform vec3 u_position;
+uniform float u_scale;
+uniform float u_world;  // 1 = through the camera (shapes), 0 = already NDC (widgets)
+
+#include "camera.glsl"
+
+void main()
+{
+    vec4 pos = vec4(position * u_scale + u_position, 1.0);
+    gl_Position = mix(pos, u_view_proj * pos, u_world);
+}
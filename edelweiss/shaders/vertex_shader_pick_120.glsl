@@ -0,0 +1,15 @@
+#version 120
+
+attribute vec3 position;
+
+uniform vec3 u_position;
+uniform float u_scale;
+uniform float u_world;
+
+#include "camera_120.glsl"
+
+void main()
+{
+    vec4 pos = vec4(position * u_scale + u_position, 1.0);
+    gl_Position = mix(pos, u_view_proj * pos, u_world);
+}
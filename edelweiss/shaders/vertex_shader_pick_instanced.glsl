@@ -0,0 +1,16 @@
+#version 330 core
+
+layout(location = 0) in vec3 position;  // shape geometry
+layout(location = 1) in vec4 i_offset;  // per instance: position xyz, scale
+
+flat out uint v_id;
+
+uniform uint u_id_base;  // ID of instance 0
+
+#include "camera.glsl"
+
+void main()
+{
+    v_id = u_id_base + uint(gl_InstanceID);
+    gl_Position = u_view_proj * vec4(position * i_offset.w + i_offset.xyz, 1.0);
+}
@@ -0,0 +1,19 @@
+#version 330 core
+
+layout(location = 0) in vec4 corner;  // quad offset (xy) and uv weights (zw)
+layout(location = 1) in vec4 i_rect;  // per instance: center x, y, width, height
+layout(location = 2) in vec4 i_uv;  // per instance: u0, v0, u1, v1 of the current frame
+
+out vec2 v_uv;
+flat out uint v_id;
+
+uniform uint u_id_base;  // ID of instance 0
+
+#include "camera.glsl"
+
+void main()
+{
+    v_uv = mix(i_uv.xy, i_uv.zw, corner.zw);
+    v_id = u_id_base + uint(gl_InstanceID);
+    gl_Position = u_view_proj * vec4(i_rect.xy + corner.xy * i_rect.zw, 0.0, 1.0);
+}
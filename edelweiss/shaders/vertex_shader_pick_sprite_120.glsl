@@ -0,0 +1,17 @@
+#version 120
+
+attribute vec2 position;
+attribute vec2 uv;
+attribute vec3 a_id;  // packed ID bytes, as in fragment_shader_pick_120.glsl
+
+varying vec2 v_uv;
+varying vec3 v_id;
+
+#include "camera_120.glsl"
+
+void main()
+{
+    v_uv = uv;
+    v_id = a_id;
+    gl_Position = u_view_proj * vec4(position, 0.0, 1.0);
+}
@@ -0,0 +1,15 @@
+#version 120
+
+attribute vec3 position;
+
+uniform vec3 u_position;
+uniform float u_scale;
+
+#include "camera_120.glsl"
+
+void main()
+{
+    vec3 scaled_pos = position * u_scale;
+    vec3 final_pos = scaled_pos + u_position;
+    gl_Position = u_view_proj * vec4(final_pos, 1.0);
+}
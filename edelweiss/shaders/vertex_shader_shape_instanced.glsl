@@ -0,0 +1,15 @@
+#version 330 core
+
+layout(location = 0) in vec3 position;  // shape geometry
+layout(location = 1) in vec4 i_offset;  // per instance: position xyz, scale
+layout(location = 2) in vec3 i_color;  // per instance
+
+out vec4 v_color;
+
+#include "camera.glsl"
+
+void main()
+{
+    v_color = vec4(i_color, 1.0);
+    gl_Position = u_view_proj * vec4(position * i_offset.w + i_offset.xyz, 1.0);
+}
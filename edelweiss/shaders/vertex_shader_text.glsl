@@ -0,0 +1,15 @@
+#version 330 core
+
+layout(location = 0) in vec2 a_pos;    // NDC
+layout(location = 1) in vec2 a_uv;     // glyph atlas coordinates
+layout(location = 2) in vec3 a_color;
+
+out vec2 v_uv;
+out vec3 v_color;
+
+void main()
+{
+    v_uv = a_uv;
+    v_color = a_color;
+    gl_Position = vec4(a_pos, 0.0, 1.0);
+}
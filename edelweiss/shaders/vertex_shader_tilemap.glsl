@@ -0,0 +1,18 @@
+#version 330 core
+
+layout(location = 0) in vec2 position;
+layout(location = 1) in vec2 uv;
+
+out vec2 v_uv;
+
+uniform vec3 u_position;
+uniform float u_scale;
+
+#include "camera.glsl"
+
+void main()
+{
+    v_uv = uv;
+    vec4 world = vec4(position * u_scale + u_position.xy, u_position.z, 1.0);
+    gl_Position = u_view_proj * world;
+}
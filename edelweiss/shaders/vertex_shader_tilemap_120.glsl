@@ -0,0 +1,18 @@
+#version 120
+
+attribute vec2 position;
+attribute vec2 uv;
+
+varying vec2 v_uv;
+
+uniform vec3 u_position;
+uniform float u_scale;
+
+#include "camera_120.glsl"
+
+void main()
+{
+    v_uv = uv;
+    vec4 world = vec4(position * u_scale + u_position.xy, u_position.z, 1.0);
+    gl_Position = u_view_proj * world;
+}
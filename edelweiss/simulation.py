@@ -0,0 +1,231 @@
+import multiprocessing as mp
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Object state is exchanged as contiguous float32 arrays, one row per object.
+FIELDS = (("position", 3), ("color", 3), ("scale", 1), ("velocity", 3))
+FLOATS_PER_OBJECT = sum(width for _, width in FIELDS)
+SLOTS = 3  # front (render reads), back (simulation writes), latest completed
+
+# int64 header at the start of the block
+_LATEST, _READING, _WRITING, _FRESH = 0, 1, 2, 3
+_FRAME = 4  # frame number per slot: _FRAME + slot
+_HEADER_INTS = 8
+
+
+def _attach(name):
+    """Open an existing block. Spawned workers share the parent's resource tracker,
+    so attaching registers nothing new and only the owner unlinks."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedState:
+    """Buffered object state in one multiprocessing.shared_memory block.
+
+    The simulation writes a slot nobody reads and publishes it as the latest; the
+    renderer switches to the latest slot when it acquires. Swapping slot indices is
+    the only synchronized step, so neither side ever waits for the other's frame.
+    """
+
+    def __init__(self, capacity, name=None, lock=None):
+        self.capacity = capacity
+        self.slot_bytes = capacity * FLOATS_PER_OBJECT * 4
+        size = _HEADER_INTS * 8 + SLOTS * self.slot_bytes
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        self.lock = lock if lock is not None else mp.Lock()
+        self.header = np.ndarray((_HEADER_INTS,), dtype=np.int64, buffer=self.shm.buf)
+        self.slots = [self._slot_views(slot) for slot in range(SLOTS)]
+        if self.owner:
+            self.header[:] = 0
+            self.header[_LATEST], self.header[_READING], self.header[_WRITING] = 0, 0, 1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_views(self, slot):
+        """Zero-copy field arrays of one slot: {"position": (N, 3) float32, ...}."""
+        offset = _HEADER_INTS * 8 + slot * self.slot_bytes
+        views = {}
+        for field, width in FIELDS:
+            shape = (self.capacity,) if width == 1 else (self.capacity, width)
+            views[field] = np.ndarray(
+                shape, dtype=np.float32, buffer=self.shm.buf, offset=offset
+            )
+            offset += self.capacity * width * 4
+        return views
+
+    # ------------------------------ simulation side -------------------------
+    def write_slot(self):
+        """Views of the slot the simulation may write now."""
+        return self.slots[int(self.header[_WRITING])]
+
+    def latest_slot(self):
+        return self.slots[int(self.header[_LATEST])]
+
+    def publish(self, frame):
+        """Make the written slot the latest and pick a free slot for the next frame."""
+        with self.lock:
+            written = int(self.header[_WRITING])
+            self.header[_FRAME + written] = frame
+            self.header[_LATEST] = written
+            self.header[_FRESH] = 1
+            reading = int(self.header[_READING])
+            self.header[_WRITING] = next(
+                slot for slot in range(SLOTS) if slot not in (written, reading)
+            )
+
+    # ------------------------------ render side -----------------------------
+    def acquire(self):
+        """Switch to the newest completed slot. Returns (frame, views); views stay
+        valid until the next acquire()."""
+        with self.lock:
+            if self.header[_FRESH]:
+                self.header[_READING] = self.header[_LATEST]
+                self.header[_FRESH] = 0
+            reading = int(self.header[_READING])
+            frame = int(self.header[_FRAME + reading])
+        return frame, self.slots[reading]
+
+    def close(self):
+        self.header = None
+        self.slots = []
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # a caller still holds a view; the mapping goes away with it
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(name, capacity, lock, stop, step, rate):
+    state = SharedState(capacity, name=name, lock=lock)
+    dt = 1.0 / rate
+    frame = 0
+    next_tick = time.perf_counter()
+    try:
+        while not stop.is_set():
+            target = state.write_slot()
+            for field, array in state.latest_slot().items():
+                np.copyto(target[field], array)
+            step(target, dt)
+            frame += 1
+            state.publish(frame)
+            next_tick += dt
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # fell behind: don't try to catch up
+    except Exception:
+        traceback.print_exc()
+        raise
+    finally:
+        state.close()
+
+
+class ProcessSimulation:
+    """Run step(state, dt) at a fixed rate in a separate process.
+
+    step must be a picklable top-level function; it receives the field arrays of
+    FIELDS (a copy of the previous frame) and updates them in place. The render
+    process calls sync() once per frame, which never blocks on the simulation.
+    """
+
+    def __init__(self, step, capacity, rate=60.0):
+        self.step = step
+        self.capacity = capacity
+        self.rate = rate
+        self.state = None
+        self.process = None
+        self.frame = 0  # simulation frame currently visible to the renderer
+        self.objects = []  # GameObjects mirrored from rows 0..len-1
+
+    def bind(self, objects):
+        """Mirror simulated rows onto GameObjects (row i -> objects[i])."""
+        objects = list(objects)
+        if len(objects) > self.capacity:
+            raise ValueError(f"{len(objects)} objects exceed capacity {self.capacity}")
+        self.objects = objects
+        return self
+
+    def start(self, initial=None):
+        """Create the shared block, seed it and start the worker process.
+
+        initial maps field names to arrays; by default rows are seeded from the bound
+        objects' position, color and scale.
+        """
+        if self.process is not None:
+            return
+        ctx = mp.get_context("spawn")  # never fork a process holding a GL context
+        self.state = SharedState(self.capacity, lock=ctx.Lock())
+        seed = self.state.slots[0]
+        for field, array in seed.items():
+            array[:] = 1.0 if field == "scale" else 0.0
+        for index, obj in enumerate(self.objects):
+            seed["position"][index] = obj.position
+            seed["color"][index] = obj.color
+            seed["scale"][index] = obj.scale
+        for field, values in (initial or {}).items():
+            seed[field][: len(values)] = values
+        for slot in self.state.slots[1:]:
+            for field, array in slot.items():
+                np.copyto(array, seed[field])
+        self._stop = ctx.Event()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.state.name, self.capacity, self.state.lock, self._stop),
+            kwargs={"step": self.step, "rate": self.rate},
+            name="edelweiss-simulation",
+            daemon=True,
+        )
+        self.process.start()
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def latest(self):
+        """(frame, field views) of the newest completed simulation frame."""
+        frame, views = self.state.acquire()
+        self.frame = frame
+        return frame, views
+
+    def sync(self):
+        """Point bound objects at the latest frame. Object arrays become zero-copy
+        views into shared memory, so rendering uploads them straight from there."""
+        if self.state is None:
+            return self.frame
+        frame, views = self.latest()
+        position, color, scale = views["position"], views["color"], views["scale"]
+        for index, obj in enumerate(self.objects):
+            obj.position = position[index]
+            obj.color = color[index]
+            obj.scale = float(scale[index])
+        return frame
+
+    def stop(self, timeout=1.0):
+        if self.process is None:
+            return
+        self._stop.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.process = None
+        # bound objects must not keep views into the block that is about to go away
+        for obj in self.objects:
+            obj.position = np.array(obj.position, dtype=np.float32)
+            obj.color = np.array(obj.color, dtype=np.float32)
+        self.state.close()
+        self.state = None
@@ -0,0 +1,428 @@
+import ctypes
+import weakref
+
+import numpy as np
+from OpenGL.GL import *
+from PIL import Image as PILImage
+
+from edelweiss import resources
+from edelweiss.buffers import StreamingBuffer
+from edelweiss.camera import get_camera_uniforms
+from edelweiss.figure import _gl_version_tuple
+from edelweiss.shaders import get_program, release_program
+
+# Flipbook animation from sprite sheets. Clips (frame sequences with durations) are
+# defined once per sheet and laid out on one shared timeline, so the current frame
+# of every sprite in a layer comes from a single np.searchsorted. A layer draws all
+# its sprites with one instanced call (GL 3.3+) or one expanded vertex array.
+
+# unit quad as two triangles: corner offset (x, y) and uv weights (s, t)
+_QUAD = np.array(
+    [
+        [-0.5, 0.5, 0.0, 0.0],
+        [0.5, 0.5, 1.0, 0.0],
+        [-0.5, -0.5, 0.0, 1.0],
+        [0.5, 0.5, 1.0, 0.0],
+        [0.5, -0.5, 1.0, 1.0],
+        [-0.5, -0.5, 0.0, 1.0],
+    ],
+    dtype=np.float32,
+)
+
+_layers = weakref.WeakSet()
+
+
+def update(dt):
+    """Advance every sprite layer; called once per frame by GameEngine.frame()."""
+    for layer in list(_layers):
+        if layer.initialized:
+            layer.update(dt)
+
+
+class Clip:
+    """Frame indices of a sheet with per-frame durations (seconds)."""
+
+    def __init__(self, index, name, frames, durations, loop):
+        self.index = index  # row in the sheet's clip table
+        self.name = name
+        self.frames = frames
+        self.durations = durations
+        self.loop = loop
+
+    @property
+    def length(self):
+        return float(self.durations.sum())
+
+
+class SpriteSheet:
+    """Grid of equally sized frames in one texture, plus the clips played from it.
+
+    The texture is created by the first layer that uses the sheet and freed with
+    the last one.
+    """
+
+    def __init__(self, image, frame_width, frame_height=None):
+        # image: file path, PIL image or HxWx4 uint8 array (as TileMap atlases)
+        if isinstance(image, str):
+            image = PILImage.open(image)
+        if isinstance(image, PILImage.Image):
+            image = np.asarray(image.convert("RGBA"), dtype=np.uint8)
+        self.pixels = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = self.pixels.shape[:2]
+        frame_height = frame_height or frame_width
+        self.columns = max(1, width // int(frame_width))
+        self.rows = max(1, height // int(frame_height))
+
+        cells = np.arange(self.columns * self.rows)
+        u = (cells % self.columns).astype(np.float32)
+        v = (cells // self.columns).astype(np.float32)
+        inset_u, inset_v = 0.5 / width, 0.5 / height  # no bleeding from neighbours
+        self.frame_uv = np.stack(
+            (
+                u / self.columns + inset_u,
+                v / self.rows + inset_v,
+                (u + 1) / self.columns - inset_u,
+                (v + 1) / self.rows - inset_v,
+            ),
+            axis=1,
+        )
+
+        self.clips = {}
+        self._clip_list = []
+        # shared clip table, rebuilt by add_clip()
+        self.table_uv = np.zeros((0, 4), dtype=np.float32)  # uv rect of every clip frame
+        self.table_start = np.zeros(0)  # start of every clip frame on the timeline
+        self.clip_base = np.zeros(0)  # start of every clip on the timeline
+        self.clip_length = np.zeros(0)
+        self.clip_loop = np.zeros(0, dtype=bool)
+        self.clip_first = np.zeros(0, dtype=np.int64)  # first / last table row
+        self.clip_last = np.zeros(0, dtype=np.int64)
+
+        self.texture = None
+        self._users = 0
+
+    @property
+    def frame_count(self):
+        return len(self.frame_uv)
+
+    def add_clip(self, name, frames, fps=12.0, durations=None, loop=True):
+        """Define a clip from sheet frame indices; durations (seconds) override fps."""
+        if name in self.clips:
+            raise ValueError(f"Clip '{name}' already exists")
+        frames = np.asarray(frames, dtype=np.int64).reshape(-1)
+        if not len(frames):
+            raise ValueError(f"Clip '{name}' has no frames")
+        if frames.min() < 0 or frames.max() >= self.frame_count:
+            raise ValueError(
+                f"Clip '{name}' uses frames outside the sheet (0..{self.frame_count - 1})"
+            )
+        if durations is None:
+            durations = np.full(len(frames), 1.0 / fps)
+        durations = np.asarray(durations, dtype=np.float64).reshape(-1)
+        if len(durations) != len(frames) or durations.min() <= 0.0:
+            raise ValueError(f"Clip '{name}' needs one positive duration per frame")
+        clip = Clip(len(self._clip_list), name, frames, durations, bool(loop))
+        self._clip_list.append(clip)
+        self.clips[name] = clip
+        self._build_table()
+        return clip
+
+    def _build_table(self):
+        clips = self._clip_list
+        lengths = np.array([clip.length for clip in clips])
+        counts = np.array([len(clip.frames) for clip in clips])
+        self.clip_base = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+        self.clip_length = lengths
+        self.clip_loop = np.array([clip.loop for clip in clips])
+        self.clip_first = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        self.clip_last = self.clip_first + counts - 1
+        self.table_uv = np.concatenate([self.frame_uv[clip.frames] for clip in clips])
+        durations = np.concatenate([clip.durations for clip in clips])
+        self.table_start = np.concatenate(([0.0], np.cumsum(durations)[:-1]))
+
+    def clip_index(self, clip):
+        """Table row of a Clip, clip name or row index."""
+        if isinstance(clip, Clip):
+            return clip.index
+        if isinstance(clip, (int, np.integer)):
+            return int(clip)
+        if clip not in self.clips:
+            raise ValueError(f"Unknown clip '{clip}'")
+        return self.clips[clip].index
+
+    # ------------------------------ GL side ---------------------------------
+    def acquire(self):
+        if self.texture is None:
+            height, width = self.pixels.shape[:2]
+            self.texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+            glTexImage2D(
+                GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                self.pixels,
+            )
+            glBindTexture(GL_TEXTURE_2D, 0)
+            resources.track("texture", self.texture, self, self.pixels.nbytes)
+        self._users += 1
+        return self.texture
+
+    def release(self):
+        self._users -= 1
+        if self._users <= 0 and self.texture:
+            glDeleteTextures(1, [self.texture])
+            resources.untrack("texture", self.texture)
+            self.texture = None
+            self._users = 0
+
+
+class SpriteLayer:
+    """Scene object holding many animated sprites of one sheet in parallel arrays.
+
+    IDs are row indices, recycled after remove(). A negative width mirrors a
+    sprite horizontally.
+    """
+
+    def __init__(self, sheet, capacity=256, size=(0.1, 0.1), name=None):
+        self.sheet = sheet
+        self.name = name or f"sprites_{id(self):x}"
+        self.default_size = size
+        self.paused = False  # freeze the whole layer
+        self.initialized = False
+        self.capacity = 0
+        self.count = 0
+        self.position = np.zeros((0, 3), dtype=np.float32)
+        self.size = np.zeros((0, 2), dtype=np.float32)
+        self.clip = np.zeros(0, dtype=np.int64)
+        self.time = np.zeros(0)  # playback time inside the clip
+        self.speed = np.zeros(0, dtype=np.float32)
+        self.frame = np.zeros(0, dtype=np.int64)  # current row of sheet.table_uv
+        self.playing = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self._free = []
+        self._reserve(capacity)
+
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self._instanced = False
+        self.vao = None
+        self.quad_vbo = None
+        self._has_vao = False
+        self.stream = None
+        _layers.add(self)
+
+    def _reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        for field in (
+            "position", "size", "clip", "time", "speed", "frame", "playing", "alive"
+        ):
+            old = getattr(self, field)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count - len(self._free)
+
+    def alive_ids(self):
+        return np.flatnonzero(self.alive[: self.count])
+
+    # ------------------------------ sprites ---------------------------------
+    def add(self, clip, position=(0.0, 0.0, 0.0), size=None, speed=1.0, start=0.0):
+        """Add a sprite playing clip (Clip or name) and return its ID."""
+        clip = self.sheet.clip_index(clip)
+        if self._free:
+            sprite = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._reserve(max(16, self.capacity * 2))
+            sprite = self.count
+            self.count += 1
+        self.position[sprite] = 0.0
+        self.position[sprite, : len(position)] = position
+        self.size[sprite] = size if size is not None else self.default_size
+        self.speed[sprite] = speed
+        self.alive[sprite] = True
+        self.play(sprite, clip, start)
+        return sprite
+
+    def remove(self, sprite):
+        if not self.alive[sprite]:
+            raise ValueError(f"Sprite {sprite} is not alive")
+        self.alive[sprite] = False
+        self.playing[sprite] = False
+        self._free.append(sprite)
+
+    def play(self, sprite, clip, start=0.0):
+        """Switch a sprite (or an array of IDs) to clip from time start."""
+        clip = self.sheet.clip_index(clip)
+        self.clip[sprite] = clip
+        self.time[sprite] = start
+        self.playing[sprite] = True
+        self.frame[sprite] = self.sheet.clip_first[clip]
+
+    def finished(self):
+        """IDs of live sprites whose non-looping clip has ended."""
+        rows = slice(0, self.count)
+        return np.flatnonzero(self.alive[rows] & ~self.playing[rows])
+
+    def update(self, dt):
+        """Advance playback time and pick the current frame of every sprite at once."""
+        if self.paused or not self.count or not self.sheet.clips:
+            return
+        sheet = self.sheet
+        n = self.count
+        clip = self.clip[:n]
+        t = self.time[:n] + dt * self.speed[:n] * self.playing[:n]
+        length = sheet.clip_length[clip]
+        loop = sheet.clip_loop[clip]
+        ended = ~loop & ((t >= length) | (t < 0.0))
+        t = np.where(loop, np.mod(t, length), np.clip(t, 0.0, length))
+        self.playing[:n] &= ~ended
+        self.time[:n] = t
+        frame = np.searchsorted(sheet.table_start, sheet.clip_base[clip] + t, "right") - 1
+        # clip ends (and float rounding at loop points) stay inside their own clip
+        self.frame[:n] = np.clip(frame, sheet.clip_first[clip], sheet.clip_last[clip])
+
+    def instance_data(self):
+        """(n, 8) float32 rows of center x, y, width, height, u0, v0, u1, v1."""
+        ids = self.alive_ids()
+        data = np.empty((len(ids), 8), dtype=np.float32)
+        data[:, 0:2] = self.position[ids, :2]
+        data[:, 2:4] = self.size[ids]
+        data[:, 4:8] = self.sheet.table_uv[self.frame[ids]]
+        return data
+
+    # ------------------------------ GL side ---------------------------------
+    def initialize(self):
+        self._has_vao = True
+        try:
+            self.vao = glGenVertexArrays(1)
+            if glGetError() != GL_NO_ERROR:
+                self._has_vao = False
+                self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
+        except Exception:
+            self._has_vao = False
+            self.vao = None
+        self._instanced = self._has_vao and _gl_version_tuple() >= (3, 3)
+        if self._instanced:
+            self._program = get_program(
+                "vertex_shader_sprite.glsl",
+                "fragment_shader_tilemap.glsl",  # plain textured fragment
+                ("corner", "i_rect", "i_uv"),
+            )
+        else:
+            # no instancing: quads are expanded on the CPU and drawn with the tile program
+            self._program = get_program(
+                "vertex_shader_tilemap_120.glsl",
+                "fragment_shader_tilemap_120.glsl",
+                ("position", "uv"),
+            )
+        self.shader = self._program.program
+        self.sheet.acquire()
+
+        if self._instanced:
+            self.quad_vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self.quad_vbo)
+            glBufferData(GL_ARRAY_BUFFER, _QUAD.nbytes, _QUAD, GL_STATIC_DRAW)
+            resources.track("buffer", self.quad_vbo, self, _QUAD.nbytes)
+            glBindVertexArray(self.vao)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 4, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(0))
+            for location in (1, 2):
+                glEnableVertexAttribArray(location)
+                glVertexAttribDivisor(location, 1)
+            glBindVertexArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        # instance rows (or expanded vertices) are rewritten every frame
+        self.stream = StreamingBuffer(region_size=64 * 1024, owner=self)
+
+    def _query_uniforms(self):
+        self._u_texture = glGetUniformLocation(self.shader, "u_texture")
+        self._u_pos = glGetUniformLocation(self.shader, "u_position")
+        self._u_scale = glGetUniformLocation(self.shader, "u_scale")
+        self._u_view_proj = get_camera_uniforms().register_program(self.shader)
+        self._program_generation = self._program.generation
+
+    def render(self):
+        data = self.instance_data()
+        if not len(data):
+            return
+        glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._query_uniforms()
+        get_camera_uniforms().apply(self.shader, self._u_view_proj)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.sheet.texture)
+        glUniform1i(self._u_texture, 0)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        if self._instanced:
+            offset = self.stream.write(data)
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(offset))
+            glVertexAttribPointer(
+                2, 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(offset + 16)
+            )
+            glDrawArraysInstanced(GL_TRIANGLES, 0, 6, len(data))
+            glBindVertexArray(0)
+        else:
+            glUniform3f(self._u_pos, 0.0, 0.0, 0.0)
+            glUniform1f(self._u_scale, 1.0)
+            vertices = np.empty((len(data), 6, 4), dtype=np.float32)
+            vertices[:, :, 0:2] = data[:, None, 0:2] + _QUAD[:, 0:2] * data[:, None, 2:4]
+            vertices[:, :, 2:4] = data[:, None, 4:6] + _QUAD[:, 2:4] * (
+                data[:, None, 6:8] - data[:, None, 4:6]
+            )
+            offset = self.stream.write(vertices)
+            if self._has_vao:
+                glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(offset))
+            glEnableVertexAttribArray(1)
+            glVertexAttribPointer(
+                1, 2, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(offset + 8)
+            )
+            glDrawArrays(GL_TRIANGLES, 0, len(data) * 6)
+            if self._has_vao:
+                glBindVertexArray(0)
+            else:
+                glDisableVertexAttribArray(0)
+                glDisableVertexAttribArray(1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisable(GL_BLEND)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glUseProgram(0)
+        self.stream.end_frame()
+
+    def cleanup(self):
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.quad_vbo:
+            glDeleteBuffers(1, [self.quad_vbo])
+            resources.untrack("buffer", self.quad_vbo)
+        if self.stream:
+            self.stream.cleanup()
+        if self.shader:
+            release_program(self.shader)
+            self.sheet.release()
+        self.vao = None
+        self.quad_vbo = None
+        self.stream = None
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self.initialized = False
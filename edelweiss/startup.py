@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+# Set when the edelweiss package is first imported
+START = time.perf_counter()
+
+_marks = []  # (label, seconds since START)
+_imports = []  # (module, seconds spent importing it)
+
+
+def mark(label):
+    """Record a startup milestone (first occurrence of each label only)."""
+    if not any(name == label for name, _ in _marks):
+        _marks.append((label, time.perf_counter() - START))
+
+
+def record_import(module, seconds):
+    _imports.append((module, seconds))
+
+
+def report(file=None):
+    """Print import costs and milestones up to the first frame."""
+    file = file or sys.stdout
+    print("edelweiss startup:", file=file)
+    for module, seconds in _imports:
+        print(f"  import {module:<28} {seconds * 1000.0:8.1f} ms", file=file)
+    for label, seconds in _marks:
+        print(f"  {label:<35} {seconds * 1000.0:8.1f} ms", file=file)
+
+
+def report_enabled():
+    return bool(os.environ.get("EDELWEISS_STARTUP_REPORT"))
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Polyline stroking on the CPU: every segment becomes a quad, every interior vertex
+# a join, open ends get caps. The result is a plain triangle list, so strokes can
+# share a vertex buffer and a draw mode with fills and do not depend on
+# glLineWidth (widths above 1 are not supported by core profiles).
+
+MITER = "miter"
+BEVEL = "bevel"
+ROUND = "round"
+BUTT = "butt"
+SQUARE = "square"
+
+_JOINS = (MITER, BEVEL, ROUND)
+_CAPS = (BUTT, SQUARE, ROUND)
+_ROUND_SEGMENTS = 8  # triangles per round join / cap
+_CACHE_SIZE = 256
+
+
+def _normalize(vectors):
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(length, 1e-12)
+
+
+def _fans(centers, starts, sweeps):
+    """Triangle fans around centers from the vectors starts, turning by sweeps (radians)."""
+    radius = np.linalg.norm(starts, axis=1)
+    angles = np.arctan2(starts[:, 1], starts[:, 0])[:, None] + sweeps[:, None] * (
+        np.linspace(0.0, 1.0, _ROUND_SEGMENTS + 1)
+    )
+    rim = centers[:, None, :] + radius[:, None, None] * np.stack(
+        (np.cos(angles), np.sin(angles)), axis=2
+    )
+    hub = np.broadcast_to(centers[:, None, :], rim[:, 1:].shape)
+    return np.stack((hub, rim[:, :-1], rim[:, 1:]), axis=2).reshape(-1, 2)
+
+
+def tessellate(points, width, closed=False, join=MITER, cap=BUTT, miter_limit=4.0):
+    """Triangles ((n, 2) float32, 3 rows per triangle) covering a stroked polyline.
+
+    width is in the units of points. miter_limit is the longest allowed miter as a
+    multiple of half the width (as in SVG); sharper corners fall back to bevels.
+    """
+    if join not in _JOINS:
+        raise ValueError(f"Unknown join '{join}', expected one of {_JOINS}")
+    if cap not in _CAPS:
+        raise ValueError(f"Unknown cap '{cap}', expected one of {_CAPS}")
+    points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)[:, :2]
+    if len(points) > 1:
+        # zero-length segments have no direction
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(np.abs(np.diff(points, axis=0)) > 1e-12, axis=1)
+        points = points[keep]
+    if closed and len(points) > 2 and np.allclose(points[0], points[-1]):
+        points = points[:-1]
+    if len(points) < 2 or width <= 0:
+        return np.zeros((0, 2), dtype=np.float32)
+
+    half = width / 2.0
+    closed = closed and len(points) > 2
+    start = points if closed else points[:-1]
+    end = np.roll(points, -1, axis=0) if closed else points[1:]
+    direction = _normalize(end - start)
+    normal = np.stack((-direction[:, 1], direction[:, 0]), axis=1) * half
+    parts = []
+
+    # joins between segment i and i + 1, on the outer side of the turn
+    incoming = np.arange(len(direction) if closed else len(direction) - 1)
+    if len(incoming):
+        outgoing = (incoming + 1) % len(direction)
+        joint = end[incoming]
+        d_in, d_out = direction[incoming], direction[outgoing]
+        turn = d_in[:, 0] * d_out[:, 1] - d_in[:, 1] * d_out[:, 0]
+        side = np.where(turn > 0.0, -1.0, 1.0)[:, None]
+        n_in, n_out = normal[incoming] * side, normal[outgoing] * side
+        outer_in, outer_out = joint + n_in, joint + n_out
+        parts.append(np.stack((joint, outer_in, outer_out), axis=1).reshape(-1, 2))
+        if join == MITER:
+            bisector = _normalize(n_in + n_out)
+            cos_half = np.sum(bisector * n_in, axis=1) / half
+            length = half / np.maximum(cos_half, 1e-6)
+            ok = length <= miter_limit * half
+            tip = joint[ok] + bisector[ok] * length[ok, None]
+            parts.append(
+                np.stack((outer_in[ok], tip, outer_out[ok]), axis=1).reshape(-1, 2)
+            )
+        elif join == ROUND:
+            dot = np.sum(n_in * n_out, axis=1)
+            cross = n_in[:, 0] * n_out[:, 1] - n_in[:, 1] * n_out[:, 0]
+            parts.append(_fans(joint, n_in, np.arctan2(cross, dot)))
+
+    if not closed:
+        if cap == SQUARE:
+            start, end = start.copy(), end.copy()
+            start[0] -= direction[0] * half
+            end[-1] += direction[-1] * half
+        elif cap == ROUND:
+            # half circles round the back of the start and the front of the end
+            centers = np.stack((start[0], end[-1]))
+            edges = np.stack((normal[0], -normal[-1]))
+            parts.append(_fans(centers, edges, np.full(2, np.pi)))
+
+    left_0, right_0 = start + normal, start - normal
+    left_1, right_1 = end + normal, end - normal
+    quads = np.stack((left_0, right_0, left_1, left_1, right_0, right_1), axis=1)
+    parts.append(quads.reshape(-1, 2))
+    return np.concatenate(parts).astype(np.float32)
+
+
+_cache = OrderedDict()
+
+
+def stroke(points, width, closed=False, join=MITER, cap=BUTT, miter_limit=4.0):
+    """tessellate() through a small LRU cache; the returned array is shared and read-only.
+
+    Use it for shapes that are drawn repeatedly (widget outlines); per-frame paths
+    should call tessellate() directly.
+    """
+    points = np.ascontiguousarray(np.asarray(points, dtype=np.float32)[:, :2])
+    key = (points.tobytes(), float(width), bool(closed), join, cap, float(miter_limit))
+    mesh = _cache.get(key)
+    if mesh is not None:
+        _cache.move_to_end(key)
+        return mesh
+    mesh = tessellate(points, width, closed, join, cap, miter_limit)
+    mesh.setflags(write=False)
+    _cache[key] = mesh
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return mesh
+
+
+def clear_cache():
+    _cache.clear()
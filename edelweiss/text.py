@@ -0,0 +1,483 @@
+from collections import OrderedDict
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+import glfw
+from PIL import Image as PILImage, ImageDraw, ImageFont
+
+from edelweiss import resources
+from edelweiss.figure import _gl_version_tuple
+from edelweiss.buffers import StreamingBuffer
+from edelweiss.shaders import get_program, release_program
+
+
+# Corner order for the two triangles of a glyph quad: (x index, y index) into [x0, y0, x1, y1]
+_QUAD_CORNERS_X = np.array([0, 2, 0, 2, 2, 0], dtype=np.intp)
+_QUAD_CORNERS_Y = np.array([1, 1, 3, 1, 3, 3], dtype=np.intp)
+
+_LAYOUT_CACHE_SIZE = 1024
+
+
+def _load_font(font_path, size):
+    """Load a TTF font through Pillow, falling back to Pillow's bundled default font."""
+    if font_path:
+        return ImageFont.truetype(font_path, size)
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+class GlyphAtlas:
+    """Rasterizes glyphs of one font/size on demand into a single shared texture."""
+
+    def __init__(self, font_path=None, size=16, atlas_size=512, max_atlas_size=4096):
+        self.font_path = font_path
+        self.size = int(size)
+        self.key = (font_path, self.size)
+        self.font = _load_font(font_path, self.size)
+
+        if hasattr(self.font, "getmetrics"):
+            ascent, descent = self.font.getmetrics()
+        else:
+            ascent, descent = self.size, self.size // 4
+        self.ascent = ascent
+        self.line_height = ascent + descent
+
+        self.max_atlas_size = max_atlas_size
+        self.pixels = np.zeros((atlas_size, atlas_size), dtype=np.uint8)
+        self.glyphs = {}  # char -> (advance, x0, y0, x1, y1, u0, v0, u1, v1) in pixels
+        self._kerning = {}
+
+        # shelf packer state
+        self._pen_x = 1
+        self._pen_y = 1
+        self._shelf_height = 0
+
+        # GL texture (created on first upload)
+        self.texture = None
+        self._texture_size = None
+        self._dirty_rows = None  # (first_row, last_row) waiting for upload
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    def glyph(self, ch):
+        """Return glyph metrics, rasterizing the character into the atlas if needed."""
+        info = self.glyphs.get(ch)
+        if info is None:
+            info = self._rasterize(ch)
+            self.glyphs[ch] = info
+        return info
+
+    def kerning(self, left, right):
+        """Kerning adjustment in pixels between two characters (0 for bitmap fonts)."""
+        pair = left + right
+        value = self._kerning.get(pair)
+        if value is None:
+            value = 0.0
+            if hasattr(self.font, "getlength"):
+                try:
+                    value = (
+                        self.font.getlength(pair)
+                        - self.font.getlength(left)
+                        - self.font.getlength(right)
+                    )
+                except Exception:
+                    value = 0.0
+            self._kerning[pair] = value
+        return value
+
+    def _rasterize(self, ch):
+        left, top, right, bottom = self.font.getbbox(ch)
+        advance = (
+            self.font.getlength(ch) if hasattr(self.font, "getlength") else right
+        )
+        w, h = right - left, bottom - top
+        if w <= 0 or h <= 0:
+            # whitespace and other empty glyphs only advance the pen
+            return (advance, 0, 0, 0, 0, 0, 0, 0, 0)
+
+        img = PILImage.new("L", (w, h), 0)
+        ImageDraw.Draw(img).text((-left, -top), ch, font=self.font, fill=255)
+        u0, v0 = self._allocate(w, h)
+        self.pixels[v0 : v0 + h, u0 : u0 + w] = np.asarray(img, dtype=np.uint8)
+        self._mark_dirty(v0, v0 + h)
+        return (advance, left, top, right, bottom, u0, v0, u0 + w, v0 + h)
+
+    def _allocate(self, w, h):
+        """Find space for a w x h glyph using a simple shelf packer, growing when full."""
+        while True:
+            if self._pen_x + w + 1 > self.width:
+                self._pen_x = 1
+                self._pen_y += self._shelf_height + 1
+                self._shelf_height = 0
+            if self._pen_y + h + 1 <= self.height and w + 2 <= self.width:
+                break
+            self._grow()
+
+        x, y = self._pen_x, self._pen_y
+        self._pen_x += w + 1
+        self._shelf_height = max(self._shelf_height, h)
+        return x, y
+
+    def _grow(self):
+        new_size = self.width * 2
+        if new_size > self.max_atlas_size:
+            raise RuntimeError(
+                f"Glyph atlas for font {self.key} exceeded {self.max_atlas_size}px"
+            )
+        grown = np.zeros((new_size, new_size), dtype=np.uint8)
+        grown[: self.height, : self.width] = self.pixels
+        self.pixels = grown
+        # UVs are kept in pixels and normalized at draw time, so existing layouts stay valid
+        self._mark_dirty(0, new_size)
+
+    def _mark_dirty(self, first, last):
+        if self._dirty_rows is None:
+            self._dirty_rows = (first, last)
+        else:
+            self._dirty_rows = (
+                min(self._dirty_rows[0], first),
+                max(self._dirty_rows[1], last),
+            )
+
+    def upload(self, use_modern):
+        """Create/update the GL texture; only the rows touched since the last upload are sent."""
+        fmt = GL_RED if use_modern else GL_ALPHA
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+        if self.texture is None:
+            self.texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            resources.track("texture", self.texture, self)
+        else:
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+
+        if self._texture_size != self.pixels.shape:
+            glTexImage2D(
+                GL_TEXTURE_2D, 0, fmt, self.width, self.height, 0,
+                fmt, GL_UNSIGNED_BYTE, self.pixels,
+            )
+            self._texture_size = self.pixels.shape
+            resources.resize("texture", self.texture, self.pixels.nbytes)
+        elif self._dirty_rows is not None:
+            first, last = self._dirty_rows
+            band = np.ascontiguousarray(self.pixels[first:last])
+            glTexSubImage2D(
+                GL_TEXTURE_2D, 0, 0, first, self.width, last - first,
+                fmt, GL_UNSIGNED_BYTE, band,
+            )
+        self._dirty_rows = None
+
+    def cleanup(self):
+        if self.texture:
+            glDeleteTextures(1, [self.texture])
+            resources.untrack("texture", self.texture)
+        self.texture = None
+        self._texture_size = None
+        self._dirty_rows = (0, self.height)
+
+
+class TextLayout:
+    """Laid-out string: glyph quads and atlas rects in pixels, origin at the top-left."""
+
+    __slots__ = ("quads", "uvs", "width", "height")
+
+    def __init__(self, quads, uvs, width, height):
+        self.quads = quads
+        self.uvs = uvs
+        self.width = width
+        self.height = height
+
+
+def _wrap_line(line, atlas, max_width):
+    """Greedy word wrap of a single line to max_width pixels."""
+    if max_width is None:
+        return [line]
+
+    space = atlas.glyph(" ")[0]
+    lines = []
+    current = ""
+    current_width = 0.0
+    for word in line.split(" "):
+        word_width = sum(atlas.glyph(ch)[0] for ch in word)
+        if current and current_width + space + word_width > max_width:
+            lines.append(current)
+            current, current_width = word, word_width
+        elif current:
+            current += " " + word
+            current_width += space + word_width
+        else:
+            current, current_width = word, word_width
+    lines.append(current)
+    return lines
+
+
+def layout_text(text, atlas, max_width=None):
+    """Break text into lines and position every glyph (kerning included)."""
+    quads = []
+    uvs = []
+    width = 0.0
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(_wrap_line(paragraph, atlas, max_width))
+
+    for row, line in enumerate(lines):
+        pen_x = 0.0
+        top = row * atlas.line_height
+        prev = None
+        for ch in line:
+            if prev is not None:
+                pen_x += atlas.kerning(prev, ch)
+            advance, x0, y0, x1, y1, u0, v0, u1, v1 = atlas.glyph(ch)
+            if x1 > x0:
+                quads.append((pen_x + x0, top + y0, pen_x + x1, top + y1))
+                uvs.append((u0, v0, u1, v1))
+            pen_x += advance
+            prev = ch
+        width = max(width, pen_x)
+
+    return TextLayout(
+        np.array(quads, dtype=np.float32).reshape(-1, 4),
+        np.array(uvs, dtype=np.float32).reshape(-1, 4),
+        width,
+        len(lines) * atlas.line_height,
+    )
+
+
+class TextRenderer:
+    """Collects text for the current frame and draws it in one batch per glyph atlas."""
+
+    def __init__(self):
+        self._atlases = {}
+        self._layouts = OrderedDict()
+        self._queue = {}  # atlas key -> list of (layout, x, y, color)
+
+        self.shader = None
+        self._program = None
+        self._program_generation = None
+        self._u_texture = None
+        self._use_modern = None
+        self.vao = None
+        self.stream = None
+        self._has_vao = False
+
+    def get_atlas(self, font_path=None, size=16):
+        key = (font_path, int(size))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font_path, size)
+            self._atlases[key] = atlas
+        return atlas
+
+    def layout(self, text, font_path=None, size=16, max_width=None):
+        """Return the cached layout of text, building it on first use."""
+        key = (text, font_path, int(size), max_width)
+        cached = self._layouts.get(key)
+        if cached is not None:
+            self._layouts.move_to_end(key)
+            return cached
+        cached = layout_text(text, self.get_atlas(font_path, size), max_width)
+        self._layouts[key] = cached
+        if len(self._layouts) > _LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return cached
+
+    def measure(self, text, font_path=None, size=16, max_width=None):
+        """(width, height) in pixels of the laid-out text."""
+        layout = self.layout(text, font_path, size, max_width)
+        return layout.width, layout.height
+
+    def draw_text(
+        self,
+        text,
+        x,
+        y,
+        color=(1.0, 1.0, 1.0),
+        font_path=None,
+        size=16,
+        max_width=None,
+        anchor="topleft",
+    ):
+        """Queue text at pixel position (x, y); anchor is "topleft" or "center"."""
+        if not text:
+            return
+        layout = self.layout(text, font_path, size, max_width)
+        if anchor == "center":
+            x -= layout.width / 2.0
+            y -= layout.height / 2.0
+        self._queue.setdefault((font_path, int(size)), []).append(
+            (layout, x, y, color)
+        )
+
+    def swap_queue(self, queue):
+        """Replace the pending queue (returns the old one) to flush a subset of text."""
+        old, self._queue = self._queue, queue
+        return old
+
+    # ----------------------------- OpenGL -----------------------------------
+    def _setup_shader(self):
+        major, _ = _gl_version_tuple()
+        self._use_modern = major >= 3
+        suffix = "" if self._use_modern else "_120"
+        self._program = get_program(
+            f"vertex_shader_text{suffix}.glsl",
+            f"fragment_shader_text{suffix}.glsl",
+            ("a_pos", "a_uv", "a_color"),
+        )
+        self.shader = self._program.program
+        self._u_texture = glGetUniformLocation(self.shader, "u_texture")
+        self._program_generation = self._program.generation
+
+    def _setup_buffers(self):
+        self._has_vao = True
+        try:
+            self.vao = glGenVertexArrays(1)
+            if glGetError() != GL_NO_ERROR:
+                self._has_vao = False
+                self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
+        except Exception:
+            self._has_vao = False
+            self.vao = None
+
+        # text vertices are rewritten every frame, so they live in a streaming ring buffer
+        self.stream = StreamingBuffer(region_size=256 * 1024, owner=self)
+
+    def _enable_attr_pointers(self, base):
+        stride = 7 * 4
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(base))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(
+            1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(base + 8)
+        )
+        glEnableVertexAttribArray(2)
+        glVertexAttribPointer(
+            2, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(base + 16)
+        )
+
+    def _build_vertices(self, atlas, items, window_width, window_height):
+        """Concatenate every queued string of one atlas into a single NDC vertex array."""
+        quads = np.concatenate([layout.quads for layout, _, _, _ in items])
+        uvs = np.concatenate([layout.uvs for layout, _, _, _ in items])
+        counts = [len(layout.quads) for layout, _, _, _ in items]
+        origins = np.repeat(
+            np.array([(x, y, x, y) for _, x, y, _ in items], dtype=np.float32),
+            counts,
+            axis=0,
+        )
+        colors = np.repeat(
+            np.array([color for _, _, _, color in items], dtype=np.float32),
+            counts,
+            axis=0,
+        )
+
+        quads = quads + origins
+        quads[:, 0::2] = quads[:, 0::2] * (2.0 / window_width) - 1.0
+        quads[:, 1::2] = 1.0 - quads[:, 1::2] * (2.0 / window_height)
+        uvs = uvs / np.array(
+            [atlas.width, atlas.height, atlas.width, atlas.height], dtype=np.float32
+        )
+
+        vertices = np.empty((len(quads), 6, 7), dtype=np.float32)
+        vertices[:, :, 0] = quads[:, _QUAD_CORNERS_X]
+        vertices[:, :, 1] = quads[:, _QUAD_CORNERS_Y]
+        vertices[:, :, 2] = uvs[:, _QUAD_CORNERS_X]
+        vertices[:, :, 3] = uvs[:, _QUAD_CORNERS_Y]
+        vertices[:, :, 4:7] = colors[:, None, :]
+        return vertices.reshape(-1, 7)
+
+    def flush(self):
+        """Draw everything queued this frame (one draw call per atlas) and clear the queue."""
+        if not self._queue:
+            return
+        queue, self._queue = self._queue, {}
+
+        if self.shader is None:
+            self._setup_shader()
+            self._setup_buffers()
+
+        window_width, window_height = glfw.get_window_size(glfw.get_current_context())
+        glEnable(GL_BLEND)
+        # alpha accumulates like premultiplied color, so text in offscreen layers composites
+        glBlendFuncSeparate(
+            GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA
+        )
+        glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._u_texture = glGetUniformLocation(self.shader, "u_texture")
+            self._program_generation = self._program.generation
+        glActiveTexture(GL_TEXTURE0)
+        glUniform1i(self._u_texture, 0)
+
+        for key, items in queue.items():
+            items = [item for item in items if len(item[0].quads)]
+            if not items:
+                continue
+            atlas = self._atlases[key]
+            vertices = self._build_vertices(atlas, items, window_width, window_height)
+            atlas.upload(self._use_modern)
+
+            offset = self.stream.write(vertices)
+
+            if self._has_vao:
+                glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            self._enable_attr_pointers(offset)
+            glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+            if self._has_vao:
+                glBindVertexArray(0)
+            else:
+                for index in range(3):
+                    glDisableVertexAttribArray(index)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self.stream.end_frame()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glUseProgram(0)
+        glDisable(GL_BLEND)
+
+    def cleanup(self):
+        """Free GL resources; the CPU-side atlases and layouts are kept."""
+        for atlas in self._atlases.values():
+            atlas.cleanup()
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
+        if self.stream:
+            self.stream.cleanup()
+        if self.shader:
+            release_program(self.shader)
+        self.vao = None
+        self.stream = None
+        self.shader = None
+        self._program = None
+
+
+_text_renderer = None
+
+
+def get_text_renderer():
+    """Shared text renderer used by widgets and overlays."""
+    global _text_renderer
+    if _text_renderer is None:
+        _text_renderer = TextRenderer()
+    return _text_renderer
+
+
+def draw_text(text, x, y, **kwargs):
+    """Queue text on the shared renderer (drawn at the end of Scene.render())."""
+    get_text_renderer().draw_text(text, x, y, **kwargs)
@@ -0,0 +1,258 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+from PIL import Image as PILImage
+
+from edelweiss import resources
+from edelweiss.figure import GameObject, _gl_version_tuple
+from edelweiss.buffers import upload_dynamic
+from edelweiss.camera import get_camera
+from edelweiss.shaders import get_program
+
+EMPTY = -1  # tile id of an empty cell
+
+# Corners of the two triangles of a tile: 0 = left/top, 1 = right/bottom
+_CORNER_X = np.array([0, 1, 0, 1, 1, 0], dtype=np.intp)
+_CORNER_Y = np.array([0, 0, 1, 0, 1, 1], dtype=np.intp)
+
+
+def _make_tile_program():
+    """Shared textured tile program with the same u_position/u_scale convention as shapes."""
+    major, _ = _gl_version_tuple()
+    suffix = "" if major >= 3 else "_120"
+    return get_program(
+        f"vertex_shader_tilemap{suffix}.glsl",
+        f"fragment_shader_tilemap{suffix}.glsl",
+        ("position", "uv"),
+    )
+
+
+class TileMap(GameObject):
+    """Grid of tiles from one atlas texture, drawn as static per-chunk meshes.
+
+    Tile ids live in a NumPy array (EMPTY = no tile). Editing tiles only marks their
+    chunk dirty; dirty chunks are rebuilt when next drawn, and chunks outside
+    the visible rectangle are skipped entirely.
+    """
+
+    def __init__(
+        self,
+        tiles,
+        atlas,
+        tile_pixels,
+        tile_size=0.1,
+        chunk_size=32,
+        name=None,
+        position=(0.0, 0.0, 0.0),
+        scale=1.0,
+    ):
+        super().__init__(name=name, position=position, scale=scale)
+        self.tiles = np.array(tiles, dtype=np.int32)
+        if self.tiles.ndim != 2:
+            raise ValueError("TileMap tiles must be a 2D array of tile ids")
+        self.tile_size = float(tile_size)  # world units per tile
+        self.chunk_size = int(chunk_size)
+
+        # atlas: file path, PIL image or HxWx4 uint8 array
+        if isinstance(atlas, str):
+            atlas = PILImage.open(atlas)
+        if isinstance(atlas, PILImage.Image):
+            atlas = np.asarray(atlas.convert("RGBA"), dtype=np.uint8)
+        self.atlas_pixels = np.ascontiguousarray(atlas, dtype=np.uint8)
+        atlas_h, atlas_w = self.atlas_pixels.shape[:2]
+        self.atlas_columns = max(1, atlas_w // int(tile_pixels))
+        self.atlas_rows = max(1, atlas_h // int(tile_pixels))
+        # half-texel inset keeps linear filtering from bleeding neighbouring tiles in
+        self._uv_inset = np.array([0.5 / atlas_w, 0.5 / atlas_h], dtype=np.float32)
+
+        # visible area in world coordinates (x0, y0, x1, y1); None follows the camera
+        self.view_rect = None
+
+        rows, cols = self.chunk_grid
+        self._dirty = np.ones((rows, cols), dtype=bool)
+        self._chunks = {}  # (chunk_row, chunk_col) -> [vbo, capacity, vertex_count]
+        self.texture = None
+        self._u_texture = None
+        self.chunks_drawn = 0  # stats of the last render()
+        self.chunks_rebuilt = 0
+
+    @property
+    def chunk_grid(self):
+        rows, cols = self.tiles.shape
+        return -(-rows // self.chunk_size), -(-cols // self.chunk_size)
+
+    # ----------------------------- editing ----------------------------------
+    def set_tile(self, row, col, tile_id):
+        """Change one tile; only its chunk is rebuilt."""
+        self.tiles[row, col] = tile_id
+        self._dirty[row // self.chunk_size, col // self.chunk_size] = True
+
+    def set_tiles(self, row, col, block):
+        """Write a 2D block of tile ids with its top-left corner at (row, col)."""
+        block = np.asarray(block, dtype=np.int32)
+        h, w = block.shape
+        self.tiles[row : row + h, col : col + w] = block
+        cs = self.chunk_size
+        self._dirty[
+            row // cs : (row + h - 1) // cs + 1, col // cs : (col + w - 1) // cs + 1
+        ] = True
+
+    def fill(self, tile_id):
+        self.tiles.fill(tile_id)
+        self._dirty[:] = True
+
+    def tile_at(self, x, y):
+        """(row, col) of the tile under world point (x, y), or None outside the map."""
+        local_x = (x - self.position[0]) / self.scale
+        local_y = (y - self.position[1]) / self.scale
+        col = int(np.floor(local_x / self.tile_size))
+        row = int(np.floor(-local_y / self.tile_size))
+        rows, cols = self.tiles.shape
+        if 0 <= row < rows and 0 <= col < cols:
+            return row, col
+        return None
+
+    # ----------------------------- geometry ---------------------------------
+    def build_chunk(self, chunk_row, chunk_col):
+        """Vertex array (x, y, u, v per vertex) of one chunk, built without Python loops."""
+        cs = self.chunk_size
+        r0, c0 = chunk_row * cs, chunk_col * cs
+        ids = self.tiles[r0 : r0 + cs, c0 : c0 + cs]
+        rr, cc = np.nonzero(ids != EMPTY)
+        tile = ids[rr, cc]
+
+        ts = self.tile_size
+        xs = np.stack([(c0 + cc) * ts, (c0 + cc + 1) * ts], axis=1)
+        ys = np.stack([-(r0 + rr) * ts, -(r0 + rr + 1) * ts], axis=1)
+        u = (tile % self.atlas_columns).astype(np.float32)
+        v = (tile // self.atlas_columns).astype(np.float32)
+        us = np.stack(
+            [
+                u / self.atlas_columns + self._uv_inset[0],
+                (u + 1) / self.atlas_columns - self._uv_inset[0],
+            ],
+            axis=1,
+        )
+        vs = np.stack(
+            [
+                v / self.atlas_rows + self._uv_inset[1],
+                (v + 1) / self.atlas_rows - self._uv_inset[1],
+            ],
+            axis=1,
+        )
+
+        vertices = np.empty((len(tile), 6, 4), dtype=np.float32)
+        vertices[:, :, 0] = xs[:, _CORNER_X]
+        vertices[:, :, 1] = ys[:, _CORNER_Y]
+        vertices[:, :, 2] = us[:, _CORNER_X]
+        vertices[:, :, 3] = vs[:, _CORNER_Y]
+        return vertices.reshape(-1, 4)
+
+    def _rebuild_chunk(self, key):
+        vertices = self.build_chunk(*key)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = [glGenBuffers(1), 0, 0]
+            self._chunks[key] = chunk
+            resources.track("buffer", chunk[0], self)
+        if len(vertices):
+            chunk[1] = upload_dynamic(chunk[0], vertices, chunk[1])
+        chunk[2] = len(vertices)
+        self._dirty[key] = False
+        self.chunks_rebuilt += 1
+
+    def visible_chunks(self):
+        """Chunk (row, col) ranges overlapping view_rect (the camera view by default)."""
+        x0, y0, x1, y1 = self.view_rect or get_camera().view_rect()
+        span = self.tile_size * self.chunk_size * self.scale
+        rows, cols = self.chunk_grid
+        c_first = int(np.floor((x0 - self.position[0]) / span))
+        c_last = int(np.floor((x1 - self.position[0]) / span))
+        r_first = int(np.floor(-(y1 - self.position[1]) / span))
+        r_last = int(np.floor(-(y0 - self.position[1]) / span))
+        return (
+            range(max(r_first, 0), min(r_last + 1, rows)),
+            range(max(c_first, 0), min(c_last + 1, cols)),
+        )
+
+    # ----------------------------- OpenGL -----------------------------------
+    def _query_uniforms(self):
+        super()._query_uniforms()
+        self._u_texture = glGetUniformLocation(self.shader, "u_texture")
+
+    def initialize(self):
+        self._program = _make_tile_program()
+        self.shader = self._program.program
+        self._query_uniforms()
+        self._try_make_vao()
+
+        h, w = self.atlas_pixels.shape[:2]
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, GL_RGBA, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+            self.atlas_pixels,
+        )
+        glBindTexture(GL_TEXTURE_2D, 0)
+        resources.track("texture", self.texture, self, w * h * 4)
+        # chunks are (re)built on demand when they first become visible
+        self._dirty[:] = True
+
+    def render(self):
+        self.chunks_drawn = 0
+        self.chunks_rebuilt = 0
+
+        self._use_shader()
+        glUniform3fv(self._u_pos, 1, self.position)
+        glUniform1f(self._u_scale, self.scale)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glUniform1i(self._u_texture, 0)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        if self._has_vao:
+            glBindVertexArray(self.vao)
+
+        row_range, col_range = self.visible_chunks()
+        for chunk_row in row_range:
+            for chunk_col in col_range:
+                key = (chunk_row, chunk_col)
+                if self._dirty[key]:
+                    self._rebuild_chunk(key)
+                vbo, _, count = self._chunks[key]
+                if not count:
+                    continue
+                glBindBuffer(GL_ARRAY_BUFFER, vbo)
+                glEnableVertexAttribArray(0)
+                glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(0))
+                glEnableVertexAttribArray(1)
+                glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(8))
+                glDrawArrays(GL_TRIANGLES, 0, count)
+                self.chunks_drawn += 1
+
+        if self._has_vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+            glDisableVertexAttribArray(1)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisable(GL_BLEND)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glUseProgram(0)
+
+    def cleanup(self):
+        for vbo, _, _ in self._chunks.values():
+            glDeleteBuffers(1, [vbo])
+            resources.untrack("buffer", vbo)
+        self._chunks = {}
+        self._dirty[:] = True
+        if self.texture:
+            glDeleteTextures(1, [self.texture])
+            resources.untrack("texture", self.texture)
+        self.texture = None
+        super().cleanup()
@@ -0,0 +1,282 @@
+import numpy as np
+
+# Easing curves on normalized time t in [0, 1], evaluated on whole arrays.
+_BACK = 1.70158
+
+
+def _in_out(ease_in):
+    return lambda t: np.where(
+        t < 0.5, ease_in(2.0 * t) / 2.0, 1.0 - ease_in(2.0 - 2.0 * t) / 2.0
+    )
+
+
+EASINGS = {
+    "linear": lambda t: t,
+    "in_quad": lambda t: t * t,
+    "out_quad": lambda t: 1.0 - (1.0 - t) ** 2,
+    "in_out_quad": _in_out(lambda t: t * t),
+    "in_cubic": lambda t: t**3,
+    "out_cubic": lambda t: 1.0 - (1.0 - t) ** 3,
+    "in_out_cubic": _in_out(lambda t: t**3),
+    "in_out_sine": lambda t: 0.5 - 0.5 * np.cos(np.pi * t),
+    "out_back": lambda t: 1.0 + (_BACK + 1.0) * (t - 1.0) ** 3 + _BACK * (t - 1.0) ** 2,
+}
+_EASING_IDS = {name: index for index, name in enumerate(EASINGS)}
+_EASING_FUNCS = list(EASINGS.values())
+
+WIDTH = 4  # components per tween (colors and positions use 3, scale 1)
+# tween ids are generation << _SLOT_BITS | slot, so an id outlives its recycled slot
+_SLOT_BITS = 32
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+
+
+def ease(easing, t):
+    """Apply per-element easing ids (int array) to t, one vectorized call per curve."""
+    out = np.empty_like(t)
+    for code in np.unique(easing):
+        mask = easing == code
+        out[mask] = _EASING_FUNCS[code](t[mask])
+    return out
+
+
+class TweenManager:
+    """All running tweens in flat arrays, advanced in one vectorized pass per frame.
+
+    Targets are attributes of objects (position, color, scale, widget colors...) or
+    fields of an edelweiss.entities.EntityStore. Array attributes are written in
+    place; entity tweens are written back with one fancy-indexed store per field.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.count = 0  # high-water mark of used slots
+        self.start = np.zeros((0, WIDTH), dtype=np.float32)
+        self.delta = np.zeros((0, WIDTH), dtype=np.float32)
+        self.elapsed = np.zeros(0, dtype=np.float32)
+        self.delay = np.zeros(0, dtype=np.float32)
+        self.duration = np.ones(0, dtype=np.float32)
+        self.easing = np.zeros(0, dtype=np.int16)
+        self.width = np.zeros(0, dtype=np.int8)
+        self.active = np.zeros(0, dtype=bool)
+        self.channel = np.zeros(0, dtype=np.int32)  # -1 = object attribute
+        self.entity = np.zeros(0, dtype=np.int64)
+        self.generation = np.zeros(0, dtype=np.int64)  # bumped each time a slot is filled
+        self._targets = []  # slot -> (obj, attr) for object tweens
+        self._callbacks = []  # slot -> on_complete or None
+        self._channels = []  # (store, field) of entity tweens
+        self._by_target = {}  # (id(obj), attr) -> slot, so a new tween replaces the old
+        self._free = []
+        self._reserve(capacity)
+
+    def _reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        for field in (
+            "start",
+            "delta",
+            "elapsed",
+            "delay",
+            "duration",
+            "easing",
+            "width",
+            "active",
+            "channel",
+            "entity",
+            "generation",
+        ):
+            old = getattr(self, field)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, field, new)
+        self._targets.extend([None] * (capacity - self.capacity))
+        self._callbacks.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.active[: self.count]))
+
+    def _alloc(self, count):
+        """Slot indices for count new tweens."""
+        reuse = min(count, len(self._free))
+        slots = [self._free.pop() for _ in range(reuse)]
+        fresh = count - reuse
+        if fresh:
+            if self.count + fresh > self.capacity:
+                self._reserve(max(self.capacity * 2, self.count + fresh))
+            slots.extend(range(self.count, self.count + fresh))
+            self.count += fresh
+        return np.array(slots, dtype=np.int64)
+
+    def _fill(self, slots, start, end, duration, easing, delay):
+        if easing not in _EASING_IDS:
+            raise ValueError(
+                f"Unknown easing '{easing}', expected one of {list(EASINGS)}"
+            )
+        start = np.asarray(start, dtype=np.float32).reshape(len(slots), -1)
+        end = np.asarray(end, dtype=np.float32).reshape(len(slots), -1)
+        width = start.shape[1]
+        self.start[slots] = 0.0
+        self.delta[slots] = 0.0
+        self.start[slots, :width] = start
+        self.delta[slots, :width] = end - start
+        self.width[slots] = width
+        self.elapsed[slots] = 0.0
+        self.delay[slots] = delay
+        self.duration[slots] = max(float(duration), 1e-6)
+        self.easing[slots] = _EASING_IDS[easing]
+        self.active[slots] = True
+        self.generation[slots] += 1
+        return (self.generation[slots] << _SLOT_BITS) | slots
+
+    # ------------------------------ creation --------------------------------
+    def to(
+        self, obj, attr, end, duration, easing="out_cubic", delay=0.0, on_complete=None
+    ):
+        """Animate obj.<attr> (float or float array) from its current value to end.
+
+        A running tween on the same attribute is replaced. Returns the tween id.
+        """
+        key = (id(obj), attr)
+        previous = self._by_target.get(key)
+        if previous is not None:
+            self._release(previous)
+        current = np.atleast_1d(np.asarray(getattr(obj, attr), dtype=np.float32))
+        end = np.atleast_1d(np.asarray(end, dtype=np.float32))
+        if end.shape != current.shape or current.size > WIDTH:
+            raise ValueError(
+                f"Cannot tween '{attr}' of shape {current.shape} to {end.shape}"
+            )
+        slot = int(self._alloc(1)[0])
+        tween_id = int(self._fill([slot], current, end, duration, easing, delay)[0])
+        self.channel[slot] = -1
+        self._targets[slot] = (obj, attr)
+        self._callbacks[slot] = on_complete
+        self._by_target[key] = slot
+        return tween_id
+
+    def to_entities(
+        self, store, ids, field, end, duration, easing="out_cubic", delay=0.0
+    ):
+        """Animate a field of many EntityStore rows at once; returns the tween ids.
+
+        end is one value for all rows or one per row.
+        """
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        values = getattr(store, field)
+        start = values[ids].reshape(len(ids), -1)
+        end = np.asarray(end, dtype=np.float32)
+        if end.size == start.shape[1]:
+            end = np.broadcast_to(end.reshape(1, -1), start.shape)  # same for every row
+        else:
+            end = end.reshape(start.shape)
+        channel = None
+        for index, (channel_store, channel_field) in enumerate(self._channels):
+            if channel_store is store and channel_field == field:
+                channel = index
+        if channel is None:
+            channel = len(self._channels)
+            self._channels.append((store, field))
+        slots = self._alloc(len(ids))
+        tween_ids = self._fill(slots, start, end, duration, easing, delay)
+        self.channel[slots] = channel
+        self.entity[slots] = ids
+        return tween_ids
+
+    def cancel(self, tween):
+        """Stop a tween (or an array of tween ids) where it is, without callbacks.
+
+        Ids of tweens that already finished or were cancelled are ignored, even if
+        their slot now runs another tween.
+        """
+        for tween_id in np.atleast_1d(np.asarray(tween, dtype=np.int64)):
+            slot, generation = int(tween_id) & _SLOT_MASK, int(tween_id) >> _SLOT_BITS
+            if slot >= self.count or self.generation[slot] != generation:
+                continue  # stale id
+            if self.active[slot]:
+                self._release(slot)
+
+    def cancel_target(self, obj, attr=None):
+        """Stop tweens on obj (all of its attributes, or just attr)."""
+        for key, slot in list(self._by_target.items()):
+            if key[0] == id(obj) and (attr is None or key[1] == attr):
+                self._release(slot)
+
+    def _release(self, slot):
+        self.active[slot] = False
+        target = self._targets[slot]
+        if target is not None:
+            self._by_target.pop((id(target[0]), target[1]), None)
+        self._targets[slot] = None
+        self._callbacks[slot] = None
+        self._free.append(slot)
+
+    # ------------------------------ evaluation ------------------------------
+    def update(self, dt):
+        """Advance every tween by dt seconds and write the eased values back."""
+        n = self.count
+        if n == 0:
+            return
+        active = self.active[:n]
+        if not active.any():
+            return
+        elapsed = self.elapsed[:n]
+        elapsed[active] += dt
+        t = np.clip((elapsed - self.delay[:n]) / self.duration[:n], 0.0, 1.0)
+        running = active & (elapsed >= self.delay[:n])
+        values = self.start[:n] + self.delta[:n] * ease(self.easing[:n], t)[:, None]
+
+        channel = self.channel[:n]
+        for index, (store, field) in enumerate(self._channels):
+            mask = running & (channel == index)
+            if mask.any():
+                target = getattr(store, field)
+                if target.ndim == 1:
+                    target[self.entity[:n][mask]] = values[mask, 0]
+                else:
+                    target[self.entity[:n][mask]] = values[mask, : target.shape[1]]
+
+        width = self.width[:n]
+        for slot in np.flatnonzero(running & (channel < 0)):
+            obj, attr = self._targets[slot]
+            current = getattr(obj, attr)
+            if isinstance(current, np.ndarray):
+                current[...] = values[slot, : width[slot]].reshape(current.shape)
+                if hasattr(obj, "dirty"):
+                    obj.dirty = True  # e.g. widgets cached in a UI layer
+            else:
+                setattr(obj, attr, float(values[slot, 0]))
+
+        finished = np.flatnonzero(active & (t >= 1.0))
+        callbacks = []
+        for slot in finished:
+            callback = self._callbacks[slot]
+            target = self._targets[slot]
+            self._release(int(slot))
+            if callback is not None:
+                callbacks.append((callback, target[0] if target else None))
+        for callback, obj in callbacks:
+            callback(obj)
+
+    def clear(self):
+        self.active[:] = False
+        self._targets = [None] * self.capacity
+        self._callbacks = [None] * self.capacity
+        self._by_target.clear()
+        self._channels = []
+        self._free = []
+        self.count = 0
+
+
+_tweens = None
+
+
+def get_tweens():
+    """The shared TweenManager advanced by GameEngine.frame()."""
+    global _tweens
+    if _tweens is None:
+        _tweens = TweenManager()
+    return _tweens
+
+
+def tween(obj, attr, end, duration, easing="out_cubic", delay=0.0, on_complete=None):
+    return get_tweens().to(obj, attr, end, duration, easing, delay, on_complete)
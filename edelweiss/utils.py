@@ -15,10 +15,10 @@ class GLFWimage(ctypes.Structure):
 def load_icon(filename):
     pil_img = PILImage.open(filename).convert('RGBA')
     width, height = pil_img.size
-    img_data = np.array(pil_img, dtype=np.uint8)
-    data = img_data.flatten()
-    c_data = (ctypes.c_ubyte * len(data))(*data)
-    image = GLFWimage(width, height, c_data)
+    data = np.ascontiguousarray(np.asarray(pil_img, dtype=np.uint8))
+    # point straight at the NumPy buffer instead of copying pixels through Python ints
+    image = GLFWimage(width, height, data.ctypes.data_as(ctypes.POINTER(ctypes.c_ubyte)))
+    image._pixels = data  # keep the buffer alive as long as the struct
     return image
 
 
@@ -1 +1,2 @@
-from .button import *
\ No newline at end of file
+from .button import *
+from .ui_layer import UILayer
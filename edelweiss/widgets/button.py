@@ -1,8 +1,16 @@
+import sys
+
 import glfw
 import numpy as np
 from OpenGL.GL import *
 import ctypes
 
+from edelweiss import resources
+from edelweiss.text import get_text_renderer
+from edelweiss.buffers import upload_dynamic
+from edelweiss.shaders import get_program, release_program
+from edelweiss.stroke import stroke
+
 
 class Button:
     def __init__(
@@ -20,16 +28,25 @@ class Button:
         outline_width=0,
         radius=0.1,
         text="",
+        text_color=(1.0, 1.0, 1.0),
+        font_path=None,
+        font_size=16,
+        transition=0.0,
     ):
         self.name = name
         self.position = np.array(
             [0.0, 0.0, 0.0], dtype=np.float32
         )  # will be set via update_position
+        self.x = x  # center in window pixels (used for the text label)
+        self.y = y
         self.width_pixels = width
         self.height_pixels = height
         self.width = float(width)  # normalized width (computed in update_position)
         self.height = float(height)  # normalized height (computed in update_position)
 
+        # set whenever the look changes, so cached UI layers know to redraw
+        self.dirty = True
+
         self.base_color = np.array(color, dtype=np.float32)
         self.color = self.base_color.copy()
         self.outline_color = (
@@ -43,9 +60,15 @@ class Button:
         self.on_press = on_press
         self.on_click = on_click
         self.text = text
+        self.text_color = np.array(text_color, dtype=np.float32)
+        self.font_path = font_path
+        self.font_size = int(font_size)
+        # seconds to blend between colors set by hover/press (0 = switch instantly)
+        self.transition = float(transition)
 
         self.hovered = False
         self.pressed = False
+        self._cursor_pos = None  # last dispatched cursor position (window pixels)
 
         self.window = glfw.get_current_context()
         if not self.window:
@@ -55,23 +78,57 @@ class Button:
 
         # GL resources (created in initialize)
         self.shader = None
+        self._program = None
+        self._program_generation = None
         self._u_pos = None
         self._u_color = None
 
         self.vao = None
         self.vbo = None
-        self.outline_vao = None
-        self.outline_vbo = None
         self._has_vao = False  # fallback flag for GL 2.1
+        self._vbo_capacity = 0
+        self.initialized = False  # GL resources are created lazily by the scene
 
         # geometry
         self.vertices = None
         self.outline_vertices = None
+        self._fill_count = 0  # vertices of the body, followed by the outline stroke
+        self._outline_count = 0
 
         # compute normalized position/size and CPU-side geometry now
         self.update_position(x, y)
         self.setup_vertices()
 
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        # hover/press callbacks assign colors directly; track it for UI layer redraws
+        self._color = value
+        self.dirty = True
+
+    def _set_state_color(self, color):
+        """Switch to a hover/press/base color, blended over self.transition seconds."""
+        if self.transition <= 0.0:
+            self.color = color
+            return
+        from edelweiss.tween import get_tweens
+
+        # tweens write in place: never animate an array shared with base_color
+        self.color = np.array(self._color, dtype=np.float32)
+        get_tweens().to(self, "color", color, self.transition, easing="out_quad")
+
+    def _run_color_callback(self, callback):
+        """Call on_hover/on_press; a color they assign is animated when transition > 0."""
+        before = self._color
+        callback(self)
+        if self.transition > 0.0 and self._color is not before:
+            target = self._color
+            self._color = before
+            self._set_state_color(target)
+
     # -------- lifecycle called by engine after GL context is active --------
     def initialize(self):
         """Called by engine after context is current. Safe place to touch OpenGL."""
@@ -94,26 +151,61 @@ class Button:
         norm_x, norm_y, norm_w, norm_h = self.pixels_to_normalized_coordinates(
             x, y, self.width_pixels, self.height_pixels, window_width, window_height
         )
+        self.x = x
+        self.y = y
         self.position[:2] = np.array([norm_x, norm_y], dtype=np.float32)
         self.width = norm_w
         self.height = norm_h
+        self.dirty = True
+
+    def screen_rect(self):
+        """Area covered in window pixels (x0, y0, x1, y1), outline included."""
+        margin = self.outline_width / 2.0 + 1.0
+        half_w = self.width_pixels / 2.0 + margin
+        half_h = self.height_pixels / 2.0 + margin
+        return (self.x - half_w, self.y - half_h, self.x + half_w, self.y + half_h)
 
     def set_position(self, x, y):
         self.update_position(x, y)
 
+    def set_size(self, width, height):
+        """Resize in pixels; geometry is rebuilt and uploaded into the existing buffers."""
+        self.width_pixels = width
+        self.height_pixels = height
+        self.update_position(self.x, self.y)
+        self.setup_vertices()
+        if self.vbo:
+            self._vbo_capacity = upload_dynamic(
+                self.vbo, self.vertices, self._vbo_capacity
+            )
+
     def set_color(self, color):
+        self.dirty = True
         self.base_color = np.array(color, dtype=np.float32)
         if not self.hovered and not self.pressed:
+            tween = sys.modules.get("edelweiss.tween")
+            if tween is not None:
+                tween.get_tweens().cancel_target(self, "color")
             self.color = self.base_color.copy()
 
     def set_outline_color(self, color):
         self.outline_color = np.array(color, dtype=np.float32)
+        self.dirty = True
 
     def set_text(self, text):
-        self.text = text
+        if text != self.text:
+            self.text = text
+            self.dirty = True
+
+    def set_text_color(self, color):
+        self.text_color = np.array(color, dtype=np.float32)
+        self.dirty = True
 
     def setup_vertices(self):
-        """Build CPU-side vertex arrays for body (triangles) and outline (line-loop points)."""
+        """Build the vertex array: body triangles followed by the outline stroke triangles.
+
+        outline_vertices keeps the outline polygon itself (x, y, z per point).
+        """
         half_width = self.width / 2.0
         half_height = self.height / 2.0
         radius = self.radius * min(self.width, self.height) / 2.0
@@ -208,8 +300,32 @@ class Button:
                 verts.extend(outline[i * 3 : i * 3 + 3])
                 verts.extend(outline[nxt * 3 : nxt * 3 + 3])
 
-        self.vertices = np.array(verts, dtype=np.float32)
+        fill = np.array(verts, dtype=np.float32)
         self.outline_vertices = np.array(outline, dtype=np.float32)
+        self._fill_count = len(fill) // 3
+        stroke_vertices = self._outline_stroke()
+        self._outline_count = len(stroke_vertices)
+        if self._outline_count:
+            mesh = np.zeros((self._outline_count, 3), dtype=np.float32)
+            mesh[:, :2] = stroke_vertices
+            fill = np.concatenate((fill, mesh.reshape(-1)))
+        self.vertices = fill
+
+    def _outline_stroke(self):
+        """Outline as triangles in NDC, stroked in pixels so the width is exact."""
+        if self.outline_width <= 0 or not len(self.outline_vertices):
+            return np.zeros((0, 2), dtype=np.float32)
+        # NDC per pixel differs along x and y; the polygon is relative to the
+        # center, so equal sizes give equal keys and share one cached mesh
+        ndc_per_pixel = np.array(
+            [
+                self.width / max(self.width_pixels, 1e-6),
+                self.height / max(self.height_pixels, 1e-6),
+            ],
+            dtype=np.float32,
+        )
+        polygon = self.outline_vertices.reshape(-1, 3)[:, :2] / ndc_per_pixel
+        return stroke(polygon, self.outline_width, closed=True) * ndc_per_pixel
 
     # ----------------------------- shaders ----------------------------------
     def _gl_version(self):
@@ -232,78 +348,25 @@ class Button:
             return (2, 1)
 
     def setup_shader(self):
-        """Compile shaders. Use GLSL 330 if available, otherwise fallback to GLSL 120."""
+        """Load shaders. Use GLSL 330 if available, otherwise fallback to GLSL 120."""
         major, minor = self._gl_version()
         use_modern = major >= 3  # 3.x+ usually supports 330 core on macOS profiles
+        suffix = "" if use_modern else "_120"
 
-        if use_modern:
-            vert_src = """
-            #version 330 core
-            layout(location = 0) in vec3 aPos;
-            uniform vec3 u_position;
-            void main() {
-                gl_Position = vec4(aPos + u_position, 1.0);
-            }
-            """
-            frag_src = """
-            #version 330 core
-            out vec4 FragColor;
-            uniform vec3 u_color;
-            void main() {
-                FragColor = vec4(u_color, 1.0);
-            }
-            """
-        else:
-            # GLSL 1.20 (OpenGL 2.1) — no layout qualifiers, use attribute/varying
-            vert_src = """
-            #version 120
-            attribute vec3 aPos;
-            uniform vec3 u_position;
-            void main() {
-                gl_Position = vec4(aPos + u_position, 1.0);
-            }
-            """
-            frag_src = """
-            #version 120
-            uniform vec3 u_color;
-            void main() {
-                gl_FragColor = vec4(u_color, 1.0);
-            }
-            """
-
-        vs = glCreateShader(GL_VERTEX_SHADER)
-        glShaderSource(vs, vert_src)
-        glCompileShader(vs)
-        if not glGetShaderiv(vs, GL_COMPILE_STATUS):
-            info = glGetShaderInfoLog(vs)
-            raise RuntimeError(f"Vertex shader compilation failed: {info}")
-
-        fs = glCreateShader(GL_FRAGMENT_SHADER)
-        glShaderSource(fs, frag_src)
-        glCompileShader(fs)
-        if not glGetShaderiv(fs, GL_COMPILE_STATUS):
-            info = glGetShaderInfoLog(fs)
-            raise RuntimeError(f"Fragment shader compilation failed: {info}")
-
-        self.shader = glCreateProgram()
-        glAttachShader(self.shader, vs)
-        glAttachShader(self.shader, fs)
-
-        if not use_modern:
-            # bind attribute location for aPos before linking (since no layout(...) in 120)
-            glBindAttribLocation(self.shader, 0, b"aPos")
-
-        glLinkProgram(self.shader)
-        glDeleteShader(vs)
-        glDeleteShader(fs)
-
-        if not glGetProgramiv(self.shader, GL_LINK_STATUS):
-            info = glGetProgramInfoLog(self.shader)
-            raise RuntimeError(f"Shader program link failed: {info}")
+        # one program shared by all buttons; relinked in place on hot reload
+        self._program = get_program(
+            f"vertex_shader_button{suffix}.glsl",
+            f"fragment_shader_button{suffix}.glsl",
+            ("aPos",),
+        )
+        self.shader = self._program.program
+        self._query_uniforms()
 
+    def _query_uniforms(self):
         # cache uniforms
         self._u_pos = glGetUniformLocation(self.shader, "u_position")
         self._u_color = glGetUniformLocation(self.shader, "u_color")
+        self._program_generation = self._program.generation
 
     # ----------------------------- OpenGL buffers ---------------------------
     def setup_opengl(self):
@@ -318,6 +381,8 @@ class Button:
                 # VAO not supported in this context
                 self._has_vao = False
                 self.vao = None
+            else:
+                resources.track("vao", self.vao, self)
         except Exception:
             self._has_vao = False
             self.vao = None
@@ -328,6 +393,8 @@ class Button:
         glBufferData(
             GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW
         )
+        self._vbo_capacity = self.vertices.nbytes
+        resources.track("buffer", self.vbo, self, self._vbo_capacity)
 
         if self._has_vao:
             glBindVertexArray(self.vao)
@@ -336,46 +403,22 @@ class Button:
             glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
             glBindVertexArray(0)
 
-        # outline buffer
-        if self.outline_vertices is not None and len(self.outline_vertices) > 0:
-            # try VAO for outline
-            if self._has_vao:
-                try:
-                    self.outline_vao = glGenVertexArrays(1)
-                    err = glGetError()
-                    if err != GL_NO_ERROR:
-                        self.outline_vao = None
-                except Exception:
-                    self.outline_vao = None
-            self.outline_vbo = glGenBuffers(1)
-            glBindBuffer(GL_ARRAY_BUFFER, self.outline_vbo)
-            glBufferData(
-                GL_ARRAY_BUFFER,
-                self.outline_vertices.nbytes,
-                self.outline_vertices,
-                GL_STATIC_DRAW,
-            )
-
-            if self._has_vao and self.outline_vao:
-                glBindVertexArray(self.outline_vao)
-                glBindBuffer(GL_ARRAY_BUFFER, self.outline_vbo)
-                glEnableVertexAttribArray(0)
-                glVertexAttribPointer(
-                    0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0)
-                )
-                glBindVertexArray(0)
-
         # unbind
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     # ----------------------------- input handlers ---------------------------
-    def handle_cursor_pos(self, xpos, ypos):
+    def _current_cursor_pos(self):
+        # prefer the position delivered through the event queue so replays are deterministic
+        if self._cursor_pos is not None:
+            return self._cursor_pos
+        return glfw.get_cursor_pos(self.window)
+
+    def _hit(self, xpos, ypos):
+        """Whether the cursor is over the button; refined by the picker when enabled."""
         window_width, window_height = glfw.get_window_size(self.window)
         norm_x = (xpos / window_width) * 2 - 1
         norm_y = 1 - (ypos / window_height) * 2
-
-        prev_hovered = self.hovered
-        self.hovered = (
+        inside = (
             self.position[0] - self.width / 2
             <= norm_x
             <= self.position[0] + self.width / 2
@@ -383,112 +426,103 @@ class Button:
             <= norm_y
             <= self.position[1] + self.height / 2
         )
+        picking = sys.modules.get("edelweiss.picking")
+        picker = picking.get_active() if picking is not None else None
+        if inside and picker is not None and picker.ready:
+            # exact shape (rounded corners, outline) and stacking order
+            inside = picker.hovered is self
+        return inside
+
+    def handle_cursor_pos(self, xpos, ypos):
+        self._cursor_pos = (xpos, ypos)
+        prev_hovered = self.hovered
+        self.hovered = self._hit(xpos, ypos)
 
         if self.hovered and not prev_hovered and self.on_hover:
-            self.on_hover(self)
+            self._run_color_callback(self.on_hover)
         elif not self.hovered and prev_hovered:
-            self.color = self.base_color
+            self._set_state_color(self.base_color)
+        if self.hovered != prev_hovered:
+            self.dirty = True
 
     def handle_mouse_button(self, button, action, mods):
         if button == glfw.MOUSE_BUTTON_LEFT:
-            xpos, ypos = glfw.get_cursor_pos(self.window)
-            window_width, window_height = glfw.get_window_size(self.window)
-            norm_x = (xpos / window_width) * 2 - 1
-            norm_y = 1 - (ypos / window_height) * 2
-            self.hovered = (
-                self.position[0] - self.width / 2
-                <= norm_x
-                <= self.position[0] + self.width / 2
-                and self.position[1] - self.height / 2
-                <= norm_y
-                <= self.position[1] + self.height / 2
-            )
+            prev_state = (self.hovered, self.pressed)
+            self.hovered = self._hit(*self._current_cursor_pos())
 
             if action == glfw.PRESS and self.hovered:
                 self.pressed = True
                 if self.on_press:
-                    self.on_press(self)
+                    self._run_color_callback(self.on_press)
             elif action == glfw.RELEASE and self.pressed and self.hovered:
                 if self.on_click:
                     self.on_click(self)
                 self.pressed = False
                 # re-evaluate hover state after potential move
-                xpos, ypos = glfw.get_cursor_pos(self.window)
-                norm_x = (xpos / window_width) * 2 - 1
-                norm_y = 1 - (ypos / window_height) * 2
-                self.hovered = (
-                    self.position[0] - self.width / 2
-                    <= norm_x
-                    <= self.position[0] + self.width / 2
-                    and self.position[1] - self.height / 2
-                    <= norm_y
-                    <= self.position[1] + self.height / 2
-                )
+                self.hovered = self._hit(*self._current_cursor_pos())
                 if self.hovered and self.on_hover:
-                    self.on_hover(self)
+                    self._run_color_callback(self.on_hover)
                 else:
-                    self.color = self.base_color
+                    self._set_state_color(self.base_color)
             elif action == glfw.RELEASE:
                 self.pressed = False
+            if (self.hovered, self.pressed) != prev_state:
+                self.dirty = True
 
     # -------------------------------- render --------------------------------
     def render(self):
         glUseProgram(self.shader)
+        if self._program.generation != self._program_generation:
+            self._query_uniforms()
         glUniform3fv(self._u_pos, 1, self.position)
         glUniform3fv(self._u_color, 1, self.color)
 
         if self._has_vao and self.vao:
             glBindVertexArray(self.vao)
-            if self.radius <= 1e-7:
-                glDrawArrays(GL_TRIANGLES, 0, 6)
-            else:
-                glDrawArrays(GL_TRIANGLES, 0, len(self.vertices) // 3)
-            glBindVertexArray(0)
         else:
             # no VAO: set attribute pointers each frame
             glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
             glEnableVertexAttribArray(0)
             glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
-            if self.radius <= 1e-7:
-                glDrawArrays(GL_TRIANGLES, 0, 6)
-            else:
-                glDrawArrays(GL_TRIANGLES, 0, len(self.vertices) // 3)
-            glDisableVertexAttribArray(0)
-            glBindBuffer(GL_ARRAY_BUFFER, 0)
 
-        if (
-            self.outline_width > 0
-            and self.outline_vertices is not None
-            and len(self.outline_vertices) > 0
-        ):
+        # body and outline stroke are both triangles in the same buffer
+        glDrawArrays(GL_TRIANGLES, 0, self._fill_count)
+        if self._outline_count:
             glUniform3fv(self._u_color, 1, self.outline_color)
-            glLineWidth(self.outline_width)
-
-            if self._has_vao and self.outline_vao:
-                glBindVertexArray(self.outline_vao)
-                glDrawArrays(GL_LINE_LOOP, 0, len(self.outline_vertices) // 3)
-                glBindVertexArray(0)
-            else:
-                glBindBuffer(GL_ARRAY_BUFFER, self.outline_vbo)
-                glEnableVertexAttribArray(0)
-                glVertexAttribPointer(
-                    0, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0)
-                )
-                glDrawArrays(GL_LINE_LOOP, 0, len(self.outline_vertices) // 3)
-                glDisableVertexAttribArray(0)
-                glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glDrawArrays(GL_TRIANGLES, self._fill_count, self._outline_count)
 
+        if self._has_vao and self.vao:
+            glBindVertexArray(0)
+        else:
+            glDisableVertexAttribArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
         glUseProgram(0)
 
+        # label is queued and drawn with all other text in one batch after the scene
+        if self.text:
+            get_text_renderer().draw_text(
+                self.text,
+                self.x,
+                self.y,
+                color=self.text_color,
+                font_path=self.font_path,
+                size=self.font_size,
+                max_width=self.width_pixels,
+                anchor="center",
+            )
+
     # ------------------------------- cleanup --------------------------------
     def cleanup(self):
         if self.vao:
             glDeleteVertexArrays(1, [self.vao])
+            resources.untrack("vao", self.vao)
         if self.vbo:
             glDeleteBuffers(1, [self.vbo])
-        if self.outline_vao:
-            glDeleteVertexArrays(1, [self.outline_vao])
-        if self.outline_vbo:
-            glDeleteBuffers(1, [self.outline_vbo])
+            resources.untrack("buffer", self.vbo)
         if self.shader:
-            glDeleteProgram(self.shader)
+            release_program(self.shader)
+        self.vao = None
+        self.vbo = None
+        self.shader = None
+        self._program = None
+        self.initialized = False
@@ -0,0 +1,173 @@
+import glfw
+from OpenGL.GL import *
+
+from edelweiss.text import get_text_renderer
+from edelweiss.postprocess import RenderTarget, draw_texture
+
+_MAX_DIRTY_RECTS = 8  # beyond this a full redraw is cheaper than many scissored ones
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _merge_rects(rects):
+    """Union overlapping rectangles until none overlap."""
+    merged = []
+    for rect in rects:
+        while True:
+            for index, other in enumerate(merged):
+                if _overlaps(rect, other):
+                    rect = _union(rect, merged.pop(index))
+                    break
+            else:
+                break
+        merged.append(rect)
+    return merged
+
+
+class UILayer:
+    """Retained layer of widgets rendered into an offscreen texture only when they change.
+
+    Widgets flag themselves dirty (hover, press, set_color, set_position, set_text...);
+    the layer then redraws only the affected screen regions, using scissoring, and
+    every frame just composites its texture with one full-screen draw.
+    """
+
+    def __init__(self, name="ui_layer"):
+        self.name = name
+        self.widgets = {}
+        self.target = None
+        self.initialized = False
+        self.window = glfw.get_current_context()
+        self._full_redraw = True
+        self._dirty_rects = []  # rects removed widgets used to cover
+        self._drawn_rects = {}  # widget name -> screen rect at its last draw
+        self.redraws = 0  # regions redrawn during the last render()
+
+    def add_widget(self, widget):
+        if widget.name in self.widgets:
+            raise ValueError(f"Widget with name '{widget.name}' already exists")
+        self.widgets[widget.name] = widget
+        widget.dirty = True
+
+    def remove_widget(self, name):
+        widget = self.widgets.pop(name)
+        rect = self._drawn_rects.pop(name, None)
+        if rect is not None:
+            self._dirty_rects.append(rect)
+        return widget
+
+    def invalidate(self):
+        """Force a full redraw on the next frame."""
+        self._full_redraw = True
+
+    # ------------------------------ lifecycle -------------------------------
+    def initialize(self):
+        width, height = glfw.get_framebuffer_size(self.window)
+        self.target = RenderTarget(width, height, owner=self)
+        self._full_redraw = True
+
+    def cleanup(self):
+        for widget in self.widgets.values():
+            if getattr(widget, "initialized", False):
+                widget.cleanup()
+                widget.initialized = False
+        if self.target:
+            self.target.cleanup()
+        self.target = None
+        self.initialized = False
+
+    # ------------------------------ input -----------------------------------
+    def handle_cursor_pos(self, xpos, ypos):
+        for widget in self.widgets.values():
+            if hasattr(widget, "handle_cursor_pos"):
+                widget.handle_cursor_pos(xpos, ypos)
+
+    def handle_mouse_button(self, button, action, mods):
+        for widget in self.widgets.values():
+            if hasattr(widget, "handle_mouse_button"):
+                widget.handle_mouse_button(button, action, mods)
+
+    # ------------------------------ drawing ---------------------------------
+    def _collect_dirty(self):
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        for name, widget in self.widgets.items():
+            if not widget.dirty:
+                continue
+            previous = self._drawn_rects.get(name)
+            if previous is not None:
+                rects.append(previous)
+            rects.append(widget.screen_rect())
+        return _merge_rects(rects)
+
+    def _to_scissor(self, rect):
+        """Window-pixel rect (y down) -> framebuffer scissor box (y up)."""
+        window_width, window_height = glfw.get_window_size(self.window)
+        sx = self.target.width / float(window_width)
+        sy = self.target.height / float(window_height)
+        x0 = max(0, int(rect[0] * sx))
+        x1 = min(self.target.width, int(rect[2] * sx) + 1)
+        y0 = max(0, int((window_height - rect[3]) * sy))
+        y1 = min(self.target.height, int((window_height - rect[1]) * sy) + 1)
+        return x0, y0, max(0, x1 - x0), max(0, y1 - y0)
+
+    def _redraw(self, rect=None):
+        """Redraw widgets into the target; rect=None repaints everything."""
+        if rect is not None:
+            glEnable(GL_SCISSOR_TEST)
+            glScissor(*self._to_scissor(rect))
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        # only the layer's labels go into the texture; other queued text stays pending
+        text = get_text_renderer()
+        pending = text.swap_queue({})
+        for name, widget in self.widgets.items():
+            widget_rect = widget.screen_rect()
+            if rect is not None and not _overlaps(widget_rect, rect):
+                continue
+            if not getattr(widget, "initialized", False):
+                widget.initialize()
+                widget.initialized = True
+            widget.render()
+            self._drawn_rects[name] = widget_rect
+        text.flush()
+        text.swap_queue(pending)
+
+        if rect is not None:
+            glDisable(GL_SCISSOR_TEST)
+        self.redraws += 1
+
+    def render(self):
+        self.redraws = 0
+        width, height = glfw.get_framebuffer_size(self.window)
+        if (width, height) != (self.target.width, self.target.height):
+            self.target.resize(width, height)
+            self._full_redraw = True
+
+        rects = [] if self._full_redraw else self._collect_dirty()
+        if self._full_redraw or rects:
+            # the scene may be rendering into a post-processing target; restore it after
+            previous_fbo = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+            viewport = glGetIntegerv(GL_VIEWPORT)
+            clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+            self.target.bind()
+            if self._full_redraw or len(rects) > _MAX_DIRTY_RECTS:
+                self._redraw()
+            else:
+                for rect in rects:
+                    self._redraw(rect)
+            glBindFramebuffer(GL_FRAMEBUFFER, int(previous_fbo))
+            glViewport(*[int(v) for v in viewport])
+            glClearColor(*clear_color)
+            for widget in self.widgets.values():
+                widget.dirty = False
+            self._full_redraw = False
+
+        draw_texture(self.target.texture, blend=True)
@@ -1,25 +1,43 @@
+import os
 import sys
+import time
 import glfw
 from OpenGL.GL import *
 import numpy as np
 import abc
-from PIL import Image as PILImage
 
-# Assuming these modules exist; not present in the minimal example
-from edelweiss.widgets.button import Button  # Use the correct import path for Button
 from edelweiss.figure import Square, Circle, GameObject  # Expected imports
+from edelweiss import events as ev
+from edelweiss import resources
+from edelweiss import startup
+from edelweiss.camera import Camera2D, get_camera_uniforms, set_camera
+from edelweiss.shaders import get_shader_library
 
 
-def setup_projection(width, height):
-    """Orthographic projection setup for a fixed-size window."""
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
+ICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edelweiss.png")
+
+
+def _load_icon(size=64):
+    """Window icon as (width, height, pixels) with pixels an HxWx4 uint8 array (no lists)."""
+    from PIL import Image as PILImage  # only needed once, at startup
+
+    img = PILImage.open(ICON_PATH)
+    img.draft("RGBA", (size, size))  # lets the decoder downscale while loading
+    img = img.convert("RGBA")
+    if img.size != (size, size):
+        img = img.resize((size, size))
+    return (size, size, np.asarray(img, dtype=np.uint8))
 
 
 class GameEngine:
-    def __init__(self, width=800, height=600, title="Game Engine"):
+    def __init__(
+        self,
+        width=800,
+        height=600,
+        title="Game Engine",
+        visible=True,
+        shader_hot_reload=None,
+    ):
         self.width = width
         self.height = height
         self.title = title
@@ -30,6 +48,19 @@ class GameEngine:
         self.mouse_button_states = {}
         self.xpos = 0
         self.ypos = 0
+        # input is buffered during glfw.poll_events() and dispatched once per frame
+        self.events = ev.EventQueue()
+        self.dt = 0.0  # duration of the previous frame in seconds
+        self.frame_count = 0
+        self.post_processing = None  # PostProcessChain, see set_post_processing()
+        self.capture = None  # FrameCapture while start_capture() is active
+        self.picker = None  # edelweiss.picking.Picker while picking is enabled
+        self._initialized = False
+        self._scenes = []  # scenes attached to this engine that still hold GPU resources
+        if shader_hot_reload is not None:
+            # development mode: watch edelweiss/shaders and relink edited programs
+            get_shader_library().hot_reload = shader_hot_reload
+        self._last_frame_time = None
 
         if not glfw.init():
             raise Exception("Failed to initialize GLFW")
@@ -37,6 +68,9 @@ class GameEngine:
         # IMPORTANT: set window hints BEFORE creating the window.
         # Keep default context (on macOS it's often GL 2.1) to preserve compatibility.
         glfw.window_hint(glfw.RESIZABLE, glfw.FALSE)  # Make the window non-resizable
+        if not visible:
+            # hidden window for benchmarks/replays; the context still renders normally
+            glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
 
         self.window = glfw.create_window(
             self.width, self.height, self.title, None, None
@@ -44,27 +78,20 @@ class GameEngine:
         if not self.window:
             glfw.terminate()
             raise Exception("Failed to create window")
+        startup.mark("window created")
 
         glfw.make_context_current(self.window)
         glfw.swap_interval(1)  # Enable vsync
-        setup_projection(width, height)
 
     def initialize(self):
         """Initialization after the window is created and the context is current."""
+        if self._initialized:
+            return
+        self._initialized = True
         # Do not set a window icon on macOS (Cocoa warning). Other platforms are fine.
         if sys.platform != "darwin":
             try:
-                icon_img = (
-                    PILImage.open("edelweiss/edelweiss.png")
-                    .convert("RGBA")
-                    .resize((64, 64))
-                )
-                width, height = icon_img.size
-                pixels = list(icon_img.getdata())
-                pixel_rows = [
-                    pixels[i * width : (i + 1) * width] for i in range(height)
-                ]
-                glfw.set_window_icon(self.window, 1, [(width, height, pixel_rows)])
+                glfw.set_window_icon(self.window, 1, [_load_icon()])
             except Exception:
                 # Icon is non-critical; if the file is missing/invalid — just skip.
                 pass
@@ -84,65 +111,264 @@ class GameEngine:
             raise Exception(
                 "glCreateShader is not loaded! Ensure the OpenGL context is current."
             )
+        startup.mark("engine initialized")
 
     def window_resize_callback(self, window, width, height):
         """Resize callback. Window is fixed-size, but keep this for DPI changes, etc."""
         glViewport(0, 0, width, height)
-        setup_projection(width, height)
 
     def key_callback(self, window, key, scancode, action, mods):
-        """Track key presses (True/False state)."""
-        if action == glfw.PRESS:
-            self.key_states[key] = True
-        elif action == glfw.RELEASE:
-            self.key_states[key] = False
+        """Queue key presses; key_states is updated in dispatch_events()."""
+        self.events.push_key(key, action, mods)
 
     def mouse_button_callback(self, window, button, action, mods):
-        """Track mouse clicks and forward the event to the scene."""
-        if action == glfw.PRESS:
-            self.mouse_button_states[button] = True
-        elif action == glfw.RELEASE:
-            self.mouse_button_states[button] = False
-        if self.scene:
-            self.scene.handle_mouse_button(button, action, mods)
+        """Queue mouse clicks; they reach the scene in dispatch_events()."""
+        self.events.push_mouse_button(button, action, mods)
 
     def cursor_pos_callback(self, window, xpos, ypos):
-        """Track cursor position and forward the event to the scene."""
-        self.xpos = xpos
-        self.ypos = ypos
-        if self.scene:
-            self.scene.handle_cursor_pos(xpos, ypos)
-
-    def set_scene(self, scene):
-        """Attach a scene, wire up window/input, and call initialize() on its objects."""
+        """Queue cursor movement; consecutive moves are merged into the latest one."""
+        self.events.push_cursor_pos(xpos, ypos)
+
+    def handle_event(self, kind, a, b, c):
+        """Apply one queued event to engine state and forward it to the scene."""
+        if kind == ev.KEY:
+            if b == glfw.PRESS:
+                self.key_states[a] = True
+            elif b == glfw.RELEASE:
+                self.key_states[a] = False
+            if self.scene and hasattr(self.scene, "handle_key"):
+                self.scene.handle_key(a, b, c)
+        elif kind == ev.MOUSE_BUTTON:
+            if b == glfw.PRESS:
+                self.mouse_button_states[a] = True
+            elif b == glfw.RELEASE:
+                self.mouse_button_states[a] = False
+            if self.scene:
+                self.scene.handle_mouse_button(a, b, c)
+        elif kind == ev.CURSOR_POS:
+            self.xpos = a
+            self.ypos = b
+            if self.scene:
+                self.scene.handle_cursor_pos(a, b)
+
+    def dispatch_events(self):
+        """Input phase of the frame: deliver everything polled since the last frame."""
+        return self.events.dispatch(self.handle_event)
+
+    def event_counts(self):
+        """Received / coalesced / dispatched event counts of the last frame."""
+        return self.events.counts()
+
+    def start_recording(self, fixed_dt=1.0 / 60.0):
+        """Record dispatched input and frame boundaries (see edelweiss.replay)."""
+        from edelweiss.replay import InputRecorder
+
+        self.events.recorder = InputRecorder(fixed_dt)
+        return self.events.recorder
+
+    def stop_recording(self, path=None):
+        """Stop recording; optionally save the session to a binary file."""
+        recorder, self.events.recorder = self.events.recorder, None
+        if recorder is not None and path:
+            recorder.save(path)
+        return recorder
+
+    def start_capture(self, path, fmt="png", every=1, ring=3, queue_size=8):
+        """Write presented frames to path as a PNG sequence or raw RGBA video."""
+        from edelweiss.capture import FrameCapture
+
+        if not self.window:
+            self.initialize()
+        self.stop_capture()
+        self.capture = FrameCapture(path, fmt, ring, queue_size, every)
+        return self.capture
+
+    def stop_capture(self):
+        """Finish writing captured frames; prints and returns the drop counters."""
+        capture, self.capture = self.capture, None
+        if capture is None:
+            return None
+        stats = capture.stop()
+        capture.report()
+        return stats
+
+    def enable_picking(self, always=False):
+        """Pixel-exact hover detection through a GPU ID pass; returns the Picker.
+
+        picker.hovered is the object under the cursor; buttons use it for their
+        hover state. always=True re-renders the pass every frame instead of only
+        when the cursor, camera or scene changed.
+        """
+        from edelweiss.picking import Picker, set_active
+
+        if not self.window:
+            self.initialize()
+        self.disable_picking()
+        self.picker = Picker(always)
+        set_active(self.picker)
+        return self.picker
+
+    def disable_picking(self):
+        picker, self.picker = self.picker, None
+        if picker is None:
+            return
+        from edelweiss.picking import set_active
+
+        set_active(None)
+        picker.cleanup()
+
+    def set_scene(self, scene, unload_previous=False):
+        """Attach a scene and wire up window/input.
+
+        Objects create their GL resources lazily on first render, so switching is cheap.
+        The previous scene is suspended (resources kept for a fast switch back) or,
+        with unload_previous=True, unloaded to free its GPU memory.
+        """
         if not isinstance(scene, Scene):
             raise ValueError("Scene must be an instance of Scene class")
         if not self.window:
             self.initialize()
+        previous = self.scene
+        if previous is not None and previous is not scene:
+            if unload_previous:
+                self.unload_scene(previous)
+            else:
+                previous.suspend()
         self.scene = scene
         self.scene.key_states = self.key_states
         self.scene.mouse_button_states = self.mouse_button_states
         self.scene.window = self.window
         self.scene.engine = self  # Give the scene a reference to the engine
-        for obj in self.scene.objects.values():
-            if "initialize" in dir(obj):
-                obj.initialize()
+        if scene not in self._scenes:
+            self._scenes.append(scene)
+        scene.resume()
+
+    def unload_scene(self, scene):
+        """Free all GPU resources of a scene; it can be attached again later."""
+        scene.unload()
+        if scene in self._scenes:
+            self._scenes.remove(scene)
+        if scene is self.scene:
+            self.scene = None
+
+    def start(self):
+        """Prepare the window for the main loop."""
+        self.initialize()
+        self.running = True
+        self._last_frame_time = None
+
+    def frame(self, dt=None):
+        """One frame: input phase, update, render, present. dt=None measures wall time."""
+        now = glfw.get_time()
+        if dt is None:
+            dt = 0.0 if self._last_frame_time is None else now - self._last_frame_time
+        self._last_frame_time = now
+        self.dt = dt
+
+        get_shader_library().poll()
+        self.dispatch_events()
+        if self.scene.simulation is not None:
+            self.scene.simulation.sync()  # latest completed frame, never waits
+        tween = sys.modules.get("edelweiss.tween")
+        if tween is not None:
+            tween.get_tweens().update(dt)  # all running tweens in one vectorized pass
+        sprites = sys.modules.get("edelweiss.sprites")
+        if sprites is not None:
+            sprites.update(dt)  # current frame of every animated sprite, per layer
+        self.scene.update()
+        audio = sys.modules.get("edelweiss.audio")
+        if audio is not None and audio.SoundManager._instance is not None:
+            audio.SoundManager._instance.update()  # emitters follow their objects
+        jobs = sys.modules.get("edelweiss.jobs")
+        if jobs is not None:
+            # GL work submitted by update() or finished worker jobs runs here, on the
+            # thread that owns the context
+            job_system = jobs.get_job_system()
+            job_system.run_main_thread()
+            job_system.end_frame()
+        resources.get_registry().end_frame()  # live counts / bytes history, budget check
+        if self.post_processing is not None:
+            self.post_processing.begin()
+        self.scene.render()
+        debug_draw = sys.modules.get("edelweiss.debug_draw")
+        if debug_draw is not None and debug_draw.is_enabled():
+            debug_draw.get_debug_draw().flush()  # shapes recorded during update()
+        if self.post_processing is not None:
+            self.post_processing.end()
+        if self.picker is not None:
+            self.picker.update(self.scene)  # 1-texel ID pass, read back next frame
+        if self.capture is not None:
+            self.capture.capture()  # async readback of the finished back buffer
+        glfw.swap_buffers(self.window)
+
+        self.frame_count += 1
+        if self.frame_count == 1:
+            startup.mark("first frame presented")
+            if startup.report_enabled():
+                startup.report()
+
+    @property
+    def jobs(self):
+        """Shared edelweiss.jobs.JobSystem for parallel work from Scene.update()."""
+        from edelweiss.jobs import get_job_system
+
+        return get_job_system()
+
+    def gpu_resources(self, report=False):
+        """{kind: (live count, estimated bytes)} of all tracked GL objects."""
+        registry = resources.get_registry()
+        if report:
+            registry.report(top=10)
+        return registry.stats()
+
+    def set_gpu_budget(self, nbytes):
+        """Warn (once per overrun) when estimated GPU memory exceeds nbytes; None disables."""
+        resources.get_registry().set_budget(nbytes)
+
+    def set_post_processing(self, chain):
+        """Render through an edelweiss.postprocess.PostProcessChain (None = direct)."""
+        if self.post_processing is not None and self.post_processing is not chain:
+            self.post_processing.cleanup()
+        self.post_processing = chain
+
+    def startup_report(self):
+        """Print import and initialization timings up to the first frame."""
+        startup.report()
 
     def run(self):
         """Main render loop."""
-        self.initialize()
-        self.running = True
+        self.start()
         while self.running and not glfw.window_should_close(self.window):
-            self.scene.update()
-            self.scene.render()
-            glfw.swap_buffers(self.window)
             glfw.poll_events()
+            self.frame()
         self.cleanup()
 
     def cleanup(self):
         """Release resources on shutdown."""
-        if self.scene:
-            self.scene.cleanup()
+        self.stop_capture()
+        self.disable_picking()
+        jobs = sys.modules.get("edelweiss.jobs")
+        if jobs is not None:
+            jobs.get_job_system().shutdown()
+        for scene in list(self._scenes):
+            self.unload_scene(scene)
+        text = sys.modules.get("edelweiss.text")
+        if text is not None:
+            text.get_text_renderer().cleanup()
+        debug_draw = sys.modules.get("edelweiss.debug_draw")
+        if debug_draw is not None:
+            debug_draw.get_debug_draw().cleanup()
+        if self.post_processing is not None:
+            self.post_processing.cleanup()
+        postprocess = sys.modules.get("edelweiss.postprocess")
+        if postprocess is not None:
+            postprocess.cleanup()
+        get_camera_uniforms().cleanup()
+        get_shader_library().cleanup()
+        registry = resources.get_registry()
+        if registry.live:
+            print(f"Warning: {len(registry.live)} GPU resources still alive at shutdown")
+            registry.report(top=10)
         glfw.terminate()
 
     def stop(self):
@@ -161,24 +387,149 @@ class Scene(abc.ABC):
         self.key_states = {}
         self.mouse_button_states = {}
         self.engine = None  # Reference to GameEngine
+        self.camera = None  # Camera2D for world-space objects (None = world is NDC)
+        self.suspended = False
+        # seconds per frame spent creating GL resources of new objects (None = no limit);
+        # objects over budget are initialized and drawn on a later frame
+        self.init_budget = None
+        # edelweiss.simulation.ProcessSimulation stepping objects in another process
+        self.simulation = None
+        self.pools = []  # ObjectPools created with create_pool()
+        self.version = 0  # bumped when objects are added or removed
 
     def add_object(self, obj):
         """Add an object to the scene by a unique name."""
         if obj.name in self.objects:
             raise ValueError(f"Object with name '{obj.name}' already exists")
         self.objects[obj.name] = obj
+        self.version += 1
+
+    def remove_object(self, obj, cleanup=True):
+        """Remove an object (or its name) from the scene and return it.
+
+        cleanup=False keeps its GL resources so it can be added again cheaply.
+        Pooled objects go back to their pool instead.
+        """
+        name = getattr(obj, "name", obj)
+        obj = self.objects.get(name)
+        if obj is None:
+            raise ValueError(f"Object with name '{name}' does not exist")
+        pool = getattr(obj, "pool", None)
+        if pool is not None and pool.scene is self:
+            pool.despawn(obj)  # recycled, GL resources stay with the pool
+            return obj
+        del self.objects[name]
+        self.version += 1
+        if cleanup and getattr(obj, "initialized", False):
+            obj.cleanup()
+            obj.initialized = False
+        return obj
+
+    def create_pool(self, cls, size=64, **kwargs):
+        """ObjectPool of cls spawning into this scene; freed with the scene."""
+        from edelweiss.pool import ObjectPool
+
+        pool = ObjectPool(cls, size, scene=self, **kwargs)
+        self.pools.append(pool)
+        return pool
 
     @abc.abstractmethod
     def update(self):
         """Scene logic / objects update step."""
         pass
 
+    def _ensure_initialized(self, obj, deadline=None):
+        """Create the object's GL resources on first use. Returns False if over budget."""
+        if getattr(obj, "initialized", False) or not hasattr(obj, "initialize"):
+            return True
+        if deadline is not None and time.perf_counter() > deadline:
+            return False
+        obj.initialize()
+        obj.initialized = True
+        return True
+
+    def preload(self, budget=None):
+        """Create GL resources ahead of time, e.g. behind a loading screen.
+
+        Returns True when every object is initialized; with a budget (seconds) call it
+        once per frame until it does.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget
+        done = True
+        for obj in self.objects.values():
+            done = self._ensure_initialized(obj, deadline) and done
+        return done
+
+    def suspend(self):
+        """Stop being the active scene while keeping GPU resources for a fast resume."""
+        self.suspended = True
+
+    def resume(self):
+        """Become active again; objects initialized before are reused as-is."""
+        self.suspended = False
+        # a scene without a camera renders in NDC, not through the previous scene's view
+        set_camera(self.camera if self.camera is not None else Camera2D())
+
+    def run_in_process(self, step, objects=None, rate=60.0, capacity=None, initial=None):
+        """Simulate objects with step(state, dt) in a worker process (see edelweiss.simulation).
+
+        Their position, color and scale follow the latest completed simulation frame.
+        By default every GameObject of the scene is bound (widgets and layers are not).
+        """
+        from edelweiss.simulation import ProcessSimulation
+
+        if self.simulation is not None:
+            self.simulation.stop()
+        if objects is None:
+            objects = [o for o in self.objects.values() if isinstance(o, GameObject)]
+        objects = list(objects)
+        simulation = ProcessSimulation(step, capacity or len(objects), rate)
+        simulation.bind(objects).start(initial)
+        self.simulation = simulation
+        return simulation
+
+    def unload(self):
+        """Free GPU resources of all objects; they are recreated lazily if rendered again."""
+        if self.simulation is not None:
+            self.simulation.stop()
+            self.simulation = None
+        for obj in self.objects.values():
+            if getattr(obj, "initialized", False):
+                obj.cleanup()
+                obj.initialized = False
+        for pool in self.pools:
+            pool.cleanup()  # idle pooled objects keep GL handles too
+        resources.get_registry().check_leaks(self._resource_owners(), "scene unload")
+
+    def _resource_owners(self):
+        """Every object whose GL resources belong to this scene."""
+        owners = []
+        for obj in self.objects.values():
+            owners.append(obj)
+            shape = getattr(obj, "shape", None)  # EntityLayer draws through a shape
+            if shape is not None:
+                owners.append(shape)
+        for pool in self.pools:
+            owners.extend(pool.objects)
+        return owners
+
     def render(self):
         """Render the scene: clear the buffer and draw all objects."""
         glClear(GL_COLOR_BUFFER_BIT)
         glClearColor(0.1, 0.1, 0.1, 1.0)
+        # the view-projection matrix is uploaded once for all world-space shaders
+        get_camera_uniforms().begin_frame()
+        deadline = (
+            None if self.init_budget is None else time.perf_counter() + self.init_budget
+        )
         for obj in self.objects.values():
-            obj.render()
+            if self._ensure_initialized(obj, deadline):
+                obj.render()
+        # all text queued by objects this frame goes out in one batched draw;
+        # the text module is only loaded (and flushed) once something draws text
+        text = sys.modules.get("edelweiss.text")
+        if text is not None:
+            text.get_text_renderer().flush()
 
     def handle_cursor_pos(self, xpos, ypos):
         """Forward cursor movement to objects that handle it."""
@@ -194,8 +545,7 @@ class Scene(abc.ABC):
 
     def cleanup(self):
         """Clean up object resources on exit."""
-        for obj in self.objects.values():
-            obj.cleanup()
+        self.unload()
 
 
 # Test scene (same as in the original example).
@@ -204,6 +554,8 @@ class MyScene(Scene):
         super().__init__()
         self.time = 0.0
 
+        from edelweiss.widgets.button import Button
+
         # Button callbacks
         def on_hover(button):
             button.color = np.array([1.0, 0.5, 0.5], dtype=np.float32)  # Light red